@@ -2,7 +2,9 @@ from aries_cloudagent.wallet.util import b64_to_bytes, bytes_to_b64, str_to_b64
 from aries_cloudagent.messaging.util import time_now
 from aries_cloudagent.messaging.valid import IndyISO8601DateTime
 from collections import OrderedDict
+from functools import lru_cache
 from marshmallow import fields, Schema
+from typing import Tuple
 
 import json
 import inspect
@@ -58,6 +60,12 @@ def assert_type_or(value, Type1, Type2):
         )
 
 
+@lru_cache(maxsize=None)
+def schema_instance(SchemaClass) -> Schema:
+    """Reuse one instance of each Marshmallow Schema class for validation."""
+    return SchemaClass()
+
+
 def validate_schema(SchemaClass, schema: dict, exception=None, log=print):
     """
     Use Marshmallow Schema class to validate a schema in the form of dictionary
@@ -70,7 +78,7 @@ def validate_schema(SchemaClass, schema: dict, exception=None, log=print):
     assert_type_or(schema, dict, OrderedDict)
 
     test_schema = schema
-    test_against = SchemaClass()
+    test_against = schema_instance(SchemaClass)
     if test_schema.get("@context") is not None and test_schema.get("context") is None:
         test_schema = schema.copy()
         test_schema["context"] = test_schema.get("@context")
@@ -103,26 +111,34 @@ def dictionary_to_base64(dictionary: OrderedDict) -> bytes:
     return dictionary_base64
 
 
-async def verify_proof(wallet, credential: OrderedDict) -> bool:
+def proof_signing_input(credential: OrderedDict) -> Tuple[bytes, bytes, str]:
     """
+    Extract what a proof signature is checked against.
+
     Args: Credential: full schema with proof field
-    """
-    assert_type(credential, OrderedDict)
 
+    Returns: the signed message, the signature and the verkey
+    """
     cred_copy = credential.copy()
-    proof = cred_copy["proof"]
-    proof_signature = b64_to_bytes(proof["jws"], urlsafe=True)
+    proof = cred_copy.pop("proof")
     if proof["type"] != "Ed25519Signature2018":
         print("This proof type is not implemented, ", proof["type"])
-        result = False
 
-    del cred_copy["proof"]
+    proof_signature = b64_to_bytes(proof["jws"], urlsafe=True)
     credential_base64 = dictionary_to_base64(cred_copy)
+    return credential_base64, proof_signature, proof["verificationMethod"]
+
+
+async def verify_proof(wallet, credential: OrderedDict) -> bool:
+    """
+    Args: Credential: full schema with proof field
+    """
+    assert_type(credential, OrderedDict)
+
+    credential_base64, proof_signature, verkey = proof_signing_input(credential)
 
     try:
-        result = await wallet.verify_message(
-            credential_base64, proof_signature, proof["verificationMethod"]
-        )
+        result = await wallet.verify_message(credential_base64, proof_signature, verkey)
     except WalletError as err:
         print(err.roll_up)
         result = False
@@ -131,19 +147,24 @@ async def verify_proof(wallet, credential: OrderedDict) -> bool:
     return result
 
 
-async def create_proof(wallet, credential: OrderedDict, exception) -> OrderedDict:
+async def create_proof(
+    wallet, credential: OrderedDict, exception, verkey: str = None
+) -> OrderedDict:
     """
     Creates a proof dict with signature for given dictionary
+
+    Args: verkey: signing key to use, a new key is created if not given,
+        see ProofKeyManager
     """
     assert_type(credential, OrderedDict)
 
     try:
-        signing_key = await wallet.create_signing_key()
+        if not verkey:
+            signing_key = await wallet.create_signing_key()
+            verkey = signing_key.verkey
 
         credential_base64 = dictionary_to_base64(credential)
-        signature_bytes: bytes = await wallet.sign_message(
-            credential_base64, signing_key.verkey
-        )
+        signature_bytes: bytes = await wallet.sign_message(credential_base64, verkey)
     except WalletError as err:
         raise exception(err.roll_up)
 
@@ -152,7 +173,7 @@ async def create_proof(wallet, credential: OrderedDict, exception) -> OrderedDic
     proof["type"] = "Ed25519Signature2018"
     proof["created"] = time_now()
     proof["proofPurpose"] = "assertionMethod"
-    proof["verificationMethod"] = signing_key.verkey
+    proof["verificationMethod"] = verkey
     # proof_dict = {
     #     "type": "",
     #     "created": ,
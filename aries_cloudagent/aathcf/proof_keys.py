@@ -0,0 +1,129 @@
+"""Selection of the signing keys used for PDS credential and presentation proofs."""
+
+import asyncio
+import logging
+
+from ..config.base import BaseSettings
+from ..wallet.base import BaseWallet, DIDInfo
+
+LOGGER = logging.getLogger(__name__)
+
+
+class ProofKeyManager:
+    """
+    Hand out signing keys for proofs, according to a proof key policy.
+
+    Policies:
+        did: sign with the verkey of the DID the proof is made for, or with one
+            stable key per wallet when there is no such DID, kept as a local
+            DID so that restarted and other agent processes sign with it too
+        pool: sign with a pool of keys used in turn, each key is replaced
+            by a new one after max_uses signatures
+        ephemeral: create a new key for every proof
+
+    Verkeys handed out are cached in memory by wallet name, so after warming
+    up no key is generated on the signing path.
+    """
+
+    POLICY_DID = "did"
+    POLICY_POOL = "pool"
+    POLICY_EPHEMERAL = "ephemeral"
+    POLICIES = (POLICY_DID, POLICY_POOL, POLICY_EPHEMERAL)
+
+    DEFAULT_POOL_SIZE = 4
+    DEFAULT_MAX_USES = 10000
+
+    def __init__(
+        self,
+        policy: str = None,
+        pool_size: int = None,
+        max_uses: int = None,
+    ):
+        """
+        Initialize a `ProofKeyManager` instance.
+
+        Args:
+            policy: the proof key policy, did by default
+            pool_size: the number of keys in turn under the pool policy
+            max_uses: the number of signatures made with a pooled key
+                before it is replaced, 0 to never replace it
+
+        """
+        policy = policy or self.POLICY_DID
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown proof key policy: {policy}")
+        self.policy = policy
+        self.pool_size = pool_size or self.DEFAULT_POOL_SIZE
+        self.max_uses = self.DEFAULT_MAX_USES if max_uses is None else max_uses
+        self._stable_verkeys = {}
+        # wallet name to [[<verkey>, <uses>], ...]
+        self._pools = {}
+        self._next = {}
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings) -> "ProofKeyManager":
+        """Create a `ProofKeyManager` from the proof_key settings."""
+        return cls(
+            settings.get("proof_key.policy"),
+            settings.get_int("proof_key.pool_size"),
+            settings.get_int("proof_key.max_uses"),
+        )
+
+    async def _create_key(self, wallet: BaseWallet) -> str:
+        key_info = await wallet.create_signing_key(metadata={"proof_key": self.policy})
+        LOGGER.debug("Created %s proof key %s", self.policy, key_info.verkey)
+        return key_info.verkey
+
+    async def _pooled_verkey(self, wallet: BaseWallet) -> str:
+        async with self._lock:
+            pool = self._pools.setdefault(wallet.name, [])
+            slot = self._next.get(wallet.name, 0)
+            self._next[wallet.name] = (slot + 1) % self.pool_size
+            if slot == len(pool):
+                pool.append([await self._create_key(wallet), 0])
+            elif self.max_uses and pool[slot][1] >= self.max_uses:
+                pool[slot] = [await self._create_key(wallet), 0]
+            pool[slot][1] += 1
+            return pool[slot][0]
+
+    async def _stable_verkey(self, wallet: BaseWallet) -> str:
+        # processes creating the key at once settle on the lowest DID
+        stable = [
+            info
+            for info in await wallet.get_local_dids()
+            if (info.metadata or {}).get("proof_key") == self.POLICY_DID
+        ]
+        if stable:
+            return min(stable, key=lambda info: info.did).verkey
+        did_info = await wallet.create_local_did(
+            metadata={"proof_key": self.POLICY_DID}
+        )
+        LOGGER.debug("Created stable proof key %s", did_info.verkey)
+        return did_info.verkey
+
+    async def get_verkey(self, wallet: BaseWallet, did_info: DIDInfo = None) -> str:
+        """
+        Fetch the verkey to sign the next proof with.
+
+        Args:
+            wallet: the wallet holding the signing keys
+            did_info: the DID the proof is made for, if any
+
+        Returns:
+            The verkey of a signing key held by the wallet
+
+        """
+        if self.policy == self.POLICY_EPHEMERAL:
+            return await self._create_key(wallet)
+        if self.policy == self.POLICY_POOL:
+            return await self._pooled_verkey(wallet)
+        if did_info and did_info.verkey:
+            return did_info.verkey
+        if wallet.name not in self._stable_verkeys:
+            async with self._lock:
+                if wallet.name not in self._stable_verkeys:
+                    self._stable_verkeys[wallet.name] = await self._stable_verkey(
+                        wallet
+                    )
+        return self._stable_verkeys[wallet.name]
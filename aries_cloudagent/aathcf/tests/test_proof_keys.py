@@ -0,0 +1,75 @@
+from collections import OrderedDict
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.settings import Settings
+from ...wallet.basic import BasicWallet
+from ..credentials import create_proof, verify_proof
+from ..proof_keys import ProofKeyManager
+
+
+class TestProofKeyManager(AsyncTestCase):
+    async def setUp(self):
+        self.wallet = BasicWallet()
+        self.create_key = async_mock.CoroutineMock(wraps=self.wallet.create_signing_key)
+        self.wallet.create_signing_key = self.create_key
+
+    async def test_did_policy(self):
+        manager = ProofKeyManager()
+        assert manager.policy == ProofKeyManager.POLICY_DID
+        did_info = await self.wallet.create_public_did()
+        assert await manager.get_verkey(self.wallet, did_info) == did_info.verkey
+
+        verkeys = {await manager.get_verkey(self.wallet) for _ in range(5)}
+        assert len(verkeys) == 1
+        verkey = verkeys.pop()
+        did_info = await self.wallet.get_local_did_for_verkey(verkey)
+        assert did_info.metadata == {"proof_key": "did"}
+
+        # the key is kept in the wallet, not only by the manager
+        assert await ProofKeyManager().get_verkey(self.wallet) == verkey
+
+        other = BasicWallet({"name": "other"})
+        other_verkey = await manager.get_verkey(other)
+        assert other_verkey != verkey
+        assert await manager.get_verkey(self.wallet) == verkey
+        assert await other.get_local_did_for_verkey(other_verkey)
+
+    async def test_pool_policy(self):
+        manager = ProofKeyManager("pool", pool_size=2, max_uses=2)
+        verkeys = [await manager.get_verkey(self.wallet) for _ in range(6)]
+        assert verkeys[0] == verkeys[2] != verkeys[4]
+        assert verkeys[1] == verkeys[3] != verkeys[5]
+        assert self.create_key.call_count == 4
+
+        other = BasicWallet({"name": "other"})
+        assert await manager.get_verkey(other) not in verkeys
+
+        manager = ProofKeyManager("pool", pool_size=2, max_uses=0)
+        verkeys = {await manager.get_verkey(self.wallet) for _ in range(6)}
+        assert len(verkeys) == 2
+
+    async def test_ephemeral_policy(self):
+        manager = ProofKeyManager("ephemeral")
+        verkeys = {await manager.get_verkey(self.wallet) for _ in range(3)}
+        assert len(verkeys) == 3
+
+    async def test_from_settings(self):
+        manager = ProofKeyManager.from_settings(
+            Settings({"proof_key.policy": "pool", "proof_key.pool_size": "3"})
+        )
+        assert manager.policy == "pool"
+        assert manager.pool_size == 3
+        assert manager.max_uses == ProofKeyManager.DEFAULT_MAX_USES
+
+        with self.assertRaises(ValueError):
+            ProofKeyManager("bogus")
+
+    async def test_create_proof_with_verkey(self):
+        verkey = await ProofKeyManager().get_verkey(self.wallet)
+        document = OrderedDict(type=["VerifiablePresentation"])
+        proof = await create_proof(self.wallet, document, Exception, verkey)
+        assert proof["verificationMethod"] == verkey
+        document["proof"] = proof
+        assert await verify_proof(self.wallet, document)
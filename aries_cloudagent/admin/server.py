@@ -23,7 +23,7 @@ from ..ledger.error import LedgerConfigError, LedgerTransactionError
 from ..messaging.responder import BaseResponder
 from ..transport.queue.basic import BasicMessageQueue
 from ..transport.outbound.message import OutboundMessage
-from ..utils.stats import Collector
+from ..utils.stats import Collector, prometheus_gauges
 from ..utils.task_queue import TaskQueue
 from ..version import __version__
 
@@ -197,6 +197,7 @@ class AdminServer(BaseAdminServer):
         conductor_stop: Coroutine,
         task_queue: TaskQueue = None,
         conductor_stats: Coroutine = None,
+        task_priority: str = None,
     ):
         """
         Initialize an AdminServer instance.
@@ -209,6 +210,8 @@ class AdminServer(BaseAdminServer):
             webhook_router: Callable for delivering webhooks
             conductor_stop: Conductor (graceful) stop for shutdown API call
             task_queue: An optional task queue for handlers
+            conductor_stats: Conductor stats for the status API call
+            task_priority: The task queue priority class of the handlers
         """
         self.app = None
         self.admin_api_key = context.settings.get("admin.admin_api_key")
@@ -221,6 +224,7 @@ class AdminServer(BaseAdminServer):
         self.conductor_stats = conductor_stats
         self.loaded_modules = []
         self.task_queue = task_queue
+        self.task_priority = task_priority
         self.webhook_router = webhook_router
         self.webhook_targets = {}
         self.websocket_queues = {}
@@ -278,7 +282,9 @@ class AdminServer(BaseAdminServer):
 
             @web.middleware
             async def apply_limiter(request, handler):
-                task = await self.task_queue.put(handler(request))
+                task = await self.task_queue.put(
+                    handler(request), priority=self.task_priority
+                )
                 return await task
 
             middlewares.append(apply_limiter)
@@ -302,6 +308,7 @@ class AdminServer(BaseAdminServer):
                 web.get("/plugins", self.plugins_handler, allow_head=False),
                 web.get("/status", self.status_handler, allow_head=False),
                 web.post("/status/reset", self.status_reset_handler),
+                web.get("/metrics", self.metrics_handler, allow_head=False),
                 web.get("/status/live", self.liveliness_handler, allow_head=False),
                 web.get("/status/ready", self.readiness_handler, allow_head=False),
                 web.get("/info", self.info_handler, allow_head=False),
@@ -372,7 +379,11 @@ class AdminServer(BaseAdminServer):
                     key=lambda p: (p["in"], not p["required"], p["name"])
                 )
 
-        self.site = web.TCPSite(runner, host=self.host, port=self.port)
+        # worker processes each serve the admin API on the shared port
+        reuse_port = self.context.settings.get("transport.reuse_port")
+        self.site = web.TCPSite(
+            runner, host=self.host, port=self.port, reuse_port=reuse_port or None
+        )
 
         try:
             await self.site.start()
@@ -461,6 +472,29 @@ class AdminServer(BaseAdminServer):
             collector.reset()
         return web.json_response({})
 
+    @docs(tags=["server"], summary="Fetch the statistics in Prometheus text format")
+    async def metrics_handler(self, request: web.BaseRequest):
+        """
+        Request handler for the timing and conductor statistics, for scraping.
+
+        Args:
+            request: aiohttp request object
+
+        Returns:
+            The web response
+
+        """
+        collector: Collector = await self.context.inject(Collector, required=False)
+        text = collector.prometheus() if collector else ""
+        if self.conductor_stats:
+            text += prometheus_gauges(
+                "acapy_conductor", await self.conductor_stats(), "Conductor statistics"
+            )
+        return web.Response(
+            body=text.encode("utf-8"),
+            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+        )
+
     async def redirect_handler(self, request: web.BaseRequest):
         """Perform redirect to documentation."""
         raise web.HTTPFound("/api/doc")
@@ -262,6 +262,34 @@ class TestAdminServer(AsyncTestCase):
 
         await server.stop()
 
+    async def test_visit_metrics(self):
+        settings = {"admin.admin_insecure_mode": True}
+        server = self.get_admin_server(settings)
+        server.conductor_stats = async_mock.CoroutineMock(
+            return_value={
+                "in_sessions": 2,
+                "task_priorities": {"inbound": {"active": 3, "pending": 1}},
+            }
+        )
+        collector = await server.context.inject(Collector)
+        collector.log("handler", 0.25, labels={"route": "/status"})
+        await server.start()
+
+        async with self.client_session.get(
+            f"http://127.0.0.1:{self.port}/metrics", headers={}
+        ) as response:
+            assert response.status == 200
+            assert response.headers["Content-Type"].startswith("text/plain")
+            text = await response.text()
+
+        assert 'acapy_timing_seconds_count{name="handler",route="/status"} 1' in text
+        assert 'acapy_conductor{stat="in_sessions"} 2' in text
+        assert (
+            'acapy_conductor{stat="task_priorities_active",class="inbound"} 3' in text
+        )
+
+        await server.stop()
+
     async def test_visit_secure_mode(self):
         settings = {
             "admin.admin_insecure_mode": False,
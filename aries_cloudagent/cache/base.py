@@ -2,7 +2,7 @@
 
 import asyncio
 from abc import ABC, abstractmethod
-from typing import Any, Sequence, Text, Union
+from typing import Any, Mapping, Sequence, Text, Union
 
 from ..core.error import BaseError
 
@@ -17,6 +17,10 @@ class BaseCache(ABC):
     def __init__(self):
         """Initialize the cache instance."""
         self._key_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
     @abstractmethod
     async def get(self, key: Text):
@@ -57,6 +61,50 @@ class BaseCache(ABC):
     async def flush(self):
         """Remove all items from the cache."""
 
+    def stats(self) -> Mapping[str, int]:
+        """
+        Fetch the cache counters.
+
+        Returns:
+            A dict of hit, miss, eviction and expiration counts
+
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    async def lock_key(self, key: Text) -> Any:
+        """
+        Obtain the exclusive right to produce the value for a cache key.
+
+        Backends shared between processes override this to make sure that only
+        one process fetches a cold key. The default in-process implementation
+        relies on the `CacheKeyLock` parent chain and returns immediately.
+
+        Args:
+            key: the key to lock
+
+        Returns:
+            The value produced by another lock holder while waiting, in which
+            case the lock is not held, or `None` once the lock is held
+
+        """
+
+    async def unlock_key(self, key: Text):
+        """
+        Release the exclusive right to produce the value for a cache key.
+
+        Args:
+            key: the key to unlock
+
+        """
+
+    def close(self):
+        """Release any resources held by the cache."""
+
     def acquire(self, key: Text):
         """Acquire a lock on a given cache key."""
         result = CacheKeyLock(self, key)
@@ -91,6 +139,7 @@ class CacheKeyLock:
         self.released = False
         self._future: asyncio.Future = asyncio.get_event_loop().create_future()
         self._parent: "CacheKeyLock" = None
+        self._key_locked = False
 
     @property
     def done(self) -> bool:
@@ -146,6 +195,9 @@ class CacheKeyLock:
                 await self  # wait for parent's done handler to complete
         if not result:
             found = await self.cache.get(self.key)
+            if not found:
+                found = await self.cache.lock_key(self.key)
+                self._key_locked = not found
             if found:
                 self._future.set_result(found)
         return self
@@ -164,6 +216,9 @@ class CacheKeyLock:
         """
         if exc_val:
             self.exception = exc_val
+        if self._key_locked:
+            self._key_locked = False
+            await self.cache.unlock_key(self.key)
         if not self.done:
             self._future.set_result(None)
         self.release()
@@ -24,6 +24,7 @@ class BasicCache(BaseCache):
             now = time.perf_counter()
             if now >= cache_item_expiry:
                 del self._cache[key]
+                self.expirations += 1
 
     async def get(self, key: Text):
         """
@@ -37,7 +38,12 @@ class BasicCache(BaseCache):
 
         """
         self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        item = self._cache.get(key)
+        if item:
+            self.hits += 1
+            return item["value"]
+        self.misses += 1
+        return None
 
     async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
         """
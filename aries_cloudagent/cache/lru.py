@@ -0,0 +1,124 @@
+"""Bounded in-memory LRU cache with indexed expiry."""
+
+import heapq
+import itertools
+import time
+
+from collections import OrderedDict
+from typing import Any, Sequence, Text, Union
+
+from .base import BaseCache
+
+
+class LRUCache(BaseCache):
+    """
+    In-memory cache class with LRU eviction and a time-ordered expiry heap.
+
+    Lookups and updates are O(1) apart from heap maintenance, which is
+    O(log n) per expiring entry, so no operation scans the whole cache.
+    """
+
+    DEFAULT_MAX_SIZE = 10000
+
+    def __init__(self, max_size: int = None):
+        """
+        Initialize a `LRUCache` instance.
+
+        Args:
+            max_size: the maximum number of keys to hold before evicting the
+                least recently used entries
+
+        """
+        super().__init__()
+        self._max_size = max_size or self.DEFAULT_MAX_SIZE
+        # looks like { "key": [<expiry timestamp or None>, <val>] }
+        self._cache = OrderedDict()
+        # heap of (expiry timestamp, sequence, key, entry)
+        self._expiry = []
+        self._seq = itertools.count()
+
+    @property
+    def max_size(self) -> int:
+        """Accessor for the maximum number of cached keys."""
+        return self._max_size
+
+    def _remove_expired_cache_items(self, now: float):
+        """Pop expired items from the head of the expiry heap."""
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            _, _, key, entry = heapq.heappop(expiry)
+            # skip heap entries for keys which were since updated or removed
+            if self._cache.get(key) is entry:
+                del self._cache[key]
+                self.expirations += 1
+
+    def _compact_expiry(self):
+        """Drop stale heap entries left behind by updates and removals."""
+        self._expiry = [
+            item for item in self._expiry if self._cache.get(item[2]) is item[3]
+        ]
+        heapq.heapify(self._expiry)
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        entry = self._cache.get(key)
+        if entry:
+            if entry[0] is None or entry[0] > time.perf_counter():
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._cache[key]
+            self.expirations += 1
+        self.misses += 1
+        return None
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        now = time.perf_counter()
+        self._remove_expired_cache_items(now)
+        expires_ts = now + ttl if ttl else None
+        for key in [keys] if isinstance(keys, Text) else keys:
+            entry = [expires_ts, value]
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            if expires_ts is not None:
+                heapq.heappush(self._expiry, (expires_ts, next(self._seq), key, entry))
+        while len(self._cache) > self._max_size:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        if len(self._expiry) > 2 * len(self._cache) + 64:
+            self._compact_expiry()
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        self._cache.pop(key, None)
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        self._cache = OrderedDict()
+        self._expiry = []
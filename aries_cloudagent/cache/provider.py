@@ -0,0 +1,33 @@
+"""Default cache provider classes."""
+
+import logging
+
+from ..config.base import BaseProvider, BaseInjector, BaseSettings
+from ..utils.classloader import ClassLoader
+
+LOGGER = logging.getLogger(__name__)
+
+
+class CacheProvider(BaseProvider):
+    """Provider for the default configurable cache classes."""
+
+    CACHE_TYPES = {
+        "basic": "aries_cloudagent.cache.basic.BasicCache",
+        "lru": "aries_cloudagent.cache.lru.LRUCache",
+        "shared": "aries_cloudagent.cache.shared.SharedCache",
+    }
+
+    async def provide(self, settings: BaseSettings, injector: BaseInjector):
+        """Create and return the cache instance."""
+        cache_type = settings.get_value("cache.type", default="basic").lower()
+        cache_class = ClassLoader.load_class(
+            self.CACHE_TYPES.get(cache_type, cache_type)
+        )
+        if cache_type == "lru":
+            cache = cache_class(max_size=settings.get_int("cache.max_size"))
+        elif cache_type == "shared":
+            cache = cache_class(path=settings.get_str("cache.path"))
+        else:
+            cache = cache_class()
+        LOGGER.debug("Using cache type: %s", cache_type)
+        return cache
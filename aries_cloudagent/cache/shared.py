@@ -0,0 +1,235 @@
+"""Cache implementation shared between agent processes on the same host."""
+
+import asyncio
+import json
+import os
+import sqlite3
+import time
+import uuid
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Sequence, Text, Union
+
+from .base import BaseCache, CacheError
+
+
+class SharedCache(BaseCache):
+    """
+    SQLite-backed cache class which may be opened by several processes at once.
+
+    Values must be JSON-serializable. Cache key locks are held as leases in the
+    database, so only one process produces the value for a cold key while the
+    others wait for it to appear. Without a path, a private in-memory database
+    is used as a local stand-in for the shared store.
+
+    All database calls run on a dedicated thread, so waiting for the database
+    lock held by another process never blocks the event loop.
+    """
+
+    DEFAULT_LOCK_TIMEOUT = 30.0
+    DEFAULT_POLL_INTERVAL = 0.05
+    MAX_POLL_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        path: str = None,
+        lock_timeout: float = None,
+        poll_interval: float = None,
+    ):
+        """
+        Initialize a `SharedCache` instance.
+
+        Args:
+            path: the database file shared between processes
+            lock_timeout: number of seconds before an unreleased key lock lapses
+            poll_interval: number of seconds before the first check for a
+                locked key, doubled on every check up to `MAX_POLL_INTERVAL`
+
+        """
+        super().__init__()
+        self._path = path
+        self._lock_timeout = lock_timeout or self.DEFAULT_LOCK_TIMEOUT
+        self._poll_interval = poll_interval or self.DEFAULT_POLL_INTERVAL
+        self._owner = f"{os.getpid()}:{uuid.uuid4().hex}"
+        # one thread owns the connection and serializes access to it
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="shared-cache"
+        )
+        try:
+            self._conn = sqlite3.connect(
+                path or ":memory:",
+                timeout=5.0,
+                isolation_level=None,
+                check_same_thread=False,
+            )
+            if path:
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS cache_items (
+                    key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL
+                );
+                CREATE INDEX IF NOT EXISTS cache_items_expires
+                    ON cache_items (expires);
+                CREATE TABLE IF NOT EXISTS cache_locks (
+                    key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL
+                );
+                """
+            )
+        except sqlite3.Error as err:
+            raise CacheError(f"Error opening shared cache: {err}") from err
+
+    @property
+    def path(self) -> str:
+        """Accessor for the database path, if any."""
+        return self._path
+
+    async def _run(self, func, *args):
+        """Run a database call on the cache thread."""
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _fetch(self, key: Text, now: float) -> Any:
+        """Fetch an unexpired value from the database."""
+        row = self._conn.execute(
+            "SELECT value, expires FROM cache_items WHERE key = ?", (key,)
+        ).fetchone()
+        if not row:
+            return None
+        if row[1] is not None and row[1] <= now:
+            self._conn.execute(
+                "DELETE FROM cache_items WHERE key = ? AND expires <= ?", (key, now)
+            )
+            self.expirations += 1
+            return None
+        return json.loads(row[0])
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        result = await self._run(self._fetch, key, time.time())
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        now = time.time()
+        expires_ts = now + ttl if ttl else None
+        value_json = json.dumps(value)
+        keys = [keys] if isinstance(keys, Text) else list(keys)
+        await self._run(self._store, keys, value_json, expires_ts, now)
+
+    def _store(
+        self, keys: Sequence[Text], value_json: str, expires_ts: float, now: float
+    ):
+        """Store a serialized value and purge expired items."""
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            purged = self._conn.execute(
+                "DELETE FROM cache_items WHERE expires <= ?", (now,)
+            ).rowcount
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache_items (key, value, expires) "
+                "VALUES (?, ?, ?)",
+                ((key, value_json, expires_ts) for key in keys),
+            )
+        self.expirations += purged
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self._run(
+            self._conn.execute, "DELETE FROM cache_items WHERE key = ?", (key,)
+        )
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        await self._run(self._conn.execute, "DELETE FROM cache_items")
+
+    async def lock_key(self, key: Text) -> Any:
+        """
+        Obtain the exclusive right to produce the value for a cache key.
+
+        Waits while another process holds an unexpired lease on the key.
+
+        Args:
+            key: the key to lock
+
+        Returns:
+            The value produced by another lock holder while waiting, in which
+            case the lock is not held, or `None` once the lock is held
+
+        """
+        delay = self._poll_interval
+        while True:
+            locked, found = await self._run(self._try_lock, key, time.time())
+            if found is not None:
+                if locked:
+                    await self.unlock_key(key)
+                return found
+            if locked:
+                return None
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, max(self.MAX_POLL_INTERVAL, self._poll_interval))
+
+    def _try_lock(self, key: Text, now: float):
+        """Take an expired or free lease on a key and check for its value."""
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.execute(
+                "DELETE FROM cache_locks WHERE key = ? AND expires <= ?",
+                (key, now),
+            )
+            locked = self._conn.execute(
+                "INSERT OR IGNORE INTO cache_locks (key, owner, expires) "
+                "VALUES (?, ?, ?)",
+                (key, self._owner, now + self._lock_timeout),
+            ).rowcount
+        # the value may have been produced just before the lock was released
+        return locked, self._fetch(key, now)
+
+    async def unlock_key(self, key: Text):
+        """
+        Release the exclusive right to produce the value for a cache key.
+
+        Args:
+            key: the key to unlock
+
+        """
+        await self._run(
+            self._conn.execute,
+            "DELETE FROM cache_locks WHERE key = ? AND owner = ?",
+            (key, self._owner),
+        )
+
+    def close(self):
+        """Close the database connection once pending calls are done."""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
@@ -0,0 +1,100 @@
+from asyncio import sleep
+import pytest
+
+from ..lru import LRUCache
+
+
+@pytest.fixture()
+async def cache():
+    cache = LRUCache(max_size=4)
+    await cache.set("valid key", "value")
+    return cache
+
+
+class TestLRUCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        item = await cache.get("doesn't exist")
+        assert item is None
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache):
+        item = await cache.get("valid key")
+        assert item == "value"
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_multi(self, cache):
+        await cache.set([f"key{i}" for i in range(3)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(3)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+        assert len(cache._cache) == 4
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache):
+        await cache.set([f"key{i}" for i in range(2)], {"dictkey": "dval"}, 0.05)
+        assert await cache.get("key0") == {"dictkey": "dval"}
+
+        await sleep(0.05)
+
+        assert await cache.get("key0") is None
+        await cache.set("other", "value")
+        assert "key1" not in cache._cache
+        assert cache.stats()["expirations"] == 2
+
+    @pytest.mark.asyncio
+    async def test_set_overwrite_expiry(self, cache):
+        await cache.set("key", "value", 0.05)
+        await cache.set("key", "newval")
+
+        await sleep(0.05)
+
+        await cache.set("other", "value")
+        assert await cache.get("key") == "newval"
+
+    @pytest.mark.asyncio
+    async def test_evict_lru(self, cache):
+        await cache.set(["key0", "key1", "key2"], "value")
+        assert await cache.get("valid key") == "value"
+        await cache.set("key3", "value")
+        assert len(cache._cache) == cache.max_size
+        assert await cache.get("key0") is None
+        assert await cache.get("valid key") == "value"
+        assert cache.stats()["evictions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_compact_expiry(self, cache):
+        for i in range(100):
+            await cache.set("key", i, 60)
+        assert len(cache._expiry) < 100
+        assert await cache.get("key") == 99
+
+    @pytest.mark.asyncio
+    async def test_flush(self, cache):
+        await cache.set("key", "value", 60)
+        await cache.flush()
+        assert not cache._cache
+        assert not cache._expiry
+
+    @pytest.mark.asyncio
+    async def test_clear(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        item = await cache.get("key")
+        assert item is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_release_with_waiter(self, cache):
+        test_key = "test_key"
+        test_result = "test_result"
+        lock = cache.acquire(test_key)
+        await lock.__aenter__()
+
+        lock2 = cache.acquire(test_key)
+        assert lock2.parent is lock
+        await lock.set_result(test_result)
+        await lock.__aexit__(None, None, None)
+
+        assert await cache.get(test_key) == test_result
+        assert await lock2 == test_result
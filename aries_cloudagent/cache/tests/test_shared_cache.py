@@ -0,0 +1,140 @@
+from asyncio import ensure_future, sleep, wait_for
+from tempfile import TemporaryDirectory
+import os
+import pytest
+
+from ..shared import SharedCache
+
+
+@pytest.fixture()
+def cache_path():
+    with TemporaryDirectory() as tmp_dir:
+        yield os.path.join(tmp_dir, "cache.db")
+
+
+@pytest.fixture()
+async def cache():
+    cache = SharedCache()
+    await cache.set("valid key", "value")
+    yield cache
+    cache.close()
+
+
+class TestSharedCache:
+    @pytest.mark.asyncio
+    async def test_get_none(self, cache):
+        item = await cache.get("doesn't exist")
+        assert item is None
+        assert cache.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_get_valid(self, cache):
+        item = await cache.get("valid key")
+        assert item == "value"
+        assert cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_set_multi(self, cache):
+        await cache.set([f"key{i}" for i in range(4)], {"dictkey": "dval"})
+        for key in [f"key{i}" for i in range(4)]:
+            assert await cache.get(key) == {"dictkey": "dval"}
+
+    @pytest.mark.asyncio
+    async def test_set_expires(self, cache):
+        await cache.set("key", {"dictkey": "dval"}, 0.05)
+        assert await cache.get("key") == {"dictkey": "dval"}
+
+        await sleep(0.05)
+
+        assert await cache.get("key") is None
+        assert cache.stats()["expirations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_clear(self, cache):
+        await cache.set("key", "value")
+        await cache.clear("key")
+        assert await cache.get("key") is None
+        await cache.flush()
+        assert await cache.get("valid key") is None
+
+    @pytest.mark.asyncio
+    async def test_shared_between_instances(self, cache_path):
+        first = SharedCache(cache_path)
+        second = SharedCache(cache_path)
+        assert first.path == cache_path
+        await first.set("key", ["value"])
+        assert await second.get("key") == ["value"]
+        await second.clear("key")
+        assert await first.get("key") is None
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_single_flight_between_instances(self, cache_path):
+        first = SharedCache(cache_path)
+        second = SharedCache(cache_path, poll_interval=0.01)
+
+        lock = first.acquire("key")
+        await lock.__aenter__()
+        assert not lock.done
+
+        async def wait_second():
+            async with second.acquire("key") as entry:
+                return entry.result
+
+        waiter = ensure_future(wait_second())
+        await sleep(0.05)
+        assert not waiter.done()
+
+        await lock.set_result("result")
+        await lock.__aexit__(None, None, None)
+        assert await wait_for(waiter, 1) == "result"
+
+        async with second.acquire("key") as entry:
+            assert entry.result == "result"
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_lock_released_without_result(self, cache_path):
+        first = SharedCache(cache_path)
+        second = SharedCache(cache_path, poll_interval=0.01)
+
+        async with first.acquire("key") as entry:
+            assert entry.result is None
+        async with second.acquire("key") as entry:
+            assert entry.result is None
+            await entry.set_result("result")
+        assert await first.get("key") == "result"
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_lock_expires(self, cache_path):
+        first = SharedCache(cache_path, lock_timeout=0.05)
+        second = SharedCache(cache_path, poll_interval=0.01)
+
+        assert await first.lock_key("key") is None
+        assert await wait_for(second.lock_key("key"), 1) is None
+        await second.unlock_key("key")
+        first.close()
+        second.close()
+
+    @pytest.mark.asyncio
+    async def test_lock_wait_off_event_loop(self, cache_path):
+        first = SharedCache(cache_path)
+        second = SharedCache(cache_path)
+
+        # hold the database lock from another connection
+        first._conn.execute("BEGIN IMMEDIATE")
+        waiter = ensure_future(second.set("key", "value"))
+        ticks = 0
+        while not waiter.done() and ticks < 5:
+            await sleep(0.01)
+            ticks += 1
+        assert ticks == 5 and not waiter.done()
+        first._conn.execute("COMMIT")
+        await wait_for(waiter, 1)
+        assert await first.get("key") == "value"
+        first.close()
+        second.close()
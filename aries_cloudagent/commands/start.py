@@ -5,8 +5,9 @@ import functools
 import logging
 import os
 import signal
+import sys
 from argparse import ArgumentParser
-from typing import Coroutine, Sequence
+from typing import Callable, Coroutine, Sequence
 
 try:
     import uvloop
@@ -16,6 +17,7 @@ except ImportError:
 from ..core.conductor import Conductor
 from ..config import argparse as arg
 from ..config.default_context import DefaultContextBuilder
+from ..config.error import ArgsParseError
 from ..config.util import common_config
 
 LOGGER = logging.getLogger(__name__)
@@ -64,6 +66,51 @@ def execute(argv: Sequence[str] = None):
         webhook_urls.append(webhook_url)
         settings["admin.webhook_urls"] = webhook_urls
 
+    workers = settings.get("transport.workers") or 1
+    if workers > 1:
+        try:
+            check_worker_settings(settings)
+        except ArgsParseError as e:
+            parser.error(str(e))
+        settings["transport.reuse_port"] = True
+        sys.exit(fork_workers(workers, functools.partial(run_worker, settings)))
+
+    run_app(settings)
+
+
+def check_worker_settings(settings: dict):
+    """
+    Check that worker processes share the state of the agent.
+
+    Each worker would otherwise hold its own DIDs, keys, records and cached
+    lookups, so a connection started through one worker could not be
+    continued through another.
+
+    Raises:
+        ArgsParseError: If the wallet, storage or cache is held in process memory
+
+    """
+    wallet_type = (settings.get("wallet.type") or "basic").lower()
+    storage_type = (
+        settings.get("storage_type") or ("indy" if wallet_type == "indy" else "basic")
+    ).lower()
+    if (
+        wallet_type != "indy"
+        or settings.get("wallet.storage_type") != "postgres_storage"
+        or storage_type == "basic"
+    ):
+        raise ArgsParseError(
+            "Parameter --workers requires an indy wallet and storage with"
+            " --wallet-storage-type postgres_storage"
+        )
+    if settings.get("cache.type") != "shared" or not settings.get("cache.path"):
+        raise ArgsParseError(
+            "Parameter --workers requires --cache-type shared and a --cache-path"
+        )
+
+
+def run_app(settings: dict):
+    """Create the conductor and run the application until it is shut down."""
     # Create the Conductor instance
     context_builder = DefaultContextBuilder(settings)
     conductor = Conductor(context_builder)
@@ -75,6 +122,66 @@ def execute(argv: Sequence[str] = None):
     run_loop(start_app(conductor), shutdown_app(conductor))
 
 
+def run_worker(settings: dict, worker_id: int):
+    """Run the application in a worker process."""
+    settings = dict(settings)
+    settings["transport.worker_id"] = worker_id
+    run_app(settings)
+
+
+def fork_workers(count: int, target: Callable[[int], None]) -> int:
+    """
+    Fork worker processes and wait for all of them to exit.
+
+    Each worker runs `target` with its worker number. SIGTERM is passed on
+    to the workers, SIGINT is ignored as a terminal delivers it to the whole
+    process group.
+
+    Returns: 0 if every worker exited cleanly, 1 otherwise
+
+    """
+    workers = {}
+    for worker_id in range(count):
+        pid = os.fork()
+        if not pid:
+            code = 0
+            try:
+                target(worker_id)
+            except SystemExit as e:
+                code = e.code if isinstance(e.code, int) else 1
+            except BaseException:
+                LOGGER.exception("Error in worker %d:", worker_id)
+                code = 1
+            finally:
+                os._exit(code)
+        workers[pid] = worker_id
+    LOGGER.info("Started %d worker processes", count)
+
+    def terminate(signum, _frame):
+        for pid in workers:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, terminate)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    result = 0
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        worker_id = workers.pop(pid, None)
+        if worker_id is None:
+            continue
+        if os.WIFSIGNALED(status) or os.WEXITSTATUS(status):
+            LOGGER.error("Worker %d exited with status %d", worker_id, status)
+            result = 1
+    return result
+
+
 def run_loop(startup: Coroutine, shutdown: Coroutine):
     """Execute the application, handling signals and ctrl-c."""
 
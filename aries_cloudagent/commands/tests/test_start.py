@@ -31,6 +31,93 @@ class TestStart(AsyncTestCase):
             assert isinstance(shutdown_app.call_args[0][0], command.Conductor)
             run_loop.assert_called_once()
 
+    def test_exec_start_workers(self):
+        with async_mock.patch.object(
+            command, "fork_workers", return_value=0
+        ) as fork_workers, async_mock.patch.object(command, "run_app") as run_app:
+            with self.assertRaises(SystemExit) as context:
+                command.execute(
+                    [
+                        "-it",
+                        "http",
+                        "0.0.0.0",
+                        "80",
+                        "-ot",
+                        "http",
+                        "--workers",
+                        "3",
+                        "--wallet-type",
+                        "indy",
+                        "--wallet-storage-type",
+                        "postgres_storage",
+                        "--cache-type",
+                        "shared",
+                        "--cache-path",
+                        "/tmp/cache.db",
+                    ]
+                )
+            assert context.exception.code == 0
+            run_app.assert_not_called()
+            assert fork_workers.call_args[0][0] == 3
+
+            run_worker = fork_workers.call_args[0][1]
+            run_worker(2)
+            settings = run_app.call_args[0][0]
+            assert settings["transport.worker_id"] == 2
+            assert settings["transport.reuse_port"]
+
+    def test_exec_start_workers_x(self):
+        args = ["-it", "http", "0.0.0.0", "80", "-ot", "http", "--workers", "3"]
+        with async_mock.patch.object(
+            command, "fork_workers", return_value=0
+        ) as fork_workers, async_mock.patch.object(
+            command.ArgumentParser, "print_usage"
+        ):
+            # each worker would hold its own wallet, storage and cache
+            with self.assertRaises(SystemExit) as context:
+                command.execute(args)
+            assert context.exception.code == 2
+            with self.assertRaises(SystemExit):
+                command.execute(
+                    args
+                    + [
+                        "--wallet-type",
+                        "indy",
+                        "--wallet-storage-type",
+                        "postgres_storage",
+                    ]
+                )
+            fork_workers.assert_not_called()
+
+    def test_fork_workers(self):
+        with async_mock.patch.object(
+            command.os, "fork", side_effect=[101, 102]
+        ) as fork, async_mock.patch.object(
+            command.os, "wait", side_effect=[(101, 0), (102, 256)]
+        ), async_mock.patch.object(
+            command.os, "kill"
+        ) as kill, async_mock.patch.object(
+            command.signal, "signal"
+        ) as set_signal:
+            assert command.fork_workers(2, async_mock.MagicMock()) == 1
+            assert fork.call_count == 2
+
+            terminate = set_signal.call_args_list[0][0][1]
+            terminate(command.signal.SIGTERM, None)
+            kill.assert_not_called()  # all workers exited
+
+    def test_fork_workers_child(self):
+        target = async_mock.MagicMock(side_effect=SystemExit(3))
+        with async_mock.patch.object(
+            command.os, "fork", return_value=0
+        ), async_mock.patch.object(
+            command.os, "_exit", side_effect=SystemExit
+        ) as os_exit:
+            with self.assertRaises(SystemExit):
+                command.fork_workers(2, target)
+            target.assert_called_once_with(0)
+            os_exit.assert_called_once_with(3)
+
     async def test_run_loop(self):
         startup = async_mock.CoroutineMock()
         startup_call = startup()
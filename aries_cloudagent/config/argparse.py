@@ -2,13 +2,14 @@
 
 import abc
 import os
+import socket
 
 from argparse import ArgumentParser, Namespace
 from typing import Type
 
 from .error import ArgsParseError
 from .util import ByteSize
-from ..utils.tracing import trace_event
+from ..utils.tracing import parse_sample_ratio, trace_event
 
 CAT_PROVISION = "general"
 CAT_START = "start"
@@ -166,6 +167,53 @@ class AdminGroup(ArgumentGroup):
         return settings
 
 
+@group(CAT_START)
+class CacheGroup(ArgumentGroup):
+    """Cache settings."""
+
+    GROUP_NAME = "Cache"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add cache-specific command line arguments to the parser."""
+        parser.add_argument(
+            "--cache-type",
+            type=str,
+            metavar="<cache-type>",
+            help="Specifies the type of cache used for connection targets, ledger\
+            lookups and other shared data. Supported cache types are 'basic'\
+            (unbounded memory), 'lru' (bounded memory with least recently used\
+            eviction) and 'shared' (a database file shared by all agent processes\
+            on the host, see '--cache-path'). Default: 'basic'.",
+        )
+        parser.add_argument(
+            "--cache-max-size",
+            type=int,
+            metavar="<max-size>",
+            help="Set the maximum number of keys held by the 'lru' cache before\
+            the least recently used entries are evicted. Default: 10000.",
+        )
+        parser.add_argument(
+            "--cache-path",
+            type=str,
+            metavar="<cache-path>",
+            help="Specifies the database file used by the 'shared' cache. Agent\
+            processes started with the same path share cached ledger and\
+            connection lookups, and only one of them fetches a missing entry.\
+            If not provided, the 'shared' cache is kept in memory.",
+        )
+
+    def get_settings(self, args: Namespace) -> dict:
+        """Extract cache settings."""
+        settings = {}
+        if args.cache_type:
+            settings["cache.type"] = args.cache_type
+        if args.cache_max_size:
+            settings["cache.max_size"] = args.cache_max_size
+        if args.cache_path:
+            settings["cache.path"] = args.cache_path
+        return settings
+
+
 @group(CAT_START)
 class DebugGroup(ArgumentGroup):
     """Debug settings."""
@@ -535,6 +583,97 @@ class LoggingGroup(ArgumentGroup):
         return settings
 
 
+@group(CAT_START)
+class PersonalDataStorageGroup(ArgumentGroup):
+    """Personal data storage settings."""
+
+    GROUP_NAME = "Personal Data Storage"
+
+    def add_arguments(self, parser: ArgumentParser):
+        """Add personal data storage command line arguments to the parser."""
+        parser.add_argument(
+            "--pds-http-limit",
+            type=int,
+            metavar="<limit>",
+            help="Set the maximum number of simultaneous connections held open by\
+            each HTTP based personal data storage. Default: 100.",
+        )
+        parser.add_argument(
+            "--pds-http-limit-per-host",
+            type=int,
+            metavar="<limit>",
+            help="Set the maximum number of simultaneous connections to a single\
+            personal data storage host. Default: 20.",
+        )
+        parser.add_argument(
+            "--pds-http-keepalive-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the number of seconds an idle connection to a personal\
+            data storage is kept alive for reuse. Default: 30.",
+        )
+        parser.add_argument(
+            "--pds-http-timeout",
+            type=float,
+            metavar="<seconds>",
+            help="Set the total timeout in seconds for a request to a personal\
+            data storage. Default: 60.",
+        )
+        parser.add_argument(
+            "--pds-cache-size",
+            type=ByteSize(),
+            metavar="<cache-size>",
+            help="Set the size in bytes of the in-memory cache of records loaded\
+            from personal data storages. Records are addressed by their content\
+            hash, so they are never stale. Use 0 to disable the cache.\
+            Default: 16M.",
+        )
+        parser.add_argument(
+            "--pds-cache-dir",
+            type=str,
+            metavar="<cache-dir>",
+            help="Keep records loaded from personal data storages in the given\
+            directory as well, so they survive restarts and do not count against\
+            the in-memory cache size.",
+        )
+        parser.add_argument(
+            "--pds-cache-disk-size",
+            type=ByteSize(),
+            metavar="<cache-size>",
+            help="Set the maximum size in bytes of the '--pds-cache-dir' cache.\
+            Default: unbounded.",
+        )
+        parser.add_argument(
+            "--pds-reconcile-interval",
+            type=float,
+            metavar="<seconds>",
+            help="Reconcile the table matching records with the personal data\
+            storage holding them every <seconds> seconds. The table is always\
+            reconciled at startup and when a storage is activated.",
+        )
+
+    def get_settings(self, args: Namespace) -> dict:
+        """Extract personal data storage settings."""
+        settings = {}
+        if args.pds_http_limit:
+            settings["pds.http.limit"] = args.pds_http_limit
+        if args.pds_http_limit_per_host:
+            settings["pds.http.limit_per_host"] = args.pds_http_limit_per_host
+        if args.pds_http_keepalive_timeout:
+            settings["pds.http.keepalive_timeout"] = args.pds_http_keepalive_timeout
+        if args.pds_http_timeout:
+            settings["pds.http.timeout"] = args.pds_http_timeout
+        if args.pds_cache_size is not None:
+            settings["pds.cache.max_bytes"] = args.pds_cache_size
+        if args.pds_cache_dir:
+            settings["pds.cache.path"] = args.pds_cache_dir
+        if args.pds_cache_disk_size:
+            settings["pds.cache.disk_max_bytes"] = args.pds_cache_disk_size
+        if args.pds_reconcile_interval:
+            settings["pds.reconcile_interval"] = args.pds_reconcile_interval
+        return settings
+
+
 @group(CAT_START)
 class ProtocolGroup(ArgumentGroup):
     """Protocol settings."""
@@ -601,11 +740,65 @@ class ProtocolGroup(ArgumentGroup):
             metavar="<trace-label>",
             help="Label (agent name) used logging events.",
         )
+        parser.add_argument(
+            "--trace-sample-ratio",
+            type=float,
+            metavar="<ratio>",
+            help="Share of the trace events to record, between 0 and 1.\
+            Events forced by the configuration check are always recorded.\
+            Default: 1.",
+        )
+        parser.add_argument(
+            "--trace-buffer-size",
+            type=int,
+            metavar="<count>",
+            help="Number of trace events held for an http endpoint before the\
+            oldest ones are dropped. Default: 10000.",
+        )
+        parser.add_argument(
+            "--trace-batch-size",
+            type=int,
+            metavar="<count>",
+            help="Number of trace events posted together to an http endpoint.\
+            Default: 100.",
+        )
+        parser.add_argument(
+            "--trace-flush-interval",
+            type=float,
+            metavar="<seconds>",
+            help="Longest time trace events wait for a batch to fill before\
+            they are posted to an http endpoint. Default: 1.",
+        )
         parser.add_argument(
             "--preserve-exchange-records",
             action="store_true",
             help="Keep credential exchange records after exchange has completed.",
         )
+        parser.add_argument(
+            "--proof-key-policy",
+            type=str,
+            choices=("did", "pool", "ephemeral"),
+            metavar="<policy>",
+            help="Choose the keys credential and presentation proofs are signed\
+            with: 'did' signs with the issuer DID key, or one stable key kept\
+            as a local DID of the wallet when there is no DID, 'pool' signs\
+            with a rotating pool of keys and 'ephemeral' creates a new key for\
+            every proof. Default: did.",
+        )
+        parser.add_argument(
+            "--proof-key-pool-size",
+            type=int,
+            metavar="<size>",
+            help="Set the number of signing keys used in turn under the 'pool'\
+            proof key policy. Default: 4.",
+        )
+        parser.add_argument(
+            "--proof-key-max-uses",
+            type=int,
+            metavar="<count>",
+            help="Set the number of proofs signed with a pooled key before it is\
+            replaced by a new key, 0 to never replace it. Default: 10000.",
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Get protocol settings."""
@@ -638,6 +831,19 @@ class ProtocolGroup(ArgumentGroup):
             settings["trace.label"] = args.label
         else:
             settings["trace.label"] = "aca-py.agent"
+        if args.trace_sample_ratio is not None:
+            try:
+                settings["trace.sample_ratio"] = parse_sample_ratio(
+                    args.trace_sample_ratio
+                )
+            except ValueError:
+                raise ArgsParseError("Parameter --trace-sample-ratio must be 0 to 1")
+        if args.trace_buffer_size:
+            settings["trace.buffer_size"] = args.trace_buffer_size
+        if args.trace_batch_size:
+            settings["trace.batch_size"] = args.trace_batch_size
+        if args.trace_flush_interval:
+            settings["trace.flush_interval"] = args.trace_flush_interval
         if settings.get("trace.enabled") or settings.get("trace.target"):
             # make sure we can trace to the configured target
             # (target can be set even if tracing is off)
@@ -654,6 +860,12 @@ class ProtocolGroup(ArgumentGroup):
                 raise ArgsParseError("Error writing trace event " + str(e))
         if args.preserve_exchange_records:
             settings["preserve_exchange_records"] = True
+        if args.proof_key_policy:
+            settings["proof_key.policy"] = args.proof_key_policy
+        if args.proof_key_pool_size:
+            settings["proof_key.pool_size"] = args.proof_key_pool_size
+        if args.proof_key_max_uses is not None:
+            settings["proof_key.max_uses"] = args.proof_key_max_uses
         return settings
 
 
@@ -716,6 +928,43 @@ class TransportGroup(ArgumentGroup):
             to hold messages for delivery to agents without an endpoint. This\
             option will require additional memory to store messages in the queue.",
         )
+        parser.add_argument(
+            "--undelivered-queue-path",
+            type=str,
+            metavar="<path>",
+            help="Keep the undelivered queue in the given SQLite file as well, so\
+            that queued messages survive restarts and only part of them are held\
+            in memory. With --workers, each worker process keeps its own file,\
+            named after the path with the worker number appended.",
+        )
+        parser.add_argument(
+            "--undelivered-queue-max-bytes",
+            type=ByteSize(min_size=1024),
+            metavar="<size>",
+            help="Set the byte budget of all the messages in the undelivered\
+            queue, beyond which the oldest ones are dropped. Default: 64M.",
+        )
+        parser.add_argument(
+            "--undelivered-queue-max-key-bytes",
+            type=ByteSize(min_size=1024),
+            metavar="<size>",
+            help="Set the byte budget of the undelivered messages for each\
+            recipient key, beyond which the oldest ones are dropped. Default: 8M.",
+        )
+        parser.add_argument(
+            "--undelivered-queue-memory-bytes",
+            type=ByteSize(min_size=1024),
+            metavar="<size>",
+            help="Set the bytes of undelivered messages held in memory when the\
+            queue is kept in a file with --undelivered-queue-path. Default: 8M.",
+        )
+        parser.add_argument(
+            "--undelivered-queue-ttl",
+            type=int,
+            metavar="<seconds>",
+            help="Set the time undelivered messages are held before they expire.\
+            Default: 604800 (one week).",
+        )
         parser.add_argument(
             "--max-outbound-retry",
             default=4,
@@ -724,6 +973,19 @@ class TransportGroup(ArgumentGroup):
             messages. Increasing this number might cause to increase the\
             accumulated messages in message queue. Default value is 4.",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            metavar="<count>",
+            help="Fork <count> worker processes, each running the agent in its\
+            own event loop. The inbound transports and the admin server of all\
+            workers bind the same ports with SO_REUSEPORT, and the kernel spreads\
+            incoming connections across them. The workers require an indy wallet\
+            and storage with '--wallet-storage-type postgres_storage', and a\
+            'shared' cache with a '--cache-path'. The in-memory connection and\
+            route indexes are disabled; caches of immutable PDS records and\
+            verified proofs are kept by each worker. Default: 1.",
+        )
 
     def get_settings(self, args: Namespace):
         """Extract transport settings."""
@@ -731,6 +993,22 @@ class TransportGroup(ArgumentGroup):
         settings["transport.inbound_configs"] = args.inbound_transports
         settings["transport.outbound_configs"] = args.outbound_transports
         settings["transport.enable_undelivered_queue"] = args.enable_undelivered_queue
+        if args.undelivered_queue_path:
+            settings["transport.undelivered.path"] = args.undelivered_queue_path
+        if args.undelivered_queue_max_bytes:
+            settings[
+                "transport.undelivered.max_bytes"
+            ] = args.undelivered_queue_max_bytes
+        if args.undelivered_queue_max_key_bytes:
+            settings[
+                "transport.undelivered.max_key_bytes"
+            ] = args.undelivered_queue_max_key_bytes
+        if args.undelivered_queue_memory_bytes:
+            settings[
+                "transport.undelivered.max_memory_bytes"
+            ] = args.undelivered_queue_memory_bytes
+        if args.undelivered_queue_ttl:
+            settings["transport.undelivered.ttl"] = args.undelivered_queue_ttl
 
         if args.label:
             settings["default_label"] = args.label
@@ -738,6 +1016,14 @@ class TransportGroup(ArgumentGroup):
             settings["transport.max_message_size"] = args.max_message_size
         if args.max_outbound_retry:
             settings["transport.max_outbound_retry"] = args.max_outbound_retry
+        if args.workers:
+            if args.workers < 1:
+                raise ArgsParseError("Parameter --workers must be at least 1")
+            if args.workers > 1 and not hasattr(socket, "SO_REUSEPORT"):
+                raise ArgsParseError(
+                    "Parameter --workers requires SO_REUSEPORT support"
+                )
+            settings["transport.workers"] = args.workers
 
         return settings
 
@@ -825,6 +1111,23 @@ class WalletGroup(ArgumentGroup):
             admin_user must have the CREATEDB role or else initialization\
             will fail.',
         )
+        parser.add_argument(
+            "--wallet-crypto-executor",
+            type=str,
+            choices=("thread", "process", "inline"),
+            metavar="<mode>",
+            help="Where the basic and http wallets pack and unpack messages:\
+            'thread' in a thread pool, 'process' in a process pool which uses\
+            several cores, or 'inline' on the event loop. Default: thread.",
+        )
+        parser.add_argument(
+            "--wallet-crypto-workers",
+            type=int,
+            metavar="<count>",
+            help="Set the number of workers of the '--wallet-crypto-executor'\
+            pool. Default: the number of processors, for threads the event\
+            loop default executor is used.",
+        )
         parser.add_argument(
             "--replace-public-did",
             action="store_true",
@@ -854,6 +1157,10 @@ class WalletGroup(ArgumentGroup):
             settings["wallet.storage_config"] = args.wallet_storage_config
         if args.wallet_storage_creds:
             settings["wallet.storage_creds"] = args.wallet_storage_creds
+        if args.wallet_crypto_executor:
+            settings["wallet.crypto.executor"] = args.wallet_crypto_executor
+        if args.wallet_crypto_workers:
+            settings["wallet.crypto.workers"] = args.wallet_crypto_workers
         if args.replace_public_did:
             settings["wallet.replace_public_did"] = True
         return settings
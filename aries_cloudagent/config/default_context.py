@@ -4,8 +4,10 @@ from .base_context import ContextBuilder
 from .injection_context import InjectionContext
 from .provider import CachedProvider, ClassProvider, StatsProvider
 
+from ..aathcf.proof_keys import ProofKeyManager
 from ..cache.base import BaseCache
-from ..cache.basic import BasicCache
+from ..cache.provider import CacheProvider
+from ..connections.connection_index import ConnectionIndex
 from ..core.plugin_registry import PluginRegistry
 from ..core.protocol_registry import ProtocolRegistry
 from ..ledger.base import BaseLedger
@@ -19,6 +21,7 @@ from ..protocols.actionmenu.v1_0.base_service import BaseMenuService
 from ..protocols.actionmenu.v1_0.driver_service import DriverMenuService
 from ..protocols.introduction.v0_1.base_service import BaseIntroductionService
 from ..protocols.introduction.v0_1.demo_service import DemoIntroductionService
+from ..protocols.routing.v1_0.route_index import RouteIndex
 
 from ..storage.base import BaseStorage
 from ..storage.provider import StorageProvider
@@ -29,6 +32,7 @@ from ..wallet.provider import WalletProvider
 
 
 from ..pdstorage_thcf.base import BasePDS
+from ..pdstorage_thcf.cache import PDSRecordCache
 from ..pdstorage_thcf.provider import PersonalDataStorageProvider
 
 
@@ -40,17 +44,41 @@ class DefaultContextBuilder(ContextBuilder):
         context = InjectionContext(settings=self.settings)
         context.settings.set_default("default_label", "Aries Cloud Agent")
 
+        collector = None
         if context.settings.get("timing.enabled"):
             timing_log = context.settings.get("timing.log_file")
             collector = Collector(log_path=timing_log)
             context.injector.bind_instance(Collector, collector)
 
-        # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, BasicCache())
+        # Shared cache, in-memory unless configured otherwise
+        context.injector.bind_provider(BaseCache, CachedProvider(CacheProvider()))
+
+        # Cache of immutable records loaded from personal data storages,
+        # kept by each worker process as the records never change
+        pds_cache_size = context.settings.get_int("pds.cache.max_bytes")
+        if pds_cache_size != 0:
+            context.injector.bind_instance(
+                PDSRecordCache,
+                PDSRecordCache(
+                    pds_cache_size,
+                    disk_path=context.settings.get("pds.cache.path"),
+                    disk_max_bytes=context.settings.get_int("pds.cache.disk_max_bytes"),
+                    collector=collector,
+                ),
+            )
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
 
+        # Connections of inbound messages, unless worker processes update them
+        if (context.settings.get_int("transport.workers") or 1) == 1:
+            context.injector.bind_instance(ConnectionIndex, ConnectionIndex())
+
+        # Forward routes of the mediator, loaded on startup, unless worker
+        # processes create and delete them
+        if (context.settings.get_int("transport.workers") or 1) == 1:
+            context.injector.bind_instance(RouteIndex, RouteIndex())
+
         await self.bind_providers(context)
         await self.load_plugins(context)
 
@@ -100,12 +128,16 @@ class DefaultContextBuilder(ContextBuilder):
                 )
             ),
         )
+        context.injector.bind_instance(
+            ProofKeyManager, ProofKeyManager.from_settings(context.settings)
+        )
         context.injector.bind_provider(
             BaseIssuer,
             StatsProvider(
                 ClassProvider(
                     "aries_cloudagent.issuer.pds.PDSIssuer",
                     ClassProvider.Inject(BaseWallet),
+                    ClassProvider.Inject(ProofKeyManager),
                 ),
                 ("create_credential_offer", "create_credential"),
             ),
@@ -118,15 +150,19 @@ class DefaultContextBuilder(ContextBuilder):
                     ClassProvider.Inject(BaseWallet),
                     ClassProvider.Inject(BaseStorage),
                     context,
+                    ClassProvider.Inject(ProofKeyManager),
                 ),
                 ("get_credential", "store_credential", "create_credential_request"),
             ),
         )
+        # one verifier instance, keeping its cache of verified proofs
         context.injector.bind_provider(
             BaseVerifier,
-            ClassProvider(
-                "aries_cloudagent.verifier.pds.PDSVerifier",
-                ClassProvider.Inject(BaseWallet),
+            CachedProvider(
+                ClassProvider(
+                    "aries_cloudagent.verifier.pds.PDSVerifier",
+                    ClassProvider.Inject(BaseWallet),
+                )
             ),
         )
         context.injector.bind_provider(
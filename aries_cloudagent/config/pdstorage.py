@@ -1,6 +1,8 @@
 from .injection_context import InjectionContext
 from ..pdstorage_thcf.models.saved_personal_storage import SavedPDS
 from ..pdstorage_thcf.base import BasePDS
+from ..pdstorage_thcf.provider import PersonalDataStorageProvider
+from ..pdstorage_thcf.reconcile import MatchTableReconciler
 from ..storage.error import StorageNotFoundError
 
 
@@ -31,3 +33,23 @@ async def personal_data_storage_config(context: InjectionContext):
         default_storage = SavedPDS(state=SavedPDS.ACTIVE)
 
         await default_storage.save(context)
+
+    # background repair of the match table of records held in the PDS
+    reconciler = await context.inject(MatchTableReconciler, required=False)
+    if not reconciler:
+        interval = context.settings.get("pds.reconcile_interval")
+        reconciler = MatchTableReconciler(
+            interval=float(interval) if interval else None
+        )
+        context.injector.bind_instance(MatchTableReconciler, reconciler)
+    reconciler.start(context)
+
+
+async def personal_data_storage_shutdown(context: InjectionContext):
+    """Close connection pools held by the personal storage instances."""
+    reconciler = await context.inject(MatchTableReconciler, required=False)
+    if reconciler:
+        await reconciler.stop()
+    provider = context.injector.get_provider(BasePDS)
+    if isinstance(provider, PersonalDataStorageProvider):
+        await provider.stop()
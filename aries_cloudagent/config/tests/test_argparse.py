@@ -42,6 +42,16 @@ class TestArgParse(AsyncTestCase):
                 "http",
                 "--max-outbound-retry",
                 "5",
+                "--undelivered-queue-path",
+                "/tmp/queue.db",
+                "--undelivered-queue-max-bytes",
+                "16M",
+                "--undelivered-queue-max-key-bytes",
+                "1M",
+                "--undelivered-queue-memory-bytes",
+                "2M",
+                "--undelivered-queue-ttl",
+                "3600",
             ]
         )
 
@@ -53,6 +63,82 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert "transport.workers" not in settings
+        assert settings["transport.undelivered.path"] == "/tmp/queue.db"
+        assert settings["transport.undelivered.max_bytes"] == 16 << 20
+        assert settings["transport.undelivered.max_key_bytes"] == 1 << 20
+        assert settings["transport.undelivered.max_memory_bytes"] == 2 << 20
+        assert settings["transport.undelivered.ttl"] == 3600
+
+    async def test_transport_workers(self):
+        parser = ArgumentParser()
+        group = argparse.TransportGroup()
+        group.add_arguments(parser)
+        args = ["-it", "http", "0.0.0.0", "80", "-ot", "http", "--workers"]
+
+        result = parser.parse_args(args + ["4"])
+        assert group.get_settings(result)["transport.workers"] == 4
+
+        result = parser.parse_args(args + ["-1"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+        result = parser.parse_args(args + ["2"])
+        with async_mock.patch.object(argparse, "socket", object()):
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_trace_settings(self):
+        parser = ArgumentParser()
+        group = argparse.ProtocolGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "--trace-sample-ratio",
+                "0.25",
+                "--trace-buffer-size",
+                "500",
+                "--trace-batch-size",
+                "50",
+                "--trace-flush-interval",
+                "0.5",
+            ]
+        )
+        result.label = None
+        with async_mock.patch.object(argparse, "trace_event", async_mock.MagicMock()):
+            settings = group.get_settings(result)
+        assert settings["trace.sample_ratio"] == 0.25
+        assert settings["trace.buffer_size"] == 500
+        assert settings["trace.batch_size"] == 50
+        assert settings["trace.flush_interval"] == 0.5
+
+        result = parser.parse_args(["--trace-sample-ratio", "1.5"])
+        result.label = None
+        with async_mock.patch.object(argparse, "trace_event", async_mock.MagicMock()):
+            with self.assertRaises(argparse.ArgsParseError):
+                group.get_settings(result)
+
+    async def test_cache_settings(self):
+        """Test cache argument parsing."""
+
+        parser = ArgumentParser()
+        group = argparse.CacheGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(["--cache-type", "lru", "--cache-max-size", "500"])
+        settings = group.get_settings(result)
+
+        assert settings.get("cache.type") == "lru"
+        assert settings.get("cache.max_size") == 500
+
+        result = parser.parse_args(
+            ["--cache-type", "shared", "--cache-path", "/tmp/cache.db"]
+        )
+        settings = group.get_settings(result)
+
+        assert settings.get("cache.type") == "shared"
+        assert settings.get("cache.path") == "/tmp/cache.db"
 
     def test_bytesize(self):
         bs = ByteSize()
@@ -2,7 +2,14 @@ from tempfile import NamedTemporaryFile
 
 from asynctest import TestCase as AsyncTestCase
 
+from ...cache.base import BaseCache
+from ...cache.basic import BasicCache
+from ...cache.lru import LRUCache
+from ...cache.shared import SharedCache
+from ...connections.connection_index import ConnectionIndex
 from ...core.protocol_registry import ProtocolRegistry
+from ...pdstorage_thcf.cache import PDSRecordCache
+from ...protocols.routing.v1_0.route_index import RouteIndex
 from ...storage.base import BaseStorage
 from ...transport.wire_format import BaseWireFormat
 from ...wallet.base import BaseWallet
@@ -26,6 +33,7 @@ class TestDefaultContext(AsyncTestCase):
             BaseStorage,
         ):
             assert isinstance(await result.inject(cls), cls)
+        assert isinstance(await result.inject(BaseCache), BasicCache)
 
         builder = DefaultContextBuilder(
             settings={
@@ -35,3 +43,45 @@ class TestDefaultContext(AsyncTestCase):
         )
         result = await builder.build()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_workers(self):
+        """Test the in-memory indexes are only used by a single process."""
+
+        result = await DefaultContextBuilder().build()
+        assert await result.inject(ConnectionIndex, required=False)
+        assert await result.inject(RouteIndex, required=False)
+
+        builder = DefaultContextBuilder(settings={"transport.workers": 2})
+        result = await builder.build()
+        assert not await result.inject(ConnectionIndex, required=False)
+        assert not await result.inject(RouteIndex, required=False)
+
+    async def test_build_context_lru_cache(self):
+        """Test context init with the LRU cache selected."""
+
+        builder = DefaultContextBuilder(
+            settings={"cache.type": "lru", "cache.max_size": 10}
+        )
+        result = await builder.build()
+        cache = await result.inject(BaseCache)
+        assert isinstance(cache, LRUCache)
+        assert cache.max_size == 10
+        assert cache is await result.inject(BaseCache)
+
+    async def test_build_context_shared_cache(self):
+        """Test context init with the shared cache selected."""
+
+        builder = DefaultContextBuilder(settings={"cache.type": "shared"})
+        result = await builder.build()
+        assert isinstance(await result.inject(BaseCache), SharedCache)
+
+    async def test_build_context_pds_cache(self):
+        """Test context init of the PDS record cache."""
+
+        result = await DefaultContextBuilder().build()
+        cache = await result.inject(PDSRecordCache)
+        assert cache.max_bytes == PDSRecordCache.DEFAULT_MAX_BYTES
+
+        builder = DefaultContextBuilder(settings={"pds.cache.max_bytes": 0})
+        result = await builder.build()
+        assert await result.inject(PDSRecordCache, required=False) is None
@@ -0,0 +1,143 @@
+"""In-memory index of the connections of inbound messages."""
+
+import time
+
+from collections import OrderedDict
+from typing import Mapping, Tuple
+
+
+class ConnectionIndexEntry:
+    """A connection record snapshot with the DIDs resolved for a pair of verkeys."""
+
+    __slots__ = (
+        "connection_id",
+        "expires",
+        "recipient_did",
+        "recipient_did_public",
+        "sender_did",
+        "value",
+    )
+
+    def __init__(
+        self,
+        connection_id: str,
+        value: Mapping,
+        sender_did: str,
+        recipient_did: str,
+        recipient_did_public: bool,
+        expires: float,
+    ):
+        """Initialize the entry."""
+        self.connection_id = connection_id
+        self.expires = expires
+        self.recipient_did = recipient_did
+        self.recipient_did_public = recipient_did_public
+        self.sender_did = sender_did
+        self.value = value
+
+
+class ConnectionIndex:
+    """
+    Connections by sender and recipient verkey, with their stored values.
+
+    Inbound messages on established connections are matched to a connection
+    record without any storage or wallet lookup. Saving or deleting a
+    connection record removes its entries; an entry resolved while a record
+    was saved is not kept, as it may hold the old values.
+    """
+
+    DEFAULT_MAX_SIZE = 100000
+    DEFAULT_TTL = 3600
+
+    def __init__(self, max_size: int = None, ttl: float = None):
+        """Initialize the connection index."""
+        self.max_size = max_size or self.DEFAULT_MAX_SIZE
+        self.ttl = ttl or self.DEFAULT_TTL
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self._by_connection = {}
+        self._entries = OrderedDict()
+
+    @property
+    def count(self) -> int:
+        """Accessor for the number of indexed verkey pairs."""
+        return len(self._entries)
+
+    def get(self, sender_verkey: str, recipient_verkey: str) -> ConnectionIndexEntry:
+        """Find the connection of a pair of verkeys, if it is indexed."""
+        key = (sender_verkey, recipient_verkey)
+        entry = self._entries.get(key)
+        if entry and entry.expires > time.perf_counter():
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+        if entry:
+            self._remove(key)
+        self.misses += 1
+        return None
+
+    def add(
+        self,
+        sender_verkey: str,
+        recipient_verkey: str,
+        connection_id: str,
+        value: Mapping,
+        *,
+        sender_did: str = None,
+        recipient_did: str = None,
+        recipient_did_public: bool = False,
+        generation: int = None,
+    ):
+        """
+        Index the connection resolved for a pair of verkeys.
+
+        Args:
+            sender_verkey: The sender verkey of the inbound message
+            recipient_verkey: The recipient verkey of the inbound message
+            connection_id: The ID of the connection record
+            value: The stored value of the connection record
+            sender_did: The DID resolved for the sender verkey
+            recipient_did: The DID resolved for the recipient verkey
+            recipient_did_public: Whether the recipient DID is public
+            generation: The `generation` read before the connection was
+                resolved, to skip entries made stale by a record update
+
+        """
+        if generation is not None and generation != self.generation:
+            return
+        key = (sender_verkey, recipient_verkey)
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = ConnectionIndexEntry(
+            connection_id,
+            value,
+            sender_did,
+            recipient_did,
+            recipient_did_public,
+            time.perf_counter() + self.ttl,
+        )
+        self._by_connection.setdefault(connection_id, set()).add(key)
+        while len(self._entries) > self.max_size:
+            self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: Tuple[str, str]):
+        """Remove the entry of a pair of verkeys."""
+        entry = self._entries.pop(key)
+        keys = self._by_connection.get(entry.connection_id)
+        if keys:
+            keys.discard(key)
+            if not keys:
+                del self._by_connection[entry.connection_id]
+
+    def invalidate(self, connection_id: str):
+        """Remove the entries of a connection after its record has changed."""
+        self.generation += 1
+        for key in self._by_connection.pop(connection_id, ()):
+            del self._entries[key]
+
+    def clear(self):
+        """Remove all the entries."""
+        self.generation += 1
+        self._by_connection.clear()
+        self._entries.clear()
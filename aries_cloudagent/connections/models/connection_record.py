@@ -3,6 +3,7 @@
 from marshmallow import fields, validate
 
 from ...config.injection_context import InjectionContext
+from ..connection_index import ConnectionIndex
 from ...messaging.models.base_record import BaseRecord, BaseRecordSchema
 from ...messaging.valid import INDY_DID, INDY_RAW_PUBLIC_KEY, UUIDFour
 
@@ -260,6 +261,22 @@ class ConnectionRecord(BaseRecord):  # lgtm[py/missing-equals]
         # clear cache key set by connection manager
         cache_key = self.cache_key(self.connection_id, "connection_target")
         await self.clear_cached_key(context, cache_key)
+        await self.clear_indexed(context)
+
+    async def delete_record(self, context: InjectionContext):
+        """Remove the stored record.
+
+        Args:
+            context: The injection context to use
+        """
+        await super().delete_record(context)
+        await self.clear_indexed(context)
+
+    async def clear_indexed(self, context: InjectionContext):
+        """Remove this connection from the index of inbound connections, if any."""
+        index: ConnectionIndex = await context.inject(ConnectionIndex, required=False)
+        if index:
+            index.invalidate(self.connection_id)
 
 
 class ConnectionRecordSchema(BaseRecordSchema):
@@ -0,0 +1,89 @@
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+
+from .. import connection_index as test_module
+from ..connection_index import ConnectionIndex
+from ..models.connection_record import ConnectionRecord
+
+
+class TestConnectionIndex(AsyncTestCase):
+    def test_add_get(self):
+        index = ConnectionIndex()
+        assert index.get("sender", "recipient") is None
+        index.add(
+            "sender",
+            "recipient",
+            "conn-id",
+            {"state": "active"},
+            sender_did="sender-did",
+            recipient_did="recipient-did",
+            recipient_did_public=True,
+        )
+        entry = index.get("sender", "recipient")
+        assert entry.connection_id == "conn-id"
+        assert entry.value == {"state": "active"}
+        assert (entry.sender_did, entry.recipient_did) == (
+            "sender-did",
+            "recipient-did",
+        )
+        assert entry.recipient_did_public
+        assert (index.hits, index.misses) == (1, 1)
+
+        index.add("sender", "recipient", "other-id", {})
+        assert index.get("sender", "recipient").connection_id == "other-id"
+        index.invalidate("conn-id")
+        assert index.count == 1
+        index.clear()
+        assert index.count == 0
+
+    def test_invalidate(self):
+        index = ConnectionIndex()
+        index.add("sender", "recipient", "conn-id", {})
+        index.add("sender", "other-recipient", "conn-id", {})
+        index.add("other-sender", "recipient", "other-id", {})
+        generation = index.generation
+        index.invalidate("conn-id")
+        assert index.count == 1
+        assert index.get("sender", "recipient") is None
+
+        # resolved before the update, the entry may be stale
+        index.add("sender", "recipient", "conn-id", {}, generation=generation)
+        assert index.get("sender", "recipient") is None
+        index.add("sender", "recipient", "conn-id", {}, generation=index.generation)
+        assert index.get("sender", "recipient")
+
+    def test_bounds(self):
+        index = ConnectionIndex(max_size=2)
+        index.add("s1", "r", "c1", {})
+        index.add("s2", "r", "c2", {})
+        assert index.get("s1", "r")
+        index.add("s3", "r", "c3", {})
+        assert index.count == 2
+        assert index.get("s2", "r") is None
+        index.invalidate("c2")
+
+        with async_mock.patch.object(test_module.time, "perf_counter") as mock_time:
+            mock_time.return_value = 1e12
+            assert index.get("s1", "r") is None
+        assert index.count == 1
+
+    async def test_record_invalidates(self):
+        context = InjectionContext(enforce_typing=False)
+        context.injector.bind_instance(BaseStorage, BasicStorage())
+        index = ConnectionIndex()
+        context.injector.bind_instance(ConnectionIndex, index)
+
+        record = ConnectionRecord(state=ConnectionRecord.STATE_ACTIVE)
+        await record.save(context)
+        index.add("sender", "recipient", record.connection_id, record.value)
+
+        record.state = ConnectionRecord.STATE_INACTIVE
+        await record.save(context)
+        assert index.get("sender", "recipient") is None
+
+        index.add("sender", "recipient", record.connection_id, record.value)
+        await record.delete_record(context)
+        assert index.get("sender", "recipient") is None
@@ -13,6 +13,7 @@ import logging
 
 from ..admin.base_server import BaseAdminServer
 from ..admin.server import AdminServer
+from ..cache.base import BaseCache
 from ..config.default_context import ContextBuilder
 from ..config.injection_context import InjectionContext
 from ..config.ledger import ledger_config
@@ -24,6 +25,7 @@ from ..protocols.connections.v1_0.manager import (
     ConnectionManager,
     ConnectionManagerError,
 )
+from ..protocols.routing.v1_0.manager import RoutingManager
 from ..transport.inbound.manager import InboundTransportManager
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.base import OutboundDeliveryError
@@ -32,7 +34,11 @@ from ..transport.outbound.message import OutboundMessage
 from ..transport.wire_format import BaseWireFormat
 from ..utils.task_queue import CompletedTask, TaskQueue
 from ..utils.stats import Collector
-from ..config.pdstorage import personal_data_storage_config
+from ..utils.tracing import close_trace_exporters, trace_exporter_stats
+from ..config.pdstorage import (
+    personal_data_storage_config,
+    personal_data_storage_shutdown,
+)
 
 from .dispatcher import Dispatcher
 
@@ -112,6 +118,7 @@ class Conductor:
                     self.stop,
                     self.dispatcher.task_queue,
                     self.get_stats,
+                    Dispatcher.PRIORITY_ADMIN,
                 )
                 webhook_urls = context.settings.get("admin.webhook_urls")
                 if webhook_urls:
@@ -153,6 +160,12 @@ class Conductor:
 
         context = self.context
 
+        # Load the forward routes before any forward message comes in
+        try:
+            await RoutingManager(context).route_index()
+        except Exception:
+            LOGGER.exception("Unable to load the forward routes")
+
         # Start up transports
         try:
             await self.inbound_transport_manager.start()
@@ -237,7 +250,14 @@ class Conductor:
             shutdown.run(self.inbound_transport_manager.stop())
         if self.outbound_transport_manager:
             shutdown.run(self.outbound_transport_manager.stop())
+        if self.context:
+            shutdown.run(personal_data_storage_shutdown(self.context))
+        shutdown.run(close_trace_exporters())
         await shutdown.complete(timeout)
+        if self.context:
+            cache: BaseCache = await self.context.inject(BaseCache, required=False)
+            if cache:
+                cache.close()
 
     def inbound_message_router(
         self, message: InboundMessage, can_respond: bool = False
@@ -307,6 +327,10 @@ class Conductor:
             "task_done": self.dispatcher.task_queue.total_done,
             "task_failed": self.dispatcher.task_queue.total_failed,
             "task_pending": self.dispatcher.task_queue.current_pending,
+            "task_held": self.dispatcher.held_count,
+            "task_priorities": self.dispatcher.task_queue.stats(),
+            "out_priorities": self.outbound_transport_manager.task_queue.stats(),
+            "trace_exporters": trace_exporter_stats(),
         }
         for m in self.outbound_transport_manager.outbound_buffer:
             if m.state == QueuedOutboundMessage.STATE_ENCODE:
@@ -8,6 +8,8 @@ lifecycle hook callbacks storing state for message threads, etc.
 import asyncio
 import logging
 import os
+import time
+from collections import deque
 from typing import Callable, Coroutine, Union
 
 from aiohttp.web import HTTPException
@@ -24,6 +26,7 @@ from .error import ProtocolMinorVersionNotSupported
 from ..protocols.connections.v1_0.manager import ConnectionManager
 from ..protocols.problem_report.v1_0.message import ProblemReport
 
+from ..transport.error import TransportBusyError
 from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.message import OutboundMessage
 from ..utils.stats import Collector
@@ -34,6 +37,17 @@ from ..utils.tracing import trace_event, get_timer
 LOGGER = logging.getLogger(__name__)
 
 
+class ConnectionShard:
+    """The inbound messages of one connection, in flight and held back."""
+
+    __slots__ = ("in_flight", "held")
+
+    def __init__(self):
+        """Initialize the connection shard."""
+        self.in_flight = 0
+        self.held = deque()
+
+
 class Dispatcher:
     """
     Dispatcher class.
@@ -42,25 +56,64 @@ class Dispatcher:
     to other agents.
     """
 
+    # task queue priority classes, so handlers and admin requests do not
+    # starve each other
+    PRIORITY_INBOUND = "inbound"
+    PRIORITY_ADMIN = "admin"
+
+    # seconds after which a sender rejected for backpressure should retry
+    RETRY_AFTER = 1
+
+    # shard of the messages without a sender verkey, which are not resolved to
+    # a connection before they are handled
+    ANONYMOUS_KEY = "anonymous"
+
     def __init__(self, context: InjectionContext):
         """Initialize an instance of Dispatcher."""
         self.context = context
         self.collector: Collector = None
         self.task_queue: TaskQueue = None
+        self.max_per_connection = 0
+        self.max_held_per_connection = 0
+        self.max_pending = 0
+        self.held_count = 0
+        self._shards = {}
 
     async def setup(self):
         """Perform async instance setup."""
         self.collector = await self.context.inject(Collector, required=False)
         max_active = int(os.getenv("DISPATCHER_MAX_ACTIVE", 50))
+        # by default each class may use all but a fifth of the active slots
+        class_max = max_active - max(1, max_active // 5) if max_active > 1 else 0
+        priorities = {
+            self.PRIORITY_INBOUND: int(
+                os.getenv("DISPATCHER_MAX_ACTIVE_INBOUND", class_max)
+            ),
+            self.PRIORITY_ADMIN: int(
+                os.getenv("DISPATCHER_MAX_ACTIVE_ADMIN", class_max)
+            ),
+        }
         self.task_queue = TaskQueue(
-            max_active=max_active, timed=bool(self.collector), trace_fn=self.log_task
+            max_active=max_active,
+            timed=bool(self.collector),
+            trace_fn=self.log_task,
+            priorities=priorities,
+        )
+        self.max_per_connection = int(os.getenv("DISPATCHER_MAX_PER_CONNECTION", 5))
+        self.max_held_per_connection = int(
+            os.getenv("DISPATCHER_MAX_HELD_PER_CONNECTION", 100)
         )
+        self.max_pending = int(os.getenv("DISPATCHER_MAX_PENDING", 1000))
 
     def put_task(
-        self, coro: Coroutine, complete: Callable = None, ident: str = None
+        self,
+        coro: Coroutine,
+        complete: Callable = None,
+        ident: str = None,
+        priority: str = None,
     ) -> PendingTask:
         """Run a task in the task queue, potentially blocking other handlers."""
-        return self.task_queue.put(coro, complete, ident)
+        return self.task_queue.put(coro, complete, ident, priority)
 
     def run_task(
         self, coro: Coroutine, complete: Callable = None, ident: str = None
@@ -103,10 +156,83 @@ class Dispatcher:
         Returns:
             A pending task instance resolving to the handler task
 
+        Raises:
+            TransportBusyError: if the backlog of the sender or the agent is full
+
         """
-        return self.put_task(
-            self.handle_message(inbound_message, send_outbound, send_webhook), complete
+        key = self.connection_key(inbound_message)
+        shard = self._shards.get(key)
+        if self.max_pending and self.pending_count >= self.max_pending:
+            raise TransportBusyError(
+                "Inbound message backlog is full", retry_after=self.RETRY_AFTER
+            )
+        if (
+            shard
+            and self.max_held_per_connection
+            and len(shard.held) >= self.max_held_per_connection
+        ):
+            raise TransportBusyError(
+                "Inbound message backlog of the sender is full",
+                retry_after=self.RETRY_AFTER,
+                sender_limited=True,
+            )
+        if not shard:
+            shard = self._shards[key] = ConnectionShard()
+
+        pending = PendingTask(
+            self.handle_message(inbound_message, send_outbound, send_webhook),
+            lambda completed: self._connection_done(key, completed, complete),
+            queued_time=time.perf_counter(),
+            priority=self.PRIORITY_INBOUND,
         )
+        if shard.held or (
+            self.max_per_connection and shard.in_flight >= self.max_per_connection
+        ):
+            shard.held.append(pending)
+            self.held_count += 1
+        else:
+            self._release(shard, pending)
+        return pending
+
+    @property
+    def pending_count(self) -> int:
+        """Accessor for the number of inbound messages waiting to be handled."""
+        return self.held_count + self.task_queue.current_pending
+
+    def connection_key(self, inbound_message: InboundMessage) -> str:
+        """Determine the key of the connection a message is scheduled under."""
+        return inbound_message.receipt.sender_verkey or self.ANONYMOUS_KEY
+
+    def _release(self, shard: ConnectionShard, pending: PendingTask):
+        """Pass a message of a connection on to the task queue."""
+        if self.task_queue.cancelled:
+            pending.cancel()
+            self._cancel_held(shard)
+            return
+        shard.in_flight += 1
+        self.task_queue.add_pending(pending)
+
+    def _cancel_held(self, shard: ConnectionShard):
+        """Cancel the held messages of a connection."""
+        for held in shard.held:
+            held.cancel()
+        self.held_count -= len(shard.held)
+        shard.held.clear()
+
+    def _connection_done(
+        self, key: str, completed: CompletedTask, complete: Callable = None
+    ):
+        """Release the next held message of a connection once one completes."""
+        shard = self._shards.get(key)
+        if shard:
+            shard.in_flight -= 1
+            if shard.held:
+                self.held_count -= 1
+                self._release(shard, shard.held.popleft())
+            if not shard.in_flight and not shard.held:
+                del self._shards[key]
+        if complete:
+            complete(completed)
 
     async def handle_message(
         self,
@@ -229,7 +355,11 @@ class Dispatcher:
 
     async def complete(self, timeout: float = 0.1):
         """Wait for pending tasks to complete."""
+        for shard in self._shards.values():
+            self._cancel_held(shard)
         await self.task_queue.complete(timeout=timeout)
+        # pending tasks dropped by the queue never report their completion
+        self._shards.clear()
 
 
 class DispatcherResponder(BaseResponder):
@@ -5,6 +5,7 @@ from asynctest import mock as async_mock
 
 from .. import conductor as test_module
 from ...admin.base_server import BaseAdminServer
+from ...cache.base import BaseCache
 from ...config.base_context import ContextBuilder
 from ...config.injection_context import InjectionContext
 from ...connections.models.connection_record import ConnectionRecord
@@ -160,6 +161,16 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
             mock_inbound_mgr.return_value.stop.assert_awaited_once_with()
             mock_outbound_mgr.return_value.stop.assert_awaited_once_with()
 
+    async def test_stop_closes_cache(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+        conductor.context = InjectionContext()
+        cache = async_mock.MagicMock(BaseCache, autospec=True)
+        conductor.context.injector.bind_instance(BaseCache, cache)
+
+        await conductor.stop()
+        cache.close.assert_called_once_with()
+
     async def test_stats(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         conductor = test_module.Conductor(builder)
@@ -177,6 +188,9 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
             ]
+            mock_outbound_mgr.return_value.task_queue = async_mock.MagicMock(
+                stats=async_mock.MagicMock(return_value={})
+            )
 
             await conductor.setup()
 
@@ -191,8 +205,12 @@ class TestConductor(AsyncTestCase, Config, TestDIDs):
                     "task_done",
                     "task_failed",
                     "task_pending",
+                    "task_priorities",
+                    "out_priorities",
                 ]
             )
+            assert "inbound" in stats["task_priorities"]
+            assert "admin" in stats["task_priorities"]
 
     async def test_setup_x(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -272,6 +272,83 @@ class TestDispatcher(AsyncTestCase):
         payload = json.loads(rcv.messages[0][1].payload)
         assert payload["@type"] == ProblemReport.Meta.message_type
 
+    async def test_connection_fairness(self):
+        dispatcher = test_module.Dispatcher(make_context())
+        await dispatcher.setup()
+        dispatcher.max_per_connection = 1
+        handled = []
+
+        async def handle_message(inbound, *args):
+            handled.append(inbound.payload)
+            await asyncio.sleep(0.01)
+
+        def inbound(payload, sender):
+            return InboundMessage(payload, MessageReceipt(sender_verkey=sender))
+
+        rcv = Receiver()
+        with async_mock.patch.object(dispatcher, "handle_message", handle_message):
+            for payload in ("a1", "a2", "a3"):
+                dispatcher.queue_message(inbound(payload, "verkey-a"), rcv.send)
+            dispatcher.queue_message(inbound("b1", "verkey-b"), rcv.send)
+            assert dispatcher.held_count == 2
+            assert dispatcher.pending_count == 4
+            await dispatcher.task_queue
+        assert handled == ["a1", "b1", "a2", "a3"]
+        assert not dispatcher.held_count and not dispatcher._shards
+
+    async def test_backpressure(self):
+        dispatcher = test_module.Dispatcher(make_context())
+        await dispatcher.setup()
+        dispatcher.max_per_connection = 1
+        dispatcher.max_held_per_connection = 1
+        dispatcher.max_pending = 3
+
+        async def handle_message(*args):
+            await asyncio.sleep(0.01)
+
+        def inbound(sender):
+            return InboundMessage({}, MessageReceipt(sender_verkey=sender))
+
+        rcv = Receiver()
+        with async_mock.patch.object(dispatcher, "handle_message", handle_message):
+            dispatcher.queue_message(inbound("verkey-a"), rcv.send)
+            dispatcher.queue_message(inbound("verkey-a"), rcv.send)
+            with self.assertRaises(test_module.TransportBusyError) as context:
+                dispatcher.queue_message(inbound("verkey-a"), rcv.send)
+            assert context.exception.sender_limited
+            assert context.exception.retry_after
+
+            dispatcher.queue_message(inbound("verkey-b"), rcv.send)
+            with self.assertRaises(test_module.TransportBusyError) as context:
+                dispatcher.queue_message(inbound("verkey-c"), rcv.send)
+            assert not context.exception.sender_limited
+            await dispatcher.task_queue
+        dispatcher.queue_message(inbound("verkey-c"), rcv.send).cancel()
+
+    async def test_complete_cancels_held(self):
+        dispatcher = test_module.Dispatcher(make_context())
+        await dispatcher.setup()
+        dispatcher.max_per_connection = 1
+
+        async def handle_message(*args):
+            await asyncio.sleep(0.01)
+
+        rcv = Receiver()
+        with async_mock.patch.object(dispatcher, "handle_message", handle_message):
+            # without a sender verkey, messages share the anonymous shard
+            held = [
+                dispatcher.queue_message(InboundMessage({}, MessageReceipt()), rcv.send)
+                for _ in range(3)
+            ]
+            dispatcher.queue_message(
+                InboundMessage({}, MessageReceipt(sender_verkey="verkey")), rcv.send
+            )
+            assert set(dispatcher._shards) == {dispatcher.ANONYMOUS_KEY, "verkey"}
+            assert dispatcher.held_count == 2
+            await dispatcher.complete()
+        assert all(pending.cancelled for pending in held[1:])
+        assert not dispatcher.held_count and not dispatcher._shards
+
     async def test_dispatch_log(self):
         context = make_context()
         context.enforce_typing = False
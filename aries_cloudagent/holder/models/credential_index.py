@@ -0,0 +1,149 @@
+import json
+
+from ...messaging.models.base_record import BaseRecord, BaseRecordSchema
+from ...storage.base import BaseStorage
+from ...storage.error import StorageDuplicateError, StorageNotFoundError
+from ...storage.record import StorageRecord
+from marshmallow import fields
+
+
+class CredentialIndexRecord(BaseRecord):
+    """
+    Locates a credential held in a PDS by its oca schema and issuer.
+
+    Index records are tagged, so matching credentials are found with
+    a storage search instead of downloading every held credential.
+    """
+
+    class Meta:
+        schema_class = "CredentialIndexRecordSchema"
+
+    RECORD_TYPE = "credential_index"
+    RECORD_ID_NAME = "record_id"
+
+    BUILT_RECORD_TYPE = "credential_index_built"
+
+    def __init__(
+        self,
+        *,
+        dri: str = None,
+        oca_schema_dri: str = None,
+        issuer: str = None,
+        record_id: str = None,
+        **kwargs,
+    ):
+        """
+        Initialize a credential index record.
+
+        Args:
+            dri: the dri of the indexed credential
+            oca_schema_dri: the oca schema dri of the credential subject
+            issuer: the did of the credential issuer
+            record_id: the record id, derived from the dri if not given
+        """
+        # one index record per credential, derived from the dri of the credential
+        super().__init__(record_id or f"{self.RECORD_TYPE}::{dri}", None, **kwargs)
+        self.dri = dri
+        self.oca_schema_dri = oca_schema_dri
+        self.issuer = issuer
+
+    @property
+    def record_value(self) -> dict:
+        return {"dri": self.dri}
+
+    @property
+    def record_tags(self) -> dict:
+        return {
+            prop: getattr(self, prop)
+            for prop in ("oca_schema_dri", "issuer")
+            if getattr(self, prop) is not None
+        }
+
+    @classmethod
+    def from_credential(cls, dri: str, credential: dict) -> "CredentialIndexRecord":
+        subject = credential.get("credentialSubject") or {}
+        return cls(
+            dri=dri,
+            oca_schema_dri=subject.get("oca_schema_dri"),
+            issuer=credential.get("issuer"),
+        )
+
+    @classmethod
+    async def index_credential(cls, context, dri: str, credential: dict):
+        """Add a stored credential to the index, if it is not indexed yet."""
+        storage: BaseStorage = await context.inject(BaseStorage)
+        try:
+            await storage.add_record(
+                cls.from_credential(dri, credential).storage_record
+            )
+        except StorageDuplicateError:
+            pass
+
+    @classmethod
+    def built_record_id(cls, pds_name) -> str:
+        """Id of the record marking the index of a PDS built."""
+        return f"{cls.BUILT_RECORD_TYPE}::{json.dumps(pds_name)}"
+
+    @classmethod
+    async def index_credentials(cls, context, credentials: list, pds_name):
+        """
+        Index credentials as returned by load_multiple and mark the index built.
+
+        Args:
+            credentials: list of {"dri": ..., "content": ...} dictionaries
+            pds_name: name of the PDS the credentials were loaded from
+        """
+        for credential in credentials:
+            content = credential["content"]
+            if isinstance(content, str):
+                try:
+                    content = json.loads(content)
+                except json.JSONDecodeError:
+                    continue
+            if isinstance(content, dict):
+                await cls.index_credential(context, credential["dri"], content)
+
+        built_id = cls.built_record_id(pds_name)
+        storage: BaseStorage = await context.inject(BaseStorage)
+        try:
+            await storage.add_record(
+                StorageRecord(cls.BUILT_RECORD_TYPE, "{}", id=built_id)
+            )
+        except StorageDuplicateError:
+            pass
+        await cls.set_cached_key(context, cls.cache_key(built_id), True)
+
+    @classmethod
+    async def is_built(cls, context, pds_name) -> bool:
+        """Check whether the credentials held in a PDS before the index are indexed."""
+        built_id = cls.built_record_id(pds_name)
+        cache_key = cls.cache_key(built_id)
+        if await cls.get_cached_key(context, cache_key):
+            return True
+        storage: BaseStorage = await context.inject(BaseStorage)
+        try:
+            await storage.get_record(cls.BUILT_RECORD_TYPE, built_id)
+        except StorageNotFoundError:
+            return False
+        await cls.set_cached_key(context, cache_key, True)
+        return True
+
+    @classmethod
+    async def retrieve_dris(
+        cls, context, oca_schema_dri: str, issuer: str = None
+    ) -> list:
+        """Find the dris of the held credentials of a schema, and issuer if given."""
+        tag_filter = {"oca_schema_dri": oca_schema_dri}
+        if issuer:
+            tag_filter["issuer"] = issuer
+        records = await cls.query(context, tag_filter)
+        return [record.dri for record in records]
+
+
+class CredentialIndexRecordSchema(BaseRecordSchema):
+    class Meta:
+        model_class = "CredentialIndexRecord"
+
+    dri = fields.Str(required=False)
+    oca_schema_dri = fields.Str(required=False)
+    issuer = fields.Str(required=False)
@@ -14,29 +14,27 @@ from aries_cloudagent.aathcf.credentials import (
     validate_schema,
     verify_proof,
 )
+from aries_cloudagent.aathcf.proof_keys import ProofKeyManager
 from .base import BaseHolder, HolderError
+from .models.credential_index import CredentialIndexRecord
 from aries_cloudagent.pdstorage_thcf.api import (
-    load_multiple,
+    iter_load_multiple,
     pds_load,
-    pds_get_active_name,
     pds_save,
     pds_save_a,
 )
 from aries_cloudagent.pdstorage_thcf.error import PDSNotFoundError
-from aries_cloudagent.pdstorage_thcf.models.table_that_matches_dris_with_pds import (
-    DriStorageMatchTable,
-)
-from aries_cloudagent.storage.error import StorageNotFoundError
 
 CREDENTIALS_TABLE = "credentials"
 
 # TODO: Better error handling
 class PDSHolder(BaseHolder):
-    def __init__(self, wallet, storage, context):
+    def __init__(self, wallet, storage, context, proof_keys: ProofKeyManager = None):
         self.logger = logging.getLogger(__name__)
         self.wallet = wallet
         self.storage = storage
         self.context = context
+        self.proof_keys = proof_keys or ProofKeyManager()
 
     async def get_credential(self, credential_id: str) -> str:
         """
@@ -186,7 +184,8 @@ class PDSHolder(BaseHolder):
         presentation["type"] = processed_type
         presentation["verifiableCredential"] = {credential_id: credential}
 
-        proof = await create_proof(self.wallet, presentation, HolderError)
+        verkey = await self.proof_keys.get_verkey(self.wallet)
+        proof = await create_proof(self.wallet, presentation, HolderError, verkey)
         presentation.update({"proof": proof})
 
         validate_schema(
@@ -260,29 +259,30 @@ class PDSHolder(BaseHolder):
             )
         except PDSNotFoundError as err:
             raise HolderError(err.roll_up)
+        await CredentialIndexRecord.index_credential(
+            self.context, record_id, credential_data
+        )
         return record_id
 
-    async def get_credentials(self) -> list:
+    async def get_credentials(self, start: int = 0, count: int = None) -> list:
         """
-        Retrieve credential list based on a filter(TODO)
+        Retrieve the held credentials, streamed from the PDS.
 
-        FIXME This is ideally only for debug? so maybe pages are not
-        needed
+        Args:
+            start: number of credentials to skip
+            count: maximum number of credentials to retrieve, all if None
 
         """
+        query = []
         try:
-            query = await load_multiple(self.context, table=CREDENTIALS_TABLE)
+            async for i in iter_load_multiple(
+                self.context, table=CREDENTIALS_TABLE, offset=start, limit=count
+            ):
+                query.append(i)
         except PDSNotFoundError as err:
             raise HolderError(err.roll_up)
 
-        active_pds = await pds_get_active_name(self.context)
-        for i in query:
-            try:
-                await DriStorageMatchTable.retrieve_by_id(self.context, i["dri"])
-            except StorageNotFoundError:
-                await DriStorageMatchTable(i["dri"], active_pds).save(self.context)
-
-        self.logger.info("Credentials GET CREDENTIALS %s", query)
+        self.logger.debug("Credentials GET CREDENTIALS %s", query)
 
         return query
 
@@ -163,10 +163,26 @@ async def credentials_remove(request: web.BaseRequest):
     return web.json_response({})
 
 
+class CredentialsListQueryStringSchema(OpenAPISchema):
+    """Parameters and validators for query string in credentials list query."""
+
+    start = fields.Int(
+        description="Start index, or the next index of a page",
+        required=False,
+        **WHOLE_NUM,
+    )
+    count = fields.Int(
+        description="Maximum number to retrieve, all credentials if not given",
+        required=False,
+        **NATURAL_NUM,
+    )
+
+
 @docs(
     tags=["credentials"],
     summary="Fetch credentials from wallet",
 )
+@querystring_schema(CredentialsListQueryStringSchema())
 async def credentials_list(request: web.BaseRequest):
     """
     Request handler for searching credential records.
@@ -180,13 +196,25 @@ async def credentials_list(request: web.BaseRequest):
     """
     context = request.app["request_context"]
 
+    start = int(request.query.get("start", 0))
+    count = request.query.get("count")
+    count = int(count) if count else None
+
     holder: BaseHolder = await context.inject(BaseHolder)
     try:
-        credentials = await holder.get_credentials()
+        # one credential more tells whether there is a next page
+        credentials = await holder.get_credentials(start, count and count + 1)
     except HolderError as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
-    return web.json_response({"success": True, "result": credentials})
+    next_start = None
+    if count and len(credentials) > count:
+        credentials = credentials[:count]
+        next_start = start + count
+
+    return web.json_response(
+        {"success": True, "result": credentials, "next": next_start}
+    )
 
 
 class IndyCredentialsListQueryStringSchema(OpenAPISchema):
@@ -7,6 +7,7 @@ from asynctest import mock as async_mock
 from ..pds import *
 from aries_cloudagent.storage.basic import BasicStorage
 from ..models.credential import THCFCredential
+from ..models.credential_index import CredentialIndexRecord
 from aries_cloudagent.wallet.basic import BasicWallet
 from aries_cloudagent.issuer.pds import PDSIssuer
 from aries_cloudagent.connections.models.connection_record import ConnectionRecord
@@ -122,3 +123,57 @@ class TestPDSHolder(AsyncTestCase):
             await self.holder.create_presentation(
                 request, requested_credentials, {}, {}
             )
+
+    async def test_store_credential_indexes(self):
+        issuer = self.credential["issuer"]
+
+        credential = await create_test_credential(PDSIssuer(self.wallet))
+        credential["credentialSubject"]["oca_schema_dri"] = "schema"
+        credential["proof"] = await create_proof(
+            self.wallet,
+            OrderedDict((k, v) for k, v in credential.items() if k != "proof"),
+            HolderError,
+        )
+        cred_id = await self.holder.store_credential({}, credential, {})
+        await self.holder.store_credential({}, credential, {})
+
+        assert await CredentialIndexRecord.retrieve_dris(self.context, "schema") == [
+            cred_id
+        ]
+        assert await CredentialIndexRecord.retrieve_dris(
+            self.context, "schema", issuer
+        ) == [cred_id]
+        assert (
+            await CredentialIndexRecord.retrieve_dris(self.context, "schema", "other")
+            == []
+        )
+        assert await CredentialIndexRecord.retrieve_dris(self.context, "other") == []
+
+
+class TestCredentialIndexRecord(AsyncTestCase):
+    async def test_index_credentials(self):
+        context = InjectionContext()
+        context.injector.bind_instance(BaseStorage, BasicStorage())
+        pds_name = ("local", "default")
+        assert not await CredentialIndexRecord.is_built(context, pds_name)
+
+        credentials = [
+            {
+                "dri": "one",
+                "content": json.dumps(
+                    {"issuer": "did", "credentialSubject": {"oca_schema_dri": "a"}}
+                ),
+            },
+            {"dri": "two", "content": {"credentialSubject": {"oca_schema_dri": "a"}}},
+            {"dri": "three", "content": "not json"},
+        ]
+        await CredentialIndexRecord.index_credentials(context, credentials, pds_name)
+        await CredentialIndexRecord.index_credentials(context, credentials, pds_name)
+
+        assert await CredentialIndexRecord.is_built(context, pds_name)
+        assert not await CredentialIndexRecord.is_built(context, ("other", "pds"))
+        assert sorted(await CredentialIndexRecord.retrieve_dris(context, "a")) == [
+            "one",
+            "two",
+        ]
+        assert await CredentialIndexRecord.retrieve_dris(context, "a", "did") == ["one"]
@@ -111,21 +111,41 @@ class TestHolderRoutes(AsyncTestCase):
             app=self.app, query={"start": "0", "count": "10"}
         )
 
+        holder = async_mock.MagicMock(
+            get_credentials=async_mock.CoroutineMock(return_value=[{"hello": "world"}])
+        )
         request.app["request_context"].inject = async_mock.CoroutineMock(
-            return_value=async_mock.MagicMock(
-                get_credentials=async_mock.CoroutineMock(
-                    return_value={"hello": "world"}
-                )
-            )
+            return_value=holder
         )
 
         with async_mock.patch.object(
             test_module.web, "json_response", async_mock.Mock()
         ) as json_response:
             result = await test_module.credentials_list(request)
-            json_response.assert_called_once_with({"results": {"hello": "world"}})
+            holder.get_credentials.assert_awaited_once_with(0, 11)
+            json_response.assert_called_once_with(
+                {"success": True, "result": [{"hello": "world"}], "next": None}
+            )
             assert result is json_response.return_value
 
+    async def test_credentials_list_pages(self):
+        request = async_mock.MagicMock(app=self.app, query={"start": "2", "count": "2"})
+        holder = async_mock.MagicMock(
+            get_credentials=async_mock.CoroutineMock(return_value=[1, 2, 3])
+        )
+        request.app["request_context"].inject = async_mock.CoroutineMock(
+            return_value=holder
+        )
+
+        with async_mock.patch.object(
+            test_module.web, "json_response", async_mock.Mock()
+        ) as json_response:
+            await test_module.credentials_list(request)
+            holder.get_credentials.assert_awaited_once_with(2, 3)
+            json_response.assert_called_once_with(
+                {"success": True, "result": [1, 2], "next": 4}
+            )
+
     async def test_credentials_list_x_holder(self):
         request = async_mock.MagicMock(
             app=self.app, query={"start": "0", "count": "10"}
@@ -12,6 +12,7 @@ from .base import (
 )
 from ..messaging.util import time_now
 from ..aathcf.credentials import create_proof
+from ..aathcf.proof_keys import ProofKeyManager
 from aries_cloudagent.aathcf.credentials import (
     CredentialSchema,
     validate_schema,
@@ -27,14 +28,17 @@ def raise_exception_on_null(value, value_name, exception=IssuerError):
 
 
 class PDSIssuer(BaseIssuer):
-    def __init__(self, wallet: BaseWallet):
+    def __init__(self, wallet: BaseWallet, proof_keys: ProofKeyManager = None):
         """
         Initialize an PDSIssuer instance.
 
         Args:
+            wallet: the wallet holding the signing keys
+            proof_keys: selects the key credential proofs are signed with
 
         """
         self.wallet: BaseWallet = wallet
+        self.proof_keys = proof_keys or ProofKeyManager()
         self.logger = logging.getLogger(__name__)
 
     def make_schema_id(
@@ -150,6 +154,7 @@ class PDSIssuer(BaseIssuer):
         if not isinstance(credential_values, dict) or credential_values == {}:
             raise IssuerError("credential_values is Null")
 
+        my_did_info = my_did
         my_did = my_did[0]
         credential_dict = OrderedDict()
 
@@ -193,8 +198,9 @@ class PDSIssuer(BaseIssuer):
         #         "dri": "1234",
         #         "dataDri": "1234",
         #     },
+        verkey = await self.proof_keys.get_verkey(self.wallet, my_did_info)
         credential_dict["proof"] = await create_proof(
-            self.wallet, credential_dict, IssuerError
+            self.wallet, credential_dict, IssuerError, verkey
         )
         validate_schema(
             CredentialSchema, credential_dict, IssuerError, self.logger.error
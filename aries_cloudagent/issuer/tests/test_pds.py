@@ -92,6 +92,13 @@ class TestPDSIssuer(AsyncTestCase):
 
         assert await verify_proof(self.wallet, credential_dict) == True
 
+    async def test_create_credential_signs_with_did_key(self):
+        did_info = await self.wallet.get_public_did()
+        for _ in range(2):
+            credential_dict = await create_test_credential(self.issuer)
+            assert credential_dict["proof"]["verificationMethod"] == did_info.verkey
+        assert self.wallet._keys == {}
+
     async def test_create_credential_null(self):
         connection = ConnectionRecord(my_did="1234-my", their_did="1234-their")
         with self.assertRaises(IssuerError):
@@ -461,10 +461,16 @@ class IndyLedger(BaseLedger):
 
         """
         if self.cache:
-            result = await self.cache.get(f"schema::{schema_id}")
-            if result:
-                return result
+            # fetching populates the cache, releasing any waiters for the key
+            async with self.cache.acquire(f"schema::{schema_id}") as entry:
+                if entry.result:
+                    return entry.result
+                return await self._fetch_schema(schema_id)
 
+        return await self._fetch_schema(schema_id)
+
+    async def _fetch_schema(self, schema_id: str) -> dict:
+        """Fetch a schema from the ledger by id or sequence number."""
         if schema_id.isdigit():
             return await self.fetch_schema_by_seq_no(int(schema_id))
         else:
@@ -674,11 +680,13 @@ class IndyLedger(BaseLedger):
 
         """
         if self.cache:
-            result = await self.cache.get(
+            # fetching populates the cache, releasing any waiters for the key
+            async with self.cache.acquire(
                 f"credential_definition::{credential_definition_id}"
-            )
-            if result:
-                return result
+            ) as entry:
+                if entry.result:
+                    return entry.result
+                return await self.fetch_credential_definition(credential_definition_id)
 
         return await self.fetch_credential_definition(credential_definition_id)
 
@@ -2,12 +2,12 @@ from aries_cloudagent.aathcf.utils import build_context, run_standalone_async
 from aries_cloudagent.aathcf.credentials import assert_type, assert_type_or
 from aries_cloudagent.storage.error import StorageNotFoundError
 from .base import BasePDS
+from .cache import PDSRecordCache
+from .dri import encode  # noqa: F401 (re-exported)
 from .error import PDSError, PDSNotFoundError, PDSRecordNotFoundError
 from .models.saved_personal_storage import SavedPDS
-import hashlib
-import multihash
+from ..utils.task_queue import gather_bounded
 import logging
-import multibase
 
 from .models.table_that_matches_dris_with_pds import DriStorageMatchTable
 
@@ -16,6 +16,9 @@ from collections import OrderedDict
 
 LOGGER = logging.getLogger(__name__)
 
+# number of records on a page of load_multiple_page
+DEFAULT_PAGE_SIZE = 100
+
 
 async def match_save_save_record_id(context, record_id, pds_name):
     match_table = DriStorageMatchTable(record_id, pds_name)
@@ -23,6 +26,11 @@ async def match_save_save_record_id(context, record_id, pds_name):
     return record_id
 
 
+async def match_save_many(context, record_ids, pds_name) -> list:
+    records = [DriStorageMatchTable(record_id, pds_name) for record_id in record_ids]
+    return await DriStorageMatchTable.save_many(context, records)
+
+
 async def match_table_query_id(context, id):
     try:
         match = await DriStorageMatchTable.retrieve_by_id(context, id)
@@ -60,13 +68,7 @@ async def pds_get_active(context):
     return pds
 
 
-async def pds_load(context, id: str, *, with_meta: bool = False) -> dict:
-    assert_type(id, str)
-
-    match = await match_table_query_id(context, id)
-    pds = await pds_get_by_name(context, match.pds_type)
-    result = await pds.load(id)
-
+def parse_loaded_content(result: dict, *, with_meta: bool = False):
     try:
         result["content"] = json.loads(result["content"], object_pairs_hook=OrderedDict)
     except json.JSONDecodeError:
@@ -80,6 +82,69 @@ async def pds_load(context, id: str, *, with_meta: bool = False) -> dict:
         return result["content"]
 
 
+async def pds_load_cached(context, id: str) -> dict:
+    """
+    Load a record, from the PDS record cache if present.
+
+    Records are addressed by their content hash, so once loaded
+    they are served from the cache without asking the PDS again.
+    """
+    cache: PDSRecordCache = await context.inject(PDSRecordCache, required=False)
+    if cache:
+        result = cache.get(id)
+        if result is not None:
+            return result
+
+    match = await match_table_query_id(context, id)
+    pds = await pds_get_by_name(context, match.pds_type)
+    result = await pds.load(id)
+
+    if cache:
+        cache.put(id, result)
+    return result
+
+
+async def pds_load(context, id: str, *, with_meta: bool = False) -> dict:
+    assert_type(id, str)
+
+    result = await pds_load_cached(context, id)
+
+    return parse_loaded_content(result, with_meta=with_meta)
+
+
+async def pds_load_many(context, ids: list, *, with_meta: bool = False) -> list:
+    """
+    Load several records, one batch request per PDS holding them.
+
+    Returns: loaded records, in the order of ids
+    """
+    cache: PDSRecordCache = await context.inject(PDSRecordCache, required=False)
+    loaded = {}
+    if cache:
+        for id in ids:
+            result = cache.get(id)
+            if result is not None:
+                loaded[id] = result
+    missing = [id for id in OrderedDict.fromkeys(ids) if id not in loaded]
+
+    matches = await gather_bounded(
+        (match_table_query_id(context, id) for id in missing),
+        BasePDS.BATCH_CONCURRENCY,
+    )
+    ids_by_pds = OrderedDict()
+    for id, match in zip(missing, matches):
+        ids_by_pds.setdefault(tuple(match.pds_type), []).append(id)
+
+    for pds_name, pds_ids in ids_by_pds.items():
+        pds = await pds_get_by_name(context, pds_name)
+        for id, result in zip(pds_ids, await pds.load_many(pds_ids)):
+            if cache:
+                cache.put(id, result)
+            loaded[id] = result
+
+    return [parse_loaded_content(loaded[id], with_meta=with_meta) for id in ids]
+
+
 async def pds_link_dri(context, dri, link_with_dris):
     if isinstance(link_with_dris, str):
         link_with_dris = [link_with_dris]
@@ -144,9 +209,7 @@ async def __test_pds_link():
 async def pds_load_string(context, id: str, *, with_meta: bool = False) -> str:
     assert_type(id, str)
 
-    match = await match_table_query_id(context, id)
-    pds = await pds_get_by_name(context, match.pds_type)
-    result = await pds.load(id)
+    result = await pds_load_cached(context, id)
 
     if with_meta:
         return result
@@ -180,14 +243,40 @@ async def pds_save_a(
     return payload_id
 
 
+async def pds_save_many(context, records: list) -> list:
+    """
+    Save several records in the active PDS, batching the match table writes.
+
+    Args:
+        records: a list of (payload, metadata) pairs, metadata as in pds_save_a
+
+    Returns: saved data ids, in the order of records
+    """
+    for payload, _ in records:
+        assert_type_or(payload, str, dict)
+
+    active_pds_name = await pds_get_active_name(context)
+    pds = await pds_get_by_name(context, active_pds_name)
+    payload_ids = await pds.save_many(records)
+    payload_ids = await match_save_many(context, payload_ids, active_pds_name)
+
+    return payload_ids
+
+
 async def load_multiple(context, *, table: str = None, oca_schema_base_dri=None):
-    """ Load multiple records, if oca_schema_base_dri is a list then returns a dictionary"""
+    """Load multiple records, if oca_schema_base_dri is a list then returns a dictionary"""
     pds = await pds_get_active(context)
     if isinstance(oca_schema_base_dri, list):
+        loaded = await gather_bounded(
+            (
+                pds.load_multiple(table=table, oca_schema_base_dri=dri)
+                for dri in oca_schema_base_dri
+            ),
+            pds.BATCH_CONCURRENCY,
+        )
         result = {}
-        for dri in oca_schema_base_dri:
-            result[dri] = await pds.load_multiple(table=table, oca_schema_base_dri=dri)
-            result[dri] = json.loads(result[dri])
+        for dri, records in zip(oca_schema_base_dri, loaded):
+            result[dri] = json.loads(records)
         return result
 
     else:
@@ -198,6 +287,81 @@ async def load_multiple(context, *, table: str = None, oca_schema_base_dri=None)
         return result
 
 
+async def iter_load_multiple(
+    context,
+    *,
+    table: str = None,
+    oca_schema_base_dri: str = None,
+    offset: int = 0,
+    limit: int = None,
+):
+    """
+    Iterate over the records of a table in the active PDS.
+
+    Records are streamed from PDSes which support it, the iteration stops
+    reading once limit records past offset were handed out or the caller
+    stops early.
+    """
+    pds = await pds_get_active(context)
+    records = pds.iter_multiple(table=table, oca_schema_base_dri=oca_schema_base_dri)
+    end = None if limit is None else offset + limit
+    index = 0
+    try:
+        async for record in records:
+            if end is not None and index >= end:
+                break
+            if index >= offset:
+                yield record
+            index += 1
+    finally:
+        await records.aclose()
+
+
+async def load_multiple_page(
+    context,
+    *,
+    table: str = None,
+    oca_schema_base_dri: str = None,
+    offset: int = 0,
+    limit: int = DEFAULT_PAGE_SIZE,
+) -> dict:
+    """
+    Load one page of the records of a table in the active PDS.
+
+    Returns: {"results": [...], "offset": offset, "next": offset of the next
+        page, None on the last page}
+    """
+    results = []
+    # one record more tells whether there is a next page
+    async for record in iter_load_multiple(
+        context,
+        table=table,
+        oca_schema_base_dri=oca_schema_base_dri,
+        offset=offset,
+        limit=limit + 1,
+    ):
+        results.append(record)
+
+    next_offset = None
+    if len(results) > limit:
+        results.pop()
+        next_offset = offset + limit
+    return {"results": results, "offset": offset, "next": next_offset}
+
+
+async def load_multiple_tables(context, tables: list) -> list:
+    """
+    Load the records of several tables concurrently.
+
+    Returns: a list of records per table, in the order of tables
+    """
+    pds = await pds_get_active(context)
+    loaded = await gather_bounded(
+        (pds.load_multiple(table=table) for table in tables), pds.BATCH_CONCURRENCY
+    )
+    return [json.loads(records) for records in loaded]
+
+
 async def delete_record(context, id: str) -> str:
     assert_type(id, str)
 
@@ -219,30 +383,19 @@ async def pds_get_usage_policy_if_active_pds_supports_it(context):
     return result
 
 
-def encode(data: str) -> str:
-    assert_type(data, str)
-    hash_object = hashlib.sha256()
-    hash_object.update(bytes(data, "utf-8"))
-    multi = multihash.encode(hash_object.digest(), "sha2-256")
-    result = multibase.encode("base58btc", multi)
-
-    return result.decode("utf-8")
-
-
 async def pds_oca_data_format_save(context, data):
+    valid_dris = [dri for dri in data if dri.startswith("DRI:")]
+    payload_ids = await pds_save_many(
+        context,
+        [(data[dri], {"table": None, "oca_schema_dri": dri[4:]}) for dri in valid_dris],
+    )
+    saved = dict(zip(valid_dris, payload_ids))
+
     ids_of_saved_schemas = {}
     for oca_schema_base_dri in data:
-        if oca_schema_base_dri.startswith("DRI:"):
-            payload_id = await pds_save_a(
-                context,
-                data[oca_schema_base_dri],
-                oca_schema_dri=oca_schema_base_dri[4:],
-            )
-            ids_of_saved_schemas[oca_schema_base_dri] = payload_id
-        else:
-            ids_of_saved_schemas[
-                oca_schema_base_dri
-            ] = "Invalid format, DRIs should start with 'DRI:'"
+        ids_of_saved_schemas[oca_schema_base_dri] = saved.get(
+            oca_schema_base_dri, "Invalid format, DRIs should start with 'DRI:'"
+        )
 
     return ids_of_saved_schemas
 
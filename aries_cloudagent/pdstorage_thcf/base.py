@@ -1,7 +1,16 @@
+import json
 from abc import ABC, abstractmethod
+from typing import AsyncIterator, Sequence, Tuple
+
+from ..config.base import BaseSettings
+from ..utils.task_queue import gather_bounded
+from .error import PDSError
 
 
 class BasePDS(ABC):
+    # maximum number of concurrent requests made by the batch methods
+    BATCH_CONCURRENCY = 10
+
     def __init__(self):
         self.settings = {}
         self.preview_settings = {}
@@ -20,6 +29,57 @@ class BasePDS(ABC):
     ) -> str:
         """Load all records from a table."""
 
+    async def iter_multiple(
+        self, *, table: str = None, oca_schema_base_dri: str = None
+    ) -> AsyncIterator[dict]:
+        """
+        Iterate over the records of a table.
+
+        Storages able to stream a table override this, so records are
+        handed out as they arrive. The default loads the whole table.
+        """
+        records = await self.load_multiple(
+            table=table, oca_schema_base_dri=oca_schema_base_dri
+        )
+        if records is None:
+            raise PDSError(
+                f"Listing records is not supported by {self.__class__.__name__}"
+            )
+        for record in json.loads(records):
+            yield record
+
+    async def load_many(self, ids: Sequence[str]) -> list:
+        """
+        Load several records at once.
+
+        Storages without a bulk endpoint fall back to concurrent single loads.
+
+        Returns: loaded records, in the order of ids
+        """
+        return await gather_bounded(
+            (self.load(id) for id in ids), self.BATCH_CONCURRENCY
+        )
+
+    async def save_many(self, records: Sequence[Tuple[object, dict]]) -> list:
+        """
+        Save several records at once.
+
+        Args:
+            records: a list of (record, metadata) pairs, as passed to save
+
+        Returns: saved data ids, in the order of records
+        """
+        return await gather_bounded(
+            (self.save(record, metadata) for record, metadata in records),
+            self.BATCH_CONCURRENCY,
+        )
+
+    async def start(self, settings: BaseSettings = None):
+        """Open resources held by the storage, e.g. connection pools."""
+
+    async def stop(self):
+        """Release resources held by the storage."""
+
     @abstractmethod
     async def ping(self) -> [bool, str]:
         """
@@ -0,0 +1,191 @@
+import json
+import logging
+import os
+from collections import OrderedDict
+
+from ..utils.stats import Collector
+from .dri import encode
+
+LOGGER = logging.getLogger(__name__)
+
+
+def content_matches_dri(content, dri: str) -> bool:
+    """Check that loaded content hashes to the DRI it was requested by."""
+    if isinstance(content, str):
+        return encode(content) == dri
+    if isinstance(content, dict):
+        return encode(json.dumps(content)) == dri
+    return False
+
+
+class PDSRecordCache:
+    """
+    Read-through cache of records loaded from personal data storages.
+
+    DRIs are content hashes, so a record loaded by DRI never changes and
+    can be served locally without a round-trip to the storage. Entries are
+    kept serialized, evicted least recently used first once the byte budget
+    is exceeded, and optionally spilled to an on-disk tier.
+    """
+
+    DEFAULT_MAX_BYTES = 16 << 20
+
+    def __init__(
+        self,
+        max_bytes: int = None,
+        *,
+        disk_path: str = None,
+        disk_max_bytes: int = None,
+        collector: Collector = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_bytes: memory budget for cached records
+            disk_path: directory holding the on-disk tier, if any
+            disk_max_bytes: disk budget for cached records, unbounded if not set
+            collector: stats collector receiving the hit and miss counters
+        """
+        self.max_bytes = self.DEFAULT_MAX_BYTES if max_bytes is None else max_bytes
+        self.disk_path = disk_path
+        self.disk_max_bytes = disk_max_bytes
+        self.collector = collector
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._disk_entries = OrderedDict()
+        self._disk_size = 0
+        if disk_path:
+            os.makedirs(disk_path, exist_ok=True)
+            self._load_disk_index()
+
+    @property
+    def size(self) -> int:
+        """Accessor for the number of bytes held in memory."""
+        return self._size
+
+    @property
+    def disk_size(self) -> int:
+        """Accessor for the number of bytes held on disk."""
+        return self._disk_size
+
+    def stats(self) -> dict:
+        """Fetch the cache counters."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": self._size,
+            "disk_size": self._disk_size,
+        }
+
+    def _count(self, name: str):
+        if self.collector:
+            self.collector.increment(f"pds_cache.{name}")
+
+    def _load_disk_index(self):
+        files = []
+        for entry in os.scandir(self.disk_path):
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, name, size in sorted(files):
+            self._disk_entries[name] = size
+            self._disk_size += size
+
+    def _disk_file(self, dri: str) -> str:
+        return os.path.join(self.disk_path, dri)
+
+    def _read_disk(self, dri: str) -> str:
+        try:
+            with open(self._disk_file(dri), "r", encoding="utf-8") as disk_file:
+                return disk_file.read()
+        except OSError:
+            LOGGER.warning("Could not read PDS cache file for %s", dri)
+            self._remove_disk(dri)
+
+    def _write_disk(self, dri: str, serialized: str):
+        path = self._disk_file(dri)
+        try:
+            with open(path + ".tmp", "w", encoding="utf-8") as disk_file:
+                disk_file.write(serialized)
+            os.replace(path + ".tmp", path)
+        except OSError:
+            LOGGER.warning("Could not write PDS cache file for %s", dri)
+            return
+        size = len(serialized.encode("utf-8"))
+        self._disk_size += size - self._disk_entries.pop(dri, 0)
+        self._disk_entries[dri] = size
+        while self.disk_max_bytes and self._disk_size > self.disk_max_bytes:
+            self._remove_disk(next(iter(self._disk_entries)))
+
+    def _remove_disk(self, dri: str):
+        self._disk_size -= self._disk_entries.pop(dri, 0)
+        try:
+            os.remove(self._disk_file(dri))
+        except OSError:
+            pass
+
+    def _put_memory(self, dri: str, serialized: str):
+        size = len(serialized.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if dri in self._entries:
+            self._size -= len(self._entries.pop(dri).encode("utf-8"))
+        self._entries[dri] = serialized
+        self._size += size
+        while self._size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted.encode("utf-8"))
+
+    def get(self, dri: str) -> dict:
+        """
+        Fetch a cached record.
+
+        Returns: a fresh copy of the loaded record, or None if it is not cached
+        """
+        serialized = self._entries.get(dri)
+        if serialized is not None:
+            self._entries.move_to_end(dri)
+        elif dri in self._disk_entries:
+            serialized = self._read_disk(dri)
+            if serialized is not None:
+                self._put_memory(dri, serialized)
+        if serialized is None:
+            self.misses += 1
+            self._count("miss")
+            return None
+        self.hits += 1
+        self._count("hit")
+        return json.loads(serialized, object_pairs_hook=OrderedDict)
+
+    def put(self, dri: str, result: dict) -> bool:
+        """
+        Add a record loaded from a PDS, if its content matches the DRI.
+
+        Returns: True if the record was cached
+        """
+        if not isinstance(result, dict) or not content_matches_dri(
+            result.get("content"), dri
+        ):
+            self.rejected += 1
+            self._count("rejected")
+            LOGGER.debug("Not caching PDS record which does not match DRI %s", dri)
+            return False
+        serialized = json.dumps(result)
+        self._put_memory(dri, serialized)
+        if self.disk_path and dri not in self._disk_entries:
+            self._write_disk(dri, serialized)
+        return True
+
+    def clear(self):
+        """Remove all cached records, including the on-disk tier."""
+        self._entries = OrderedDict()
+        self._size = 0
+        for dri in list(self._disk_entries):
+            self._remove_disk(dri)
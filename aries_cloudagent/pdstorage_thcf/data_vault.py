@@ -1,6 +1,6 @@
-from .base import BasePDS
+from .http import HttpPDS
 from .error import PDSNotFoundError, PDSError, PDSRecordNotFoundError
-from aiohttp import ClientSession, FormData, ClientConnectionError, ClientError
+from aiohttp import FormData, ClientConnectionError, ClientError
 import json
 import logging
 from collections import OrderedDict
@@ -10,7 +10,7 @@ LOGGER = logging.getLogger(__name__)
 API_ENDPOINT = "/api/v1/files"
 
 
-class DataVault(BasePDS):
+class DataVault(HttpPDS):
     def __init__(self):
         super().__init__()
         self.preview_settings = {
@@ -33,8 +33,7 @@ class DataVault(BasePDS):
             """
         )
 
-        async with ClientSession() as session:
-            response = await session.get(url)
+        async with self.client_session.get(url) as response:
             response_text = await response.text()
             LOGGER.info("Response %s", response_text)
 
@@ -64,8 +63,7 @@ class DataVault(BasePDS):
             """
         )
 
-        async with ClientSession() as session:
-            response = await session.post(url=url, data=data)
+        async with self.client_session.post(url=url, data=data) as response:
             response_text = await response.text()
 
         return response_text
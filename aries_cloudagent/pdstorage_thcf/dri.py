@@ -0,0 +1,14 @@
+from aries_cloudagent.aathcf.credentials import assert_type
+import hashlib
+import multihash
+import multibase
+
+
+def encode(data: str) -> str:
+    assert_type(data, str)
+    hash_object = hashlib.sha256()
+    hash_object.update(bytes(data, "utf-8"))
+    multi = multihash.encode(hash_object.digest(), "sha2-256")
+    result = multibase.encode("base58btc", multi)
+
+    return result.decode("utf-8")
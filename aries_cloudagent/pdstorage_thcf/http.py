@@ -0,0 +1,67 @@
+from aiohttp import ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
+
+from .base import BasePDS
+from ..config.base import BaseSettings
+
+
+class HttpPDS(BasePDS):
+    """
+    Base class for personal data storages reached over HTTP.
+
+    Every instance owns one long-lived, connection-pooled client session,
+    so requests to the storage reuse kept-alive connections instead of
+    paying a TCP+TLS handshake each time.
+    """
+
+    DEFAULT_LIMIT = 100
+    DEFAULT_LIMIT_PER_HOST = 20
+    DEFAULT_KEEPALIVE_TIMEOUT = 30.0
+    DEFAULT_TIMEOUT = 60.0
+
+    def __init__(self):
+        """Initialize the storage without opening the client session."""
+        super().__init__()
+        self._client_session: ClientSession = None
+        self.limit = self.DEFAULT_LIMIT
+        self.limit_per_host = self.DEFAULT_LIMIT_PER_HOST
+        self.keepalive_timeout = self.DEFAULT_KEEPALIVE_TIMEOUT
+        self.timeout = self.DEFAULT_TIMEOUT
+
+    @property
+    def client_session(self) -> ClientSession:
+        """Accessor for the client session, opened on first use."""
+        if not self._client_session or self._client_session.closed:
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            self._client_session = ClientSession(
+                connector=connector,
+                cookie_jar=DummyCookieJar(),
+                timeout=ClientTimeout(total=self.timeout),
+            )
+        return self._client_session
+
+    async def start(self, settings: BaseSettings = None):
+        """Configure the client session, reopened on next use."""
+        if settings:
+            self.limit = settings.get_int("pds.http.limit", default=self.limit)
+            self.limit_per_host = settings.get_int(
+                "pds.http.limit_per_host", default=self.limit_per_host
+            )
+            self.keepalive_timeout = float(
+                settings.get_value(
+                    "pds.http.keepalive_timeout", default=self.keepalive_timeout
+                )
+            )
+            self.timeout = float(
+                settings.get_value("pds.http.timeout", default=self.timeout)
+            )
+        await self.stop()
+
+    async def stop(self):
+        """Close the client session and its pooled connections."""
+        if self._client_session:
+            await self._client_session.close()
+            self._client_session = None
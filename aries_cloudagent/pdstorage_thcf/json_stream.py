@@ -0,0 +1,97 @@
+"""Incremental decoding of JSON arrays received in chunks."""
+
+import codecs
+import json
+from typing import AsyncIterable, AsyncIterator
+
+WHITESPACE = " \t\n\r"
+
+
+class JSONArrayDecoder:
+    """
+    Decode the elements of a JSON array as its chunks arrive.
+
+    Every element is returned as soon as it is complete, so a large array
+    is never held in memory as a whole, neither as text nor decoded.
+    """
+
+    # the states between tokens of the array
+    START, FIRST, VALUE, SEPARATOR, END = range(5)
+
+    def __init__(self):
+        """Initialize a `JSONArrayDecoder` instance."""
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._state = self.START
+
+    def feed(self, data: bytes) -> list:
+        """Decode the next chunk, returning the elements completed by it."""
+        self._buffer += self._text.decode(data)
+        return self._drain(final=False)
+
+    def close(self) -> list:
+        """Decode the end of the data, raising ValueError if it is incomplete."""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain(final=True)
+        if self._state != self.END:
+            raise ValueError("Unterminated JSON array")
+        return items
+
+    def _drain(self, final: bool) -> list:
+        items = []
+        buffer = self._buffer
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in WHITESPACE:
+                pos += 1
+            if pos == len(buffer):
+                break
+
+            char = buffer[pos]
+            if self._state == self.END:
+                raise ValueError(f"Extra data after JSON array at {pos}")
+            if self._state == self.START:
+                if char != "[":
+                    raise ValueError("Expected a JSON array")
+                self._state = self.FIRST
+                pos += 1
+            elif char == "]" and self._state in (self.FIRST, self.SEPARATOR):
+                self._state = self.END
+                pos += 1
+            elif self._state == self.SEPARATOR:
+                if char != ",":
+                    raise ValueError(f"Expected ',' or ']' in JSON array at {pos}")
+                self._state = self.VALUE
+                pos += 1
+            else:
+                try:
+                    item, end = self._decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if final:
+                        raise
+                    # the element continues in the next chunk
+                    break
+                if (
+                    not final
+                    and char not in '{["'
+                    and (end == len(buffer) or buffer[end] not in WHITESPACE + ",]")
+                ):
+                    # a number might continue in the next chunk, e.g. "1." "5"
+                    break
+                items.append(item)
+                self._state = self.SEPARATOR
+                pos = end
+
+        self._buffer = buffer[pos:]
+        return items
+
+
+async def iter_json_array(chunks: AsyncIterable[bytes]) -> AsyncIterator:
+    """Iterate over the elements of a JSON array, given the chunks of its text."""
+    decoder = JSONArrayDecoder()
+    async for chunk in chunks:
+        for item in decoder.feed(chunk):
+            yield item
+    for item in decoder.close():
+        yield item
@@ -22,6 +22,9 @@ class LocalPDS(BasePDS):
 
         return {"content": result}
 
+    async def load_many(self, ids) -> list:
+        return [{"content": self.storage.get(id)} for id in ids]
+
     async def save(self, record, metadata: dict) -> str:
         dri_value = None
         if isinstance(record, str):
@@ -38,8 +41,8 @@ class LocalPDS(BasePDS):
     async def load_multiple(
         self, *, table: str = None, oca_schema_base_dri: str = None
     ) -> str:
-
-        assert not "Load multiple not supported by active PDS"
+        """Listing records is not supported, returns None."""
+        return None
 
     async def ping(self) -> [bool, str]:
         return [True, None]
@@ -1,3 +1,6 @@
+from copy import deepcopy
+
+from ...config.injection_context import InjectionContext
 from ...messaging.models.base_record import BaseRecord, BaseRecordSchema
 
 from marshmallow import fields
@@ -11,6 +14,9 @@ class SavedPDS(BaseRecord):
     ACTIVE = "active"
     INACTIVE = "inactive"
 
+    # resolving the active PDS is on the path of every PDS save
+    CACHE_TTL = 3600
+
     class Meta:
         schema_class = "SavedPDSSchema"
 
@@ -45,7 +51,20 @@ class SavedPDS(BaseRecord):
         return result
 
     @classmethod
-    async def retrieve_active(cls, context):
+    async def retrieve_active(cls, context, cached: bool = True):
+        """
+        Retrieve the active PDS record.
+
+        The active record is cached, the cache is cleared whenever
+        any saved PDS record is saved or deleted.
+        """
+        cache_key = cls.cache_key(cls.ACTIVE)
+        if cached:
+            found = await cls.get_cached_key(context, cache_key)
+            if found:
+                record_id, vals = found
+                return cls.from_storage(record_id, deepcopy(vals))
+
         active_pds = await cls.query(context, {"state": cls.ACTIVE})
         assert isinstance(
             active_pds, list
@@ -56,7 +75,11 @@ class SavedPDS(BaseRecord):
         if len(active_pds) == 0:
             raise StorageNotFoundError
 
-        return active_pds[0]
+        active = active_pds[0]
+        await cls.set_cached_key(
+            context, cache_key, [active._id, deepcopy(active.value)]
+        )
+        return active
 
     @classmethod
     async def retrieve_type_name(cls, context, type, name):
@@ -70,6 +93,16 @@ class SavedPDS(BaseRecord):
 
         return record[0]
 
+    async def clear_cached(self, context: InjectionContext):
+        """Clear the cached value of this record and the cached active record."""
+        await super().clear_cached(context)
+        await self.clear_cached_key(context, self.cache_key(self.ACTIVE))
+
+    async def delete_record(self, context: InjectionContext):
+        """Remove the stored record."""
+        await super().delete_record(context)
+        await self.clear_cached(context)
+
 
 class SavedPDSSchema(BaseRecordSchema):
     class Meta:
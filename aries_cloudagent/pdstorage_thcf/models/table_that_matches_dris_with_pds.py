@@ -4,6 +4,8 @@ from marshmallow import fields, Schema
 from aries_cloudagent.messaging.util import time_now
 from aries_cloudagent.storage.error import StorageDuplicateError
 from ...config.injection_context import InjectionContext
+from ...utils.task_queue import gather_bounded
+from ..base import BasePDS
 from typing import Any, Mapping, Sequence, Union
 import uuid
 
@@ -12,6 +14,10 @@ class DriStorageMatchTable(BaseRecord):
     RECORD_ID_NAME = "dri"
     RECORD_TYPE = "dri_storage_matchtable"
 
+    # dris are content hashes, a saved match never changes
+    CACHE_ENABLED = True
+    CACHE_TTL = 3600
+
     class Meta:
         schema_class = "DriStorageMatchTableSchema"
 
@@ -51,7 +57,7 @@ class DriStorageMatchTable(BaseRecord):
         try:
             self.updated_at = time_now()
             storage: BaseStorage = await context.inject(BaseStorage)
-            
+
             await storage.add_record(self.storage_record)
             new_record = True
         except StorageDuplicateError:
@@ -66,9 +72,55 @@ class DriStorageMatchTable(BaseRecord):
 
         await self.post_save(context, new_record, self._last_state, webhook)
         self._last_state = self.state
+        await self.set_cached_key(context, self.cache_key(self._id), self.value)
 
         return self._id
 
+    @classmethod
+    async def save_many(
+        cls, context: InjectionContext, records: Sequence["DriStorageMatchTable"]
+    ) -> list:
+        """Persist several match records, writing each distinct dri once.
+
+        Args:
+            context: The injection context to use
+            records: The match records to save
+
+        Returns: the dris of the saved records, in the order of records
+        """
+        unique = {record._id: record for record in records}
+        pending = [
+            record
+            for dri, record in unique.items()
+            if not await cls.get_cached_key(context, cls.cache_key(dri))
+        ]
+        if not pending:
+            return [record._id for record in records]
+
+        updated_at = time_now()
+        for record in pending:
+            record.updated_at = updated_at
+        storage: BaseStorage = await context.inject(BaseStorage)
+        try:
+            await storage.add_records([record.storage_record for record in pending])
+        except StorageDuplicateError:
+            # some dris are matched already, save one by one to skip those
+            await gather_bounded(
+                (record.save(context) for record in pending),
+                BasePDS.BATCH_CONCURRENCY,
+            )
+        else:
+            for record in pending:
+                record.log_state(
+                    context, "Created record", {cls.RECORD_TYPE: record.serialize()}
+                )
+                await record.post_save(context, True, record._last_state)
+                record._last_state = record.state
+                await cls.set_cached_key(
+                    context, cls.cache_key(record._id), record.value
+                )
+        return [record._id for record in records]
+
 
 class DriStorageMatchTableSchema(BaseRecordSchema):
     class Meta:
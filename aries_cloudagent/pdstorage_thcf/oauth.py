@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+LOGGER = logging.getLogger(__name__)
+
+
+class OAuthTokenManager:
+    """
+    Keeps an OAuth access token fresh for concurrent requests.
+
+    Only one token request is in flight at a time, every caller needing
+    a token while it runs waits for the same result. Once a token enters its
+    refresh window, callers keep using it while a new token is requested
+    in the background, so requests do not stall at expiry.
+    """
+
+    DEFAULT_REFRESH_MARGIN = 30.0
+
+    def __init__(
+        self,
+        fetch_token: Callable[[], Awaitable[dict]],
+        refresh_margin: float = None,
+    ):
+        """
+        Initialize an `OAuthTokenManager` instance.
+
+        Args:
+            fetch_token: coroutine function requesting a new token, returning
+                the token response with access_token and expires_in
+            refresh_margin: number of seconds before expiry to refresh the token
+
+        """
+        self._fetch_token = fetch_token
+        self.refresh_margin = (
+            self.DEFAULT_REFRESH_MARGIN if refresh_margin is None else refresh_margin
+        )
+        self.token: dict = None
+        self.expires_at = 0.0
+        self.refresh_at = 0.0
+        self.fetch_count = 0
+        self._refresh_task: asyncio.Task = None
+
+    async def _refresh(self) -> dict:
+        try:
+            token = await self._fetch_token()
+            now = time.monotonic()
+            lifetime = float(token.get("expires_in", 0))
+            self.token = token
+            self.expires_at = now + lifetime
+            # refresh early, but not before half of the lifetime has passed
+            self.refresh_at = self.expires_at - min(self.refresh_margin, lifetime / 2)
+            self.fetch_count += 1
+            return token
+        finally:
+            self._refresh_task = None
+
+    def _log_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception():
+            LOGGER.warning("Error refreshing OAuth token: %s", task.exception())
+
+    def _start_refresh(self) -> asyncio.Task:
+        if not self._refresh_task:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+            self._refresh_task.add_done_callback(self._log_failure)
+        return self._refresh_task
+
+    async def refresh(self) -> dict:
+        """Request a new token, joining a token request already in flight."""
+        return await asyncio.shield(self._start_refresh())
+
+    async def get_token(self) -> dict:
+        """Fetch a valid token, requesting a new one when needed."""
+        now = time.monotonic()
+        if self.token and now < self.expires_at:
+            if now >= self.refresh_at:
+                self._start_refresh()
+            return self.token
+        return await self.refresh()
+
+    def invalidate(self):
+        """Forget the current token, the next caller requests a new one."""
+        self.token = None
+        self.expires_at = self.refresh_at = 0.0
+
+    async def close(self):
+        """Cancel a token request in flight."""
+        task = self._refresh_task
+        if task:
+            task.cancel()
+            try:
+                await task
+            except (asyncio.CancelledError, Exception):
+                pass
@@ -1,13 +1,17 @@
 from aries_cloudagent.aathcf.utils import run_standalone_async
-from .base import BasePDS
+from .http import HttpPDS
 from .api import encode
 from .error import PDSError, PDSRecordNotFoundError
+from .json_stream import iter_json_array
+from .oauth import OAuthTokenManager
 
+import asyncio
 import json
 import logging
+from typing import Tuple
 from urllib.parse import urlparse
 
-from aiohttp import ClientSession, ClientConnectionError, ClientError
+from aiohttp import ClientConnectionError, ClientError
 from aries_cloudagent.aathcf.credentials import assert_type, assert_type_or
 import time
 
@@ -59,12 +63,16 @@ def get_delimiter(parameter_count_in):
         return "&"
 
 
-class OwnYourDataVault(BasePDS):
+class OwnYourDataVault(HttpPDS):
+    # number of bytes read at a time when streaming a table
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     def __init__(self):
         super().__init__()
         self.api_url = None
         self.token = {"expires_in": "-1000"}
-        self.token_timestamp = 0
+        self.token_manager = OAuthTokenManager(self.fetch_token)
+        self._usage_policy_task: asyncio.Task = None
         self.preview_settings = {
             "oca_schema_namespace": "pds",
             "oca_schema_dri": "9bABtmHu628Ss4oHmyTU5gy7QB1VftngewTmh7wdmN1j",
@@ -72,110 +80,144 @@ class OwnYourDataVault(BasePDS):
 
     async def get_usage_policy(self):
         if self.settings.get("usage_policy") is None:
-            await self.update_token()
+            await asyncio.shield(self.start_usage_policy_update())
 
         return self.settings["usage_policy"]
 
-    async def update_token(self):
+    def start_usage_policy_update(self) -> asyncio.Task:
+        """Start updating the usage policy, or join the update in progress."""
+        if not self._usage_policy_task:
+            self._usage_policy_task = asyncio.ensure_future(self.update_usage_policy())
+            self._usage_policy_task.add_done_callback(self._usage_policy_done)
+        return self._usage_policy_task
+
+    async def fetch_token(self) -> dict:
+        """Request a new access token, see OAuthTokenManager."""
         parsed_url = urlparse(self.settings.get("api_url"))
-        self.api_url = "{url.scheme}://{url.netloc}".format(url=parsed_url)
-        LOGGER.debug("API URL OYD %s", self.api_url)
+        api_url = "{url.scheme}://{url.netloc}".format(url=parsed_url)
+        LOGGER.debug("API URL OYD %s", api_url)
 
         client_id = self.settings.get("client_id")
         client_secret = self.settings.get("client_secret")
         grant_type = self.settings.get("grant_type", "client_credentials")
         scope = self.settings.get("scope")
 
-        if self.api_url is None:
+        if self.settings.get("api_url") is None:
             raise PDSError("Please configure the plugin, api_url is empty")
         if client_id is None:
             raise PDSError("Please configure the plugin, client_id is empty")
         if client_secret is None:
             raise PDSError("Please configure the plugin, client_secret is empty")
 
-        async with ClientSession() as session:
-            body = {
-                "client_id": client_id,
-                "client_secret": client_secret,
-                "grant_type": grant_type,
-            }
-            if scope is not None:
-                body["scope"] = scope
-            result = await session.post(
-                self.api_url + "/oauth/token",
-                json=body,
-            )
+        body = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": grant_type,
+        }
+        if scope is not None:
+            body["scope"] = scope
+        async with self.client_session.post(
+            api_url + "/oauth/token",
+            json=body,
+        ) as result:
             result = await unpack_response(result)
-            token = json.loads(result)
-            self.token = token
-            self.token_timestamp = time.time()
-            LOGGER.info("update token: %s", self.token)
+        token = json.loads(result)
+        self.api_url = api_url
+        self.token = token
+        LOGGER.debug("update token: %s", token)
 
-        """
-        Download the usage policy
+        # the usage policy is needed once, fetch it outside of the token path
+        if self.settings.get("usage_policy") is None:
+            self.start_usage_policy_update()
 
-        """
+        return token
 
-        url = f"{self.api_url}/api/meta/usage"
-        async with ClientSession() as session:
-            result = await session.get(
-                url,
-                headers={"Authorization": "Bearer " + self.token["access_token"]},
-            )
-            result = await unpack_response(result)
-            self.settings["usage_policy"] = result
-            LOGGER.debug("Usage policy %s", self.settings["usage_policy"])
+    def _usage_policy_done(self, task: asyncio.Task):
+        self._usage_policy_task = None
+        if not task.cancelled() and task.exception():
+            LOGGER.warning("Error updating usage policy: %s", task.exception())
 
-        """
-        Upload usage_policy as oca_schema_chunk
-        """
+    async def update_token(self):
+        """Request a new access token, shared with concurrent callers."""
+        self.token = await self.token_manager.refresh()
 
-        async with ClientSession() as session:
-            result = await session.post(
-                "https://governance.ownyourdata.eu/api/usage-policy/parse",
-                headers={"Authorization": "Bearer " + self.token["access_token"]},
-                json={"ttl": self.settings["usage_policy"]},
-            )
+    async def update_token_when_expired(self):
+        self.token = await self.token_manager.get_token()
+
+    async def download_usage_policy(self) -> str:
+        await self.update_token_when_expired()
+        url = f"{self.api_url}/api/meta/usage"
+        async with self.client_session.get(
+            url,
+            headers={"Authorization": "Bearer " + self.token["access_token"]},
+        ) as result:
             result = await unpack_response(result)
-            result = json.loads(result)
-            result, err = map_parsed_usage_policy(result, cached_schema_to_map_against)
-            await self.save(
-                result,
-                {"table": "tda.oca_chunks.H5F2YgEbXpSZjcNqAYevfGPFXSWUV1d2PnVg2ubkkKb"},
-                addition_meta={"missing": err},
-            )
+        LOGGER.debug("Usage policy %s", result)
+        return result
 
-    async def update_token_when_expired(self):
-        time_elapsed = time.time() - (self.token_timestamp - 10)
-        if time_elapsed > float(self.token["expires_in"]):
-            await self.update_token()
+    async def parse_usage_policy(self, usage_policy: str) -> Tuple[dict, dict]:
+        await self.update_token_when_expired()
+        async with self.client_session.post(
+            "https://governance.ownyourdata.eu/api/usage-policy/parse",
+            headers={"Authorization": "Bearer " + self.token["access_token"]},
+            json={"ttl": usage_policy},
+        ) as result:
+            result = await unpack_response(result)
+        result = json.loads(result)
+        return map_parsed_usage_policy(result, cached_schema_to_map_against)
+
+    async def update_usage_policy(self):
+        """Download the usage policy and upload it as oca_schema_chunk."""
+        usage_policy = await self.download_usage_policy()
+        self.settings["usage_policy"] = usage_policy
+
+        result, err = await self.parse_usage_policy(usage_policy)
+        await self.save(
+            result,
+            {"table": "tda.oca_chunks.H5F2YgEbXpSZjcNqAYevfGPFXSWUV1d2PnVg2ubkkKb"},
+            addition_meta={"missing": err},
+        )
+
+    async def stop(self):
+        """Cancel background token and usage policy updates, close the session."""
+        await self.token_manager.close()
+        if self._usage_policy_task:
+            self._usage_policy_task.cancel()
+        await super().stop()
 
     async def load(self, dri: str) -> dict:
         assert_type(dri, str)
         await self.update_token_when_expired()
 
         url = f"{self.api_url}/api/data/{dri}?p=dri&f=plain"
-        async with ClientSession() as session:
-            result = await session.get(
-                url, headers={"Authorization": "Bearer " + self.token["access_token"]}
-            )
+        async with self.client_session.get(
+            url, headers={"Authorization": "Bearer " + self.token["access_token"]}
+        ) as result:
             result = await unpack_response(result)
-            result_dict: dict = json.loads(result)
+        result_dict: dict = json.loads(result)
 
         return result_dict
 
+    async def load_many(self, ids) -> list:
+        # refresh the token once, before fanning out the requests
+        await self.update_token_when_expired()
+        return await super().load_many(ids)
+
+    async def save_many(self, records) -> list:
+        await self.update_token_when_expired()
+        return await super().save_many(records)
+
     async def link(self, source_dri, with_targets):
         await self.update_token_when_expired()
         body = {"source": source_dri, "targets": with_targets}
-        async with ClientSession() as session:
-            url = f"{self.api_url}/api/relation?p=dri"
-            print("url", url, "body", body)
-
-            response = await session.post(
-                url,
-                headers={"Authorization": "Bearer " + self.token["access_token"]},
-                json=body,
-            )
+        url = f"{self.api_url}/api/relation?p=dri"
+        print("url", url, "body", body)
+
+        async with self.client_session.post(
+            url,
+            headers={"Authorization": "Bearer " + self.token["access_token"]},
+            json=body,
+        ) as response:
             await unpack_response(response)
 
     async def save(self, record, metadata: dict, *, addition_meta={}) -> str:
@@ -219,23 +261,19 @@ class OwnYourDataVault(BasePDS):
         if addition_meta:
             body.update(addition_meta)
 
-        async with ClientSession() as session:
-            url = f"{self.api_url}/api/data"
-            response = await session.post(
-                url,
-                headers={"Authorization": "Bearer " + self.token["access_token"]},
-                json=body,
-            )
+        url = f"{self.api_url}/api/data"
+        async with self.client_session.post(
+            url,
+            headers={"Authorization": "Bearer " + self.token["access_token"]},
+            json=body,
+        ) as response:
             result = await unpack_response(response)
-            result = json.loads(result)
-            LOGGER.debug("Result of POST request %s", result)
+        result = json.loads(result)
+        LOGGER.debug("Result of POST request %s", result)
 
         return dri_value
 
-    async def load_multiple(
-        self, *, table: str = None, oca_schema_base_dri: str = None
-    ):
-        await self.update_token_when_expired()
+    def _load_multiple_url(self, table: str = None, oca_schema_base_dri: str = None):
         url = f"{self.api_url}/api/data"
 
         parameter_count = 0
@@ -251,18 +289,46 @@ class OwnYourDataVault(BasePDS):
             )
             parameter_count += 1
 
-        url = url + get_delimiter(parameter_count) + "f=plain"
+        return url + get_delimiter(parameter_count) + "f=plain"
+
+    async def load_multiple(
+        self, *, table: str = None, oca_schema_base_dri: str = None
+    ):
+        await self.update_token_when_expired()
+        url = self._load_multiple_url(table, oca_schema_base_dri)
 
         LOGGER.info("OYD LOAD TABLE url [ %s ]", url)
-        async with ClientSession() as session:
-            result = await session.get(
-                url, headers={"Authorization": "Bearer " + self.token["access_token"]}
-            )
+        async with self.client_session.get(
+            url, headers={"Authorization": "Bearer " + self.token["access_token"]}
+        ) as result:
             result = await unpack_response(result)
             LOGGER.debug("OYD LOAD TABLE result: [ %s ]", result)
 
         return result
 
+    async def iter_multiple(
+        self, *, table: str = None, oca_schema_base_dri: str = None
+    ):
+        """Stream the records of a table, decoding them as they arrive."""
+        await self.update_token_when_expired()
+        url = self._load_multiple_url(table, oca_schema_base_dri)
+
+        LOGGER.info("OYD STREAM TABLE url [ %s ]", url)
+        # leaving the iterator early releases the response unread
+        async with self.client_session.get(
+            url, headers={"Authorization": "Bearer " + self.token["access_token"]}
+        ) as response:
+            if response.status != 200:
+                await unpack_response(response)
+            records = iter_json_array(
+                response.content.iter_chunked(self.STREAM_CHUNK_SIZE)
+            )
+            try:
+                async for record in records:
+                    yield record
+            except ValueError as err:
+                raise PDSError("Invalid table in Own Your Data PDS", str(err))
+
     async def ping(self) -> [bool, str]:
         try:
             await self.update_token()
@@ -29,7 +29,9 @@ class PersonalDataStorageProvider(BaseProvider):
             assert storage_class is not None, "Storage type / class is not registered"
 
             public_data_storage = ClassLoader.load_class(storage_class)
-            self.cached_instances[storage_type] = public_data_storage()
+            instance = public_data_storage()
+            await instance.start(settings)
+            self.cached_instances[storage_type] = instance
 
             LOGGER.info(
                 f"""CREATE storage_type: {storage_type}
@@ -38,3 +40,8 @@ class PersonalDataStorageProvider(BaseProvider):
             )
 
         return self.cached_instances[storage_type]
+
+    async def stop(self):
+        """Release the resources held by every created storage instance."""
+        for instance in self.cached_instances.values():
+            await instance.stop()
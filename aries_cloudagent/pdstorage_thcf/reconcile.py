@@ -0,0 +1,159 @@
+"""Reconciliation of the DRI to PDS match table with the records held in a PDS."""
+
+import asyncio
+import logging
+import weakref
+from typing import Sequence
+
+from ..config.injection_context import InjectionContext
+from ..storage.base import BaseStorage
+from .api import iter_load_multiple, match_save_many, pds_get_active_name
+from .error import PDSError
+from .models.table_that_matches_dris_with_pds import DriStorageMatchTable
+
+LOGGER = logging.getLogger(__name__)
+
+# tables of the active PDS whose records are matched, the holder's credentials
+RECONCILE_TABLES = ("credentials",)
+# number of match records written at a time
+RECONCILE_BATCH_SIZE = 100
+
+
+async def reconcile_match_table(
+    context: InjectionContext,
+    tables: Sequence[str] = RECONCILE_TABLES,
+    batch_size: int = RECONCILE_BATCH_SIZE,
+) -> list:
+    """
+    Add the missing match records of the records held in the active PDS.
+
+    The dris of the tables and the dris of the local match records are read
+    once each and compared as sets, the missing match records are written
+    in batches.
+
+    Returns: the dris which were missing a match record, none if the active
+        PDS cannot list its records
+    """
+    active_pds = await pds_get_active_name(context)
+
+    remote = set()
+    try:
+        for table in tables:
+            async for record in iter_load_multiple(context, table=table):
+                remote.add(record["dri"])
+    except PDSError as err:
+        LOGGER.debug("Match table of %s not reconciled: %s", active_pds, err.roll_up)
+        return []
+
+    storage: BaseStorage = await context.inject(BaseStorage)
+    local = await storage.search_records(DriStorageMatchTable.RECORD_TYPE).fetch_all()
+    missing = sorted(remote - {record.id for record in local})
+
+    for start in range(0, len(missing), batch_size):
+        end = start + batch_size
+        await match_save_many(context, missing[start:end], active_pds)
+
+    LOGGER.debug(
+        "Reconciled match table of %s: %d records, %d added",
+        active_pds,
+        len(remote),
+        len(missing),
+    )
+    return missing
+
+
+class MatchTableReconciler:
+    """
+    Run the match table reconciliation in the background.
+
+    The reconciliation runs at startup, when a PDS is activated and, given an
+    interval, periodically, so reads of the PDS do not need to repair the
+    match table.
+    """
+
+    def __init__(self, tables: Sequence[str] = None, interval: float = None):
+        """
+        Initialize a `MatchTableReconciler` instance.
+
+        Args:
+            tables: the tables of the active PDS to reconcile
+            interval: number of seconds between scheduled reconciliations,
+                none are scheduled if not given
+
+        """
+        self.tables = tuple(tables or RECONCILE_TABLES)
+        self.interval = interval
+        self._task: asyncio.Task = None
+        self._schedule_task: asyncio.Task = None
+        # cancelled runs and the runs which replaced them
+        self._superseded = weakref.WeakKeyDictionary()
+
+    async def reconcile(self, context: InjectionContext) -> list:
+        """Run one reconciliation, joining one in progress."""
+        task = self.schedule(context)
+        while True:
+            try:
+                return await asyncio.shield(task)
+            except asyncio.CancelledError:
+                # join the run which superseded this one, see `reschedule`
+                task = task.cancelled() and self._superseded.get(task)
+                if not task:
+                    raise
+
+    def schedule(self, context: InjectionContext) -> asyncio.Task:
+        """Start a reconciliation in the background, unless one is in progress."""
+        if not self._task:
+            self._task = asyncio.ensure_future(
+                reconcile_match_table(context, self.tables)
+            )
+            self._task.add_done_callback(self._done)
+        return self._task
+
+    def reschedule(self, context: InjectionContext) -> asyncio.Task:
+        """Start a new reconciliation, cancelling one in progress."""
+        previous = self._task
+        if previous:
+            previous.cancel()
+            self._task = None
+        task = self.schedule(context)
+        if previous:
+            self._superseded[previous] = task
+        return task
+
+    def _done(self, task: asyncio.Task):
+        if self._task is task:
+            self._task = None
+        if not task.cancelled() and task.exception():
+            LOGGER.warning("Error reconciling match table: %s", task.exception())
+
+    async def _run_scheduled(self, context: InjectionContext):
+        while True:
+            try:
+                await self.reconcile(context)
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                # retried on the next run
+                LOGGER.warning("Error reconciling match table: %s", err)
+            await asyncio.sleep(self.interval)
+
+    def start(self, context: InjectionContext):
+        """Start a reconciliation, then the scheduled ones given an interval."""
+        if self.interval:
+            if not self._schedule_task:
+                self._schedule_task = asyncio.ensure_future(
+                    self._run_scheduled(context)
+                )
+        else:
+            self.schedule(context)
+
+    async def stop(self):
+        """Stop the scheduled reconciliations and one in progress."""
+        for task in (self._schedule_task, self._task):
+            if task:
+                task.cancel()
+                try:
+                    await task
+                except (asyncio.CancelledError, Exception):
+                    pass
+        self._schedule_task = self._task = None
@@ -9,13 +9,22 @@ from aiohttp_apispec import (
 from aries_cloudagent.aathcf.utils import run_standalone_async, build_context
 from marshmallow import Schema, fields
 from .base import BasePDS
-from .api import load_multiple, pds_load, pds_save_a
+from .api import (
+    DEFAULT_PAGE_SIZE,
+    load_multiple,
+    load_multiple_page,
+    load_multiple_tables,
+    pds_load,
+    pds_save_a,
+)
 from .error import PDSError
 from ..connections.models.connection_record import ConnectionRecord
+from ..messaging.valid import NATURAL_NUM, WHOLE_NUM
 from ..wallet.error import WalletError
 from ..storage.error import StorageNotFoundError, StorageError
 from .message_types import ExchangeDataA
 from .models.saved_personal_storage import SavedPDS
+from .reconcile import MatchTableReconciler
 from aries_cloudagent.pdstorage_thcf.api import pds_oca_data_format_save
 import aries_cloudagent.generated_models as model
 
@@ -252,6 +261,11 @@ async def pds_activate(context, pds_type, instance_name="default"):
     await active_pds.save(context)
     await pds_to_activate.save(context)
 
+    reconciler = await context.inject(MatchTableReconciler, required=False)
+    if reconciler:
+        # a run in progress reads the previously active PDS
+        reconciler.reschedule(context)
+
 
 @docs(
     tags=["PersonalDataStorage"],
@@ -306,6 +320,17 @@ async def get_storage_types(request: web.BaseRequest):
 class GetMultipleRecordsSchema(Schema):
     table = fields.Str(required=False)
     oca_schema_base_dri = fields.Str(required=False)
+    offset = fields.Int(
+        description="Number of records to skip, or the next offset of a page",
+        required=False,
+        **WHOLE_NUM,
+    )
+    limit = fields.Int(
+        description=f"Number of records on a page, {DEFAULT_PAGE_SIZE} if only"
+        " offset is given, all records if neither offset nor limit is given",
+        required=False,
+        **NATURAL_NUM,
+    )
 
 
 @docs(
@@ -317,15 +342,34 @@ async def get_multiple_records(request: web.BaseRequest):
     context = request.app["request_context"]
     table = request.query.get("table")
     oca_schema_base_dri = request.query.get("oca_schema_base_dri")
+    offset = request.query.get("offset")
+    limit = request.query.get("limit")
 
     try:
-        result = await load_multiple(
-            context, table=table, oca_schema_base_dri=oca_schema_base_dri
+        if offset is None and limit is None:
+            result = await load_multiple(
+                context, table=table, oca_schema_base_dri=oca_schema_base_dri
+            )
+            return web.json_response({"success": True, "result": result})
+
+        page = await load_multiple_page(
+            context,
+            table=table,
+            oca_schema_base_dri=oca_schema_base_dri,
+            offset=int(offset or 0),
+            limit=int(limit or DEFAULT_PAGE_SIZE),
         )
     except PDSError as err:
         raise web.HTTPInternalServerError(reason=err.roll_up)
 
-    return web.json_response({"success": True, "result": result})
+    return web.json_response(
+        {
+            "success": True,
+            "result": page["results"],
+            "offset": page["offset"],
+            "next": page["next"],
+        }
+    )
 
 
 class GetMultipleRecordsForOcaSchema(Schema):
@@ -342,15 +386,14 @@ async def get_multiple_records_for_oca_form_filling(request: web.BaseRequest):
     dri_list = dri_list.getall("oca_schema_base_dris")
     OCA_DATA_CHUNKS = "tda.oca_chunks"
 
-    result = {}
     try:
-        for dri in dri_list:
-            result[dri] = await load_multiple(
-                context, table=OCA_DATA_CHUNKS + "." + dri
-            )
+        loaded = await load_multiple_tables(
+            context, [OCA_DATA_CHUNKS + "." + dri for dri in dri_list]
+        )
     except PDSError as err:
         raise web.HTTPInternalServerError(reason=err.roll_up)
 
+    result = dict(zip(dri_list, loaded))
     return web.json_response({"success": True, "result": result})
 
 
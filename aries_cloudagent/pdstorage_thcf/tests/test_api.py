@@ -0,0 +1,189 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...cache.base import BaseCache
+from ...cache.basic import BasicCache
+from ...config.injection_context import InjectionContext
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+from ..api import (
+    encode,
+    iter_load_multiple,
+    load_multiple,
+    load_multiple_page,
+    load_multiple_tables,
+    pds_get_active_name,
+    pds_load,
+    pds_load_many,
+    pds_oca_data_format_save,
+    pds_save,
+    pds_save_many,
+)
+from ..base import BasePDS
+from ..cache import PDSRecordCache
+from ..error import PDSNotFoundError
+from ..local import LocalPDS
+from ..models.saved_personal_storage import SavedPDS
+from ..models.table_that_matches_dris_with_pds import DriStorageMatchTable
+
+
+class TestPDSApi(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext()
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.pds = LocalPDS()
+        self.context.injector.bind_instance(BasePDS, self.pds)
+        await SavedPDS(state=SavedPDS.ACTIVE).save(self.context)
+
+    async def test_save_many_load_many(self):
+        records = [({"value": i}, {"table": "test"}) for i in range(5)]
+        ids = await pds_save_many(self.context, records)
+        assert len(ids) == 5
+        for id in ids:
+            match = await DriStorageMatchTable.retrieve_by_id(self.context, id)
+            assert tuple(match.pds_type) == ("local", "default")
+
+        loaded = await pds_load_many(self.context, list(reversed(ids)))
+        assert loaded == [{"value": i} for i in reversed(range(5))]
+        assert await pds_load(self.context, ids[0]) == {"value": 0}
+
+    async def test_save_many_duplicates(self):
+        ids = await pds_save_many(self.context, [("same", {}), ("same", {})])
+        assert ids == [encode("same"), encode("same")]
+        assert await pds_load_many(self.context, ids) == ["same", "same"]
+
+    async def test_match_save_many_batched(self):
+        storage = await self.context.inject(BaseStorage)
+        records = [DriStorageMatchTable(dri, ("local", "default")) for dri in "aba"]
+        with async_mock.patch.object(
+            storage, "add_records", async_mock.CoroutineMock(wraps=storage.add_records)
+        ) as mock_add_records:
+            assert await DriStorageMatchTable.save_many(self.context, records) == [
+                "a",
+                "b",
+                "a",
+            ]
+            mock_add_records.assert_called_once()
+            assert len(mock_add_records.call_args[0][0]) == 2
+
+        # an existing match makes the batch fall back to saving one by one
+        records = [DriStorageMatchTable(dri, ("local", "default")) for dri in "bc"]
+        assert await DriStorageMatchTable.save_many(self.context, records) == ["b", "c"]
+        match = await DriStorageMatchTable.retrieve_by_id(self.context, "c")
+        assert tuple(match.pds_type) == ("local", "default")
+
+    async def test_base_fallbacks(self):
+        records = [("one", {}), ("two", {})]
+        ids = await BasePDS.save_many(self.pds, records)
+        assert ids == [encode("one"), encode("two")]
+        loaded = await BasePDS.load_many(self.pds, ids)
+        assert [item["content"] for item in loaded] == ["one", "two"]
+
+    async def test_oca_data_format_save(self):
+        result = await pds_oca_data_format_save(
+            self.context,
+            {"DRI:123": {"t": "o"}, "456": {"t": "o"}, "DRI:789": {"t": "p"}},
+        )
+        assert list(result) == ["DRI:123", "456", "DRI:789"]
+        assert result["DRI:123"] == encode('{"t": "o"}')
+        assert result["456"].startswith("Invalid format")
+        assert await pds_load(self.context, result["DRI:789"]) == {"t": "p"}
+
+    async def test_load_multiple_concurrent(self):
+        with async_mock.patch.object(
+            self.pds, "load_multiple", async_mock.CoroutineMock()
+        ) as mock_load:
+            mock_load.side_effect = lambda table=None, oca_schema_base_dri=None: (
+                f'["{table or oca_schema_base_dri}"]'
+            )
+            result = await load_multiple(self.context, oca_schema_base_dri=["a", "b"])
+            assert result == {"a": ["a"], "b": ["b"]}
+
+            result = await load_multiple_tables(self.context, ["c", "d"])
+            assert result == [["c"], ["d"]]
+
+    async def test_load_multiple_pages(self):
+        produced = []
+
+        async def iter_multiple(table=None, oca_schema_base_dri=None):
+            for i in range(10):
+                produced.append(i)
+                yield {"dri": str(i), "table": table}
+
+        with async_mock.patch.object(self.pds, "iter_multiple", iter_multiple):
+            records = [
+                record["dri"]
+                async for record in iter_load_multiple(
+                    self.context, table="t", offset=2, limit=3
+                )
+            ]
+            assert records == ["2", "3", "4"]
+            # the table is not read past the page
+            assert len(produced) == 6
+
+            page = await load_multiple_page(self.context, table="t", offset=6, limit=2)
+            assert [record["dri"] for record in page["results"]] == ["6", "7"]
+            assert page["next"] == 8
+            page = await load_multiple_page(self.context, table="t", offset=8, limit=2)
+            assert [record["dri"] for record in page["results"]] == ["8", "9"]
+            assert page["next"] is None
+
+    async def test_iter_multiple_fallback(self):
+        with async_mock.patch.object(
+            self.pds,
+            "load_multiple",
+            async_mock.CoroutineMock(return_value='[{"dri": "a"}, {"dri": "b"}]'),
+        ):
+            records = [
+                record async for record in iter_load_multiple(self.context, offset=1)
+            ]
+            assert records == [{"dri": "b"}]
+
+    async def test_load_cached(self):
+        cache = PDSRecordCache()
+        self.context.injector.bind_instance(PDSRecordCache, cache)
+        ids = await pds_save_many(self.context, [({"a": 1}, {}), ("two", {})])
+
+        with async_mock.patch.object(
+            self.pds, "load", async_mock.CoroutineMock(wraps=self.pds.load)
+        ) as mock_load:
+            assert await pds_load(self.context, ids[0]) == {"a": 1}
+            assert await pds_load(self.context, ids[0]) == {"a": 1}
+            assert mock_load.call_count == 1
+
+        with async_mock.patch.object(
+            self.pds, "load_many", async_mock.CoroutineMock(wraps=self.pds.load_many)
+        ) as mock_load_many:
+            assert await pds_load_many(self.context, ids) == [{"a": 1}, "two"]
+            mock_load_many.assert_called_once_with([ids[1]])
+        assert cache.stats()["hits"] == 2
+
+    async def test_cached_active_and_matches(self):
+        self.context.injector.bind_instance(BaseCache, BasicCache())
+        storage = await self.context.inject(BaseStorage)
+        id = await pds_save(self.context, {"a": 1})
+
+        with async_mock.patch.object(
+            storage, "search_records", wraps=storage.search_records
+        ) as mock_search, async_mock.patch.object(
+            storage, "get_record", wraps=storage.get_record
+        ) as mock_get:
+            assert await pds_get_active_name(self.context) == ("local", "default")
+            await pds_save(self.context, {"b": 2})
+            assert await pds_load(self.context, id) == {"a": 1}
+            mock_search.assert_not_called()
+            mock_get.assert_not_called()
+
+            active = await SavedPDS.retrieve_active(self.context)
+            other = SavedPDS(name="other")
+            await other.save(self.context)
+            active.state = SavedPDS.INACTIVE
+            await active.save(self.context)
+            other.state = SavedPDS.ACTIVE
+            await other.save(self.context)
+            assert await pds_get_active_name(self.context) == ("local", "other")
+            assert mock_search.call_count == 1
+
+            await other.delete_record(self.context)
+            with self.assertRaises(PDSNotFoundError):
+                await pds_get_active_name(self.context)
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+
+from asynctest import TestCase as AsyncTestCase
+
+from ...utils.stats import Collector
+from ..cache import PDSRecordCache, content_matches_dri
+from ..dri import encode
+
+
+def record(content):
+    serialized = content if isinstance(content, str) else json.dumps(content)
+    return encode(serialized), {"content": content}
+
+
+class TestPDSRecordCache(AsyncTestCase):
+    def test_content_matches_dri(self):
+        dri, result = record({"a": 1})
+        assert content_matches_dri(result["content"], dri)
+        assert content_matches_dri("a", encode("a"))
+        assert not content_matches_dri("b", encode("a"))
+        assert not content_matches_dri(None, encode("a"))
+
+    def test_get_put(self):
+        cache = PDSRecordCache()
+        dri, result = record({"a": 1})
+        assert cache.get(dri) is None
+        assert cache.put(dri, result)
+        loaded = cache.get(dri)
+        assert loaded == result
+        loaded["content"]["a"] = 2
+        assert cache.get(dri) == result
+        assert cache.stats()["hits"] == 2
+        assert cache.stats()["misses"] == 1
+        assert cache.stats()["hit_rate"] == 2 / 3
+
+    def test_reject_mismatch(self):
+        cache = PDSRecordCache()
+        dri, _ = record("expected")
+        assert not cache.put(dri, {"content": "tampered"})
+        assert not cache.put(dri, None)
+        assert cache.get(dri) is None
+        assert cache.stats()["rejected"] == 2
+
+    def test_evict_by_bytes(self):
+        entries = [record("x" * 100 + str(i)) for i in range(3)]
+        entry_size = len(json.dumps(entries[0][1]))
+        cache = PDSRecordCache(2 * entry_size)
+        for dri, result in entries[:2]:
+            cache.put(dri, result)
+        assert cache.get(entries[0][0])
+        cache.put(*entries[2])
+        assert cache.size == 2 * entry_size
+        assert cache.get(entries[0][0])
+        assert cache.get(entries[1][0]) is None
+        assert cache.get(entries[2][0])
+
+        large_dri, large = record("y" * 1000)
+        assert cache.put(large_dri, large)
+        assert cache.get(large_dri) is None
+
+    def test_disk_tier(self):
+        path = self.tmpdir()
+        entries = [record(str(i) * 50) for i in range(3)]
+        entry_size = len(json.dumps(entries[0][1]))
+        cache = PDSRecordCache(entry_size, disk_path=path)
+        for dri, result in entries:
+            cache.put(dri, result)
+        assert cache.size == entry_size
+        assert cache.disk_size == 3 * entry_size
+        assert cache.get(entries[0][0]) == entries[0][1]
+
+        reopened = PDSRecordCache(disk_path=path, disk_max_bytes=2 * entry_size)
+        assert reopened.disk_size == 3 * entry_size
+        for dri, result in entries:
+            assert reopened.get(dri) == result
+        reopened.put(*record("new"))
+        assert reopened.disk_size <= 2 * entry_size
+
+        reopened.clear()
+        assert reopened.size == reopened.disk_size == 0
+        assert not os.listdir(path)
+
+    def test_collector(self):
+        collector = Collector()
+        cache = PDSRecordCache(collector=collector)
+        dri, result = record("a")
+        cache.get(dri)
+        cache.put(dri, result)
+        cache.get(dri)
+        cache.put(dri, {"content": "b"})
+        assert collector.extract()["counters"] == {
+            "pds_cache.hit": 1,
+            "pds_cache.miss": 1,
+            "pds_cache.rejected": 1,
+        }
+
+    def tmpdir(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        return tmp.name
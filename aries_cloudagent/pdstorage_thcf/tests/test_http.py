@@ -0,0 +1,104 @@
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ..base import BasePDS
+from ..data_vault import DataVault
+from ..error import PDSError
+from ..own_your_data import OwnYourDataVault
+from ..provider import PersonalDataStorageProvider
+
+
+class TestHttpPDS(AsyncTestCase):
+    async def test_session_reused(self):
+        vault = OwnYourDataVault()
+        session = vault.client_session
+        assert session is vault.client_session
+        assert not session.closed
+
+        await vault.stop()
+        assert session.closed
+        assert vault.client_session is not session
+        await vault.stop()
+
+    async def test_start_configures_pool(self):
+        context = InjectionContext(
+            settings={
+                "pds.http.limit": 10,
+                "pds.http.limit_per_host": 2,
+                "pds.http.timeout": 5,
+            }
+        )
+        vault = DataVault()
+        await vault.start(context.settings)
+        assert vault.limit == 10
+        assert vault.limit_per_host == 2
+        assert vault.client_session.connector.limit_per_host == 2
+        assert vault.client_session._timeout.total == 5.0
+        await vault.stop()
+
+    async def test_provider_lifecycle(self):
+        context = InjectionContext(
+            settings={
+                "personal_storage_registered_types": {
+                    "own_your_data": (
+                        "aries_cloudagent.pdstorage_thcf.own_your_data"
+                        ".OwnYourDataVault"
+                    ),
+                    "local": "aries_cloudagent.pdstorage_thcf.local.LocalPDS",
+                }
+            }
+        )
+        provider = PersonalDataStorageProvider()
+        context.injector.bind_provider(BasePDS, provider)
+
+        vault = await context.inject(
+            BasePDS, {"personal_storage_type": ("own_your_data", "default")}
+        )
+        await context.inject(BasePDS, {"personal_storage_type": ("local", "default")})
+        session = vault.client_session
+
+        await provider.stop()
+        assert session.closed
+
+    async def test_own_your_data_stream_table(self):
+        vault = OwnYourDataVault()
+        vault.token_manager._fetch_token = async_mock.CoroutineMock(
+            return_value={"access_token": "token", "expires_in": 7200}
+        )
+        vault.settings["usage_policy"] = "policy"
+        vault.api_url = "https://pds"
+        read = []
+
+        async def iter_chunked(size):
+            for chunk in (b'[{"dri": "a"},', b' {"dri": "b"}, {"dr', b'i": "c"}]'):
+                read.append(chunk)
+                yield chunk
+
+        response = async_mock.MagicMock(status=200)
+        response.content.iter_chunked = iter_chunked
+        session = async_mock.MagicMock(closed=False)
+        session.get.return_value.__aenter__ = async_mock.CoroutineMock(
+            return_value=response
+        )
+        session.get.return_value.__aexit__ = async_mock.CoroutineMock(return_value=None)
+        vault._client_session = session
+
+        records = [record async for record in vault.iter_multiple(table="t")]
+        assert records == [{"dri": "a"}, {"dri": "b"}, {"dri": "c"}]
+        assert "table=dip.data.t" in session.get.call_args[0][0]
+
+        read.clear()
+        async for record in vault.iter_multiple(table="t"):
+            break
+        assert len(read) == 1
+        session.get.return_value.__aexit__.assert_awaited()
+
+        async def invalid(size):
+            yield b'[{"dri": "a"} {'
+
+        response.content.iter_chunked = invalid
+        with self.assertRaises(PDSError):
+            async for record in vault.iter_multiple(table="t"):
+                pass
+        vault._client_session = None
@@ -0,0 +1,45 @@
+import json
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..json_stream import JSONArrayDecoder, iter_json_array
+
+
+async def chunked(data: bytes, size: int):
+    for index in range(0, len(data), size):
+        yield data[index : index + size]
+
+
+class TestJSONArrayDecoder(AsyncTestCase):
+    async def test_decode_any_chunking(self):
+        records = [
+            {"dri": "zQm1", "content": '{"a": [1, 2]}'},
+            {"dri": "zQm2", "content": "zażółć ]},"},
+            12345,
+            -1.5e3,
+            True,
+            None,
+            [],
+            "text",
+        ]
+        data = json.dumps(records, indent=1, ensure_ascii=False).encode("utf-8")
+        for size in (1, 2, 3, 7, 64, len(data)):
+            result = [item async for item in iter_json_array(chunked(data, size))]
+            assert result == records, size
+
+    async def test_empty(self):
+        assert [item async for item in iter_json_array(chunked(b" [ ] ", 1))] == []
+
+    def test_elements_as_they_arrive(self):
+        decoder = JSONArrayDecoder()
+        assert decoder.feed(b'[{"a": 1}, {"b"') == [{"a": 1}]
+        assert decoder.feed(b": 2}, 12") == [{"b": 2}]
+        assert decoder.feed(b"3]") == [123]
+        assert decoder.close() == []
+
+    def test_invalid(self):
+        for data in (b'{"a": 1}', b"[1 2]", b"[1,]", b"[1", b"[1] 2", b"[{]"):
+            decoder = JSONArrayDecoder()
+            with self.assertRaises(ValueError):
+                decoder.feed(data)
+                decoder.close()
@@ -0,0 +1,110 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ..oauth import OAuthTokenManager
+from ..own_your_data import OwnYourDataVault
+
+
+class TestOAuthTokenManager(AsyncTestCase):
+    def setUp(self):
+        self.fetched = 0
+        self.release = asyncio.Event()
+
+    async def fetch_token(self):
+        self.fetched += 1
+        await self.release.wait()
+        return {"access_token": f"token-{self.fetched}", "expires_in": 100}
+
+    async def test_concurrent_callers_share_fetch(self):
+        manager = OAuthTokenManager(self.fetch_token)
+        waiters = [asyncio.ensure_future(manager.get_token()) for _ in range(10)]
+        await asyncio.sleep(0)
+        self.release.set()
+        tokens = await asyncio.gather(*waiters)
+
+        assert self.fetched == 1
+        assert manager.fetch_count == 1
+        assert all(token["access_token"] == "token-1" for token in tokens)
+        assert (await manager.get_token())["access_token"] == "token-1"
+        assert self.fetched == 1
+
+    async def test_refresh_in_background_before_expiry(self):
+        self.release.set()
+        manager = OAuthTokenManager(self.fetch_token, refresh_margin=10)
+        await manager.get_token()
+        assert manager.refresh_at == manager.expires_at - 10
+
+        manager.refresh_at = 0
+        token = await manager.get_token()
+        # the current token is still handed out while the new one is requested
+        assert token["access_token"] == "token-1"
+        await asyncio.sleep(0)
+        assert self.fetched == 2
+        assert (await manager.get_token())["access_token"] == "token-2"
+
+    async def test_fetch_error_reaches_waiters(self):
+        manager = OAuthTokenManager(
+            async_mock.CoroutineMock(side_effect=ValueError("no token"))
+        )
+        waiters = [asyncio.ensure_future(manager.get_token()) for _ in range(3)]
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert manager._fetch_token.call_count == 1
+        assert manager.token is None
+        with self.assertRaises(ValueError):
+            await manager.get_token()
+        assert manager._fetch_token.call_count == 2
+
+    async def test_invalidate_and_close(self):
+        self.release.set()
+        manager = OAuthTokenManager(self.fetch_token)
+        await manager.get_token()
+        manager.invalidate()
+        assert (await manager.get_token())["access_token"] == "token-2"
+
+        self.release.clear()
+        manager.invalidate()
+        waiter = asyncio.ensure_future(manager.get_token())
+        await asyncio.sleep(0)
+        await manager.close()
+        with self.assertRaises(asyncio.CancelledError):
+            await waiter
+
+
+class TestOwnYourDataToken(AsyncTestCase):
+    async def test_token_fetched_once_for_concurrent_requests(self):
+        vault = OwnYourDataVault()
+        vault.settings["usage_policy"] = "policy"
+        token = {"access_token": "token", "expires_in": 7200}
+        fetch_token = async_mock.CoroutineMock(return_value=token)
+        vault.token_manager._fetch_token = fetch_token
+        await asyncio.gather(*(vault.update_token_when_expired() for _ in range(5)))
+        assert fetch_token.call_count == 1
+        assert vault.token == token
+        assert await vault.get_usage_policy() == "policy"
+        await vault.stop()
+
+    async def test_usage_policy_updated_once(self):
+        vault = OwnYourDataVault()
+        token = {"access_token": "token", "expires_in": 7200}
+
+        async def fetch_token():
+            # like OwnYourDataVault.fetch_token without a usage policy yet
+            vault.start_usage_policy_update()
+            return token
+
+        async def update_usage_policy():
+            await vault.update_token_when_expired()
+            vault.settings["usage_policy"] = "policy"
+
+        vault.token_manager._fetch_token = fetch_token
+        vault.update_usage_policy = async_mock.CoroutineMock(
+            side_effect=update_usage_policy
+        )
+        policies = await asyncio.gather(*(vault.get_usage_policy() for _ in range(3)))
+        assert policies == ["policy"] * 3
+        assert vault.update_usage_policy.call_count == 1
+        await vault.stop()
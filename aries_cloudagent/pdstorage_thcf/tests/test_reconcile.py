@@ -0,0 +1,132 @@
+import asyncio
+
+from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
+
+from ...config.injection_context import InjectionContext
+from ...config.pdstorage import (
+    personal_data_storage_config,
+    personal_data_storage_shutdown,
+)
+from ...storage.base import BaseStorage
+from ...storage.basic import BasicStorage
+from .. import reconcile as test_module
+from ..base import BasePDS
+from ..local import LocalPDS
+from ..models.saved_personal_storage import SavedPDS
+from ..models.table_that_matches_dris_with_pds import DriStorageMatchTable
+from ..reconcile import MatchTableReconciler, reconcile_match_table
+
+
+class TestReconcile(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext()
+        self.context.injector.bind_instance(BaseStorage, BasicStorage())
+        self.pds = LocalPDS()
+        self.context.injector.bind_instance(BasePDS, self.pds)
+        await SavedPDS(state=SavedPDS.ACTIVE).save(self.context)
+        self.tables = {"credentials": ["a", "b", "c", "d", "e"], "other": ["f"]}
+
+        async def iter_multiple(table=None, oca_schema_base_dri=None):
+            for dri in self.tables[table]:
+                yield {"dri": dri, "content": "{}"}
+
+        self.pds.iter_multiple = iter_multiple
+
+    async def test_reconcile_adds_missing(self):
+        await DriStorageMatchTable("b", ("local", "default")).save(self.context)
+
+        with async_mock.patch.object(
+            test_module,
+            "match_save_many",
+            async_mock.CoroutineMock(side_effect=test_module.match_save_many),
+        ) as mock_save:
+            missing = await reconcile_match_table(self.context, batch_size=2)
+            assert missing == ["a", "c", "d", "e"]
+            assert [call[0][1] for call in mock_save.call_args_list] == [
+                ["a", "c"],
+                ["d", "e"],
+            ]
+
+        for dri in "abcde":
+            match = await DriStorageMatchTable.retrieve_by_id(self.context, dri)
+            assert tuple(match.pds_type) == ("local", "default")
+
+        assert await reconcile_match_table(self.context) == []
+        assert await reconcile_match_table(self.context, ["credentials", "other"]) == [
+            "f"
+        ]
+
+    async def test_reconciler_single_flight(self):
+        reconciler = MatchTableReconciler()
+        with async_mock.patch.object(
+            test_module, "reconcile_match_table", async_mock.CoroutineMock()
+        ) as mock_reconcile:
+            mock_reconcile.return_value = ["a"]
+            results = await asyncio.gather(
+                reconciler.reconcile(self.context), reconciler.reconcile(self.context)
+            )
+            assert results == [["a"], ["a"]]
+            assert mock_reconcile.call_count == 1
+
+            mock_reconcile.side_effect = ValueError()
+            with self.assertRaises(ValueError):
+                await reconciler.reconcile(self.context)
+
+    async def test_reconciler_scheduled(self):
+        reconciler = MatchTableReconciler(interval=0.01)
+        with async_mock.patch.object(
+            test_module, "reconcile_match_table", async_mock.CoroutineMock()
+        ) as mock_reconcile:
+            mock_reconcile.side_effect = ValueError()
+            reconciler.start(self.context)
+            await asyncio.sleep(0.05)
+            await reconciler.stop()
+            calls = mock_reconcile.call_count
+            assert calls > 1
+            await asyncio.sleep(0.02)
+            assert mock_reconcile.call_count == calls
+
+            # a single run at startup without an interval
+            mock_reconcile.reset_mock()
+            reconciler = MatchTableReconciler()
+            reconciler.start(self.context)
+            assert reconciler._schedule_task is None
+            await asyncio.sleep(0.02)
+            assert mock_reconcile.call_count == 1
+
+    async def test_reconciler_reschedule(self):
+        reconciler = MatchTableReconciler()
+        started = asyncio.Event()
+        runs = []
+
+        async def reconcile(context, tables):
+            runs.append(len(runs))
+            started.set()
+            if len(runs) == 1:
+                await asyncio.sleep(10)
+            return runs[-1:]
+
+        with async_mock.patch.object(test_module, "reconcile_match_table", reconcile):
+            joined = asyncio.ensure_future(reconciler.reconcile(self.context))
+            await started.wait()
+            # the run in progress is replaced, and its callers join the new one
+            assert await reconciler.reschedule(self.context) == [1]
+            assert await joined == [1]
+            assert reconciler._task is None
+
+    async def test_reconcile_unsupported(self):
+        del self.pds.iter_multiple
+        assert await reconcile_match_table(self.context) == []
+
+    async def test_storage_config_starts_reconciler(self):
+        self.context.settings["pds.reconcile_interval"] = "60"
+        with async_mock.patch.object(
+            MatchTableReconciler, "start", async_mock.MagicMock()
+        ) as mock_start:
+            await personal_data_storage_config(self.context)
+            mock_start.assert_called_once_with(self.context)
+
+        reconciler = await self.context.inject(MatchTableReconciler)
+        assert reconciler.interval == 60.0
+        await personal_data_storage_shutdown(self.context)
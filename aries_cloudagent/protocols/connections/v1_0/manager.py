@@ -5,6 +5,7 @@ import logging
 from typing import Sequence, Tuple
 
 from ....cache.base import BaseCache
+from ....connections.connection_index import ConnectionIndex
 from ....connections.models.connection_record import ConnectionRecord
 from ....connections.models.connection_target import ConnectionTarget
 from ....connections.models.diddoc import (
@@ -719,8 +720,23 @@ class ConnectionManager:
         cache_key = None
         connection = None
         resolved = False
+        index = None
 
         if receipt.sender_verkey and receipt.recipient_verkey:
+            index: ConnectionIndex = await self.context.inject(
+                ConnectionIndex, required=False
+            )
+            if index:
+                indexed = index.get(receipt.sender_verkey, receipt.recipient_verkey)
+                if indexed:
+                    receipt.sender_did = indexed.sender_did
+                    receipt.recipient_did_public = indexed.recipient_did_public
+                    receipt.recipient_did = indexed.recipient_did
+                    return ConnectionRecord.from_storage(
+                        indexed.connection_id, indexed.value
+                    )
+                generation = index.generation
+
             cache_key = (
                 f"connection_by_verkey::{receipt.sender_verkey}"
                 f"::{receipt.recipient_verkey}"
@@ -750,6 +766,18 @@ class ConnectionManager:
 
         if not connection and not resolved:
             connection = await self.resolve_inbound_connection(receipt)
+
+        if index and connection:
+            index.add(
+                receipt.sender_verkey,
+                receipt.recipient_verkey,
+                connection.connection_id,
+                connection.value,
+                sender_did=receipt.sender_did,
+                recipient_did=receipt.recipient_did,
+                recipient_did_public=receipt.recipient_did_public,
+                generation=generation,
+            )
         return connection
 
     async def resolve_inbound_connection(
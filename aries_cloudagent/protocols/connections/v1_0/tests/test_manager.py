@@ -5,6 +5,7 @@ from aries_cloudagent.cache.base import BaseCache
 from aries_cloudagent.cache.basic import BasicCache
 from aries_cloudagent.config.base import InjectorError
 from aries_cloudagent.config.injection_context import InjectionContext
+from aries_cloudagent.connections.connection_index import ConnectionIndex
 from aries_cloudagent.connections.models.connection_record import ConnectionRecord
 from aries_cloudagent.connections.models.connection_target import ConnectionTarget
 from aries_cloudagent.connections.models.diddoc import (
@@ -704,6 +705,56 @@ class TestConnectionManager(AsyncTestCase, TestConfig):
             conn_rec = await self.manager.find_inbound_connection(receipt)
             assert conn_rec.id == mock_conn.id
 
+    async def test_find_inbound_connection_indexed(self):
+        index = ConnectionIndex()
+        self.context.injector.bind_instance(ConnectionIndex, index)
+        receipt = MessageReceipt(
+            sender_verkey=self.test_verkey,
+            recipient_verkey=self.test_target_verkey,
+        )
+        record = ConnectionRecord(
+            my_did=self.test_did,
+            their_did=self.test_target_did,
+            state=ConnectionRecord.STATE_ACTIVE,
+        )
+        await record.save(self.context)
+
+        with async_mock.patch.object(
+            ConnectionManager, "resolve_inbound_connection", async_mock.CoroutineMock()
+        ) as mock_resolve:
+
+            async def resolve(receipt):
+                receipt.sender_did = self.test_target_did
+                receipt.recipient_did = self.test_did
+                return record
+
+            mock_resolve.side_effect = resolve
+            assert await self.manager.find_inbound_connection(receipt) is record
+
+        # no storage, wallet or cache lookup once indexed
+        receipt = MessageReceipt(
+            sender_verkey=self.test_verkey,
+            recipient_verkey=self.test_target_verkey,
+        )
+        with async_mock.patch.object(
+            self.cache, "get", async_mock.CoroutineMock()
+        ) as mock_cache_get, async_mock.patch.object(
+            self.storage, "get_record", async_mock.CoroutineMock()
+        ) as mock_get_record:
+            conn_rec = await self.manager.find_inbound_connection(receipt)
+            mock_cache_get.assert_not_called()
+            mock_get_record.assert_not_called()
+        assert conn_rec is not record
+        assert conn_rec.connection_id == record.connection_id
+        assert conn_rec.state == ConnectionRecord.STATE_ACTIVE
+        assert receipt.sender_did == self.test_target_did
+        assert receipt.recipient_did == self.test_did
+
+        # saving the record removes the snapshot
+        conn_rec.state = ConnectionRecord.STATE_INACTIVE
+        await conn_rec.save(self.context)
+        assert index.get(self.test_verkey, self.test_target_verkey) is None
+
     async def test_find_inbound_connection_no_cache(self):
         receipt = MessageReceipt(
             sender_verkey=self.test_verkey,
@@ -7,7 +7,7 @@ from marshmallow import fields, validate
 from .....config.injection_context import InjectionContext
 from .....messaging.models.base_record import BaseExchangeRecord, BaseExchangeSchema
 from .....messaging.valid import UUIDFour
-from aries_cloudagent.pdstorage_thcf.api import pds_load, pds_save
+from aries_cloudagent.pdstorage_thcf.api import pds_load, pds_save, pds_save_many
 
 
 class CredentialExchangeRecord(BaseExchangeRecord):
@@ -134,6 +134,15 @@ class CredentialExchangeRecord(BaseExchangeRecord):
     async def issuer_credential_pds_set(self, context, credential):
         self.credential_id = await pds_save(context, credential)
 
+    @classmethod
+    async def issuer_credentials_pds_set(cls, context, exchanges, credentials):
+        """Save the credentials of several exchanges in one PDS batch."""
+        credential_ids = await pds_save_many(
+            context, [(credential, {}) for credential in credentials]
+        )
+        for exchange, credential_id in zip(exchanges, credential_ids):
+            exchange.credential_id = credential_id
+
     async def credential_pds_get(self, context):
         if self.credential_id is None:
             return None
@@ -7,8 +7,11 @@ from aiohttp_apispec import (
 )
 from aiohttp import web
 from marshmallow import fields
+from collections import OrderedDict
 import logging
+from ....core.error import BaseError
 from ....messaging.models.base import OpenAPISchema
+from ....utils.task_queue import gather_bounded
 from .messages.credential_issue import CredentialIssue
 from aries_cloudagent.protocols.issue_credential.v1_1.messages.credential_request import (
     CredentialRequest,
@@ -25,6 +28,8 @@ from aries_cloudagent.issuer.base import BaseIssuer, IssuerError
 
 LOGGER = logging.getLogger(__name__)
 
+ISSUE_BATCH_CONCURRENCY = 10
+
 
 class RequestCredentialSchema(OpenAPISchema):
     credential_values = fields.Dict()
@@ -35,6 +40,10 @@ class IssueCredentialQuerySchema(OpenAPISchema):
     credential_exchange_id = fields.Str(required=False)
 
 
+class IssueCredentialBatchSchema(OpenAPISchema):
+    credential_exchange_ids = fields.List(fields.Str(), required=True)
+
+
 class RetrieveCredentialExchangeQuerySchema(OpenAPISchema):
     connection_id = fields.Str(required=False)
     thread_id = fields.Str(required=False)
@@ -93,6 +102,132 @@ async def issue_credential(request: web.BaseRequest):
     )
 
 
+def batch_error_reason(err: Exception) -> str:
+    """Describe the failure of a batch item, logging unexpected errors."""
+    if isinstance(err, web.HTTPException):
+        return err.reason
+    if isinstance(err, BaseError):
+        return err.roll_up
+    LOGGER.error("Unexpected error in credential batch", exc_info=err)
+    return str(err) or err.__class__.__name__
+
+
+async def issue_batch_prepare(context, credential_exchange_id):
+    exchange = await retrieve_credential_exchange(context, credential_exchange_id)
+
+    if exchange.role != exchange.ROLE_ISSUER:
+        raise web.HTTPBadRequest(reason="Invalid exchange role")
+    if exchange.state != exchange.STATE_REQUEST_RECEIVED:
+        raise web.HTTPBadRequest(reason="Invalid exchange state")
+
+    connection = await retrieve_connection(context, exchange.connection_id)
+    return exchange, connection
+
+
+async def issue_batch_sign(issuer: BaseIssuer, exchange: CredentialExchangeRecord):
+    request = exchange.credential_request
+    if not request:
+        raise web.HTTPBadRequest(reason="Exchange has no credential request")
+    return await issuer.create_credential_ex(
+        request.get("credential_values"),
+        request.get("credential_type"),
+        exchange.their_public_did,
+    )
+
+
+async def issue_batch_send(outbound_handler, exchange, connection, credential):
+    issue = CredentialIssue(credential=credential)
+    issue.assign_thread_id(exchange.thread_id)
+    await outbound_handler(issue, connection_id=connection.connection_id)
+
+
+@docs(
+    tags=["issue-credential"],
+    summary="Issue credentials for several exchanges",
+    description="Credentials are signed in parallel, saved in one batch "
+    "and the result of every exchange is reported separately",
+)
+@request_schema(IssueCredentialBatchSchema())
+async def issue_credential_batch(request: web.BaseRequest):
+    context = request.app["request_context"]
+    outbound_handler = request.app["outbound_message_router"]
+
+    body = await request.json()
+    exchange_ids = body.get("credential_exchange_ids")
+    if not isinstance(exchange_ids, list):
+        raise web.HTTPBadRequest(reason="credential_exchange_ids must be a list")
+    exchange_ids = list(OrderedDict.fromkeys(exchange_ids))
+    results = OrderedDict(
+        (exchange_id, {"credential_exchange_id": exchange_id, "success": False})
+        for exchange_id in exchange_ids
+    )
+
+    prepared = await gather_bounded(
+        (issue_batch_prepare(context, exchange_id) for exchange_id in exchange_ids),
+        ISSUE_BATCH_CONCURRENCY,
+        return_exceptions=True,
+    )
+    pending = []
+    for exchange_id, item in zip(exchange_ids, prepared):
+        if isinstance(item, Exception):
+            results[exchange_id]["reason"] = batch_error_reason(item)
+        else:
+            pending.append(item)
+
+    issuer: BaseIssuer = await context.inject(BaseIssuer)
+    signed = await gather_bounded(
+        (issue_batch_sign(issuer, exchange) for exchange, _ in pending),
+        ISSUE_BATCH_CONCURRENCY,
+        return_exceptions=True,
+    )
+    issued = []
+    for (exchange, connection), credential in zip(pending, signed):
+        if isinstance(credential, Exception):
+            reason = batch_error_reason(credential)
+            results[exchange._id][
+                "reason"
+            ] = f"Error occured while creating a credential {reason}"
+        else:
+            issued.append((exchange, connection, credential))
+
+    if issued:
+        try:
+            await CredentialExchangeRecord.issuer_credentials_pds_set(
+                context,
+                [exchange for exchange, _, _ in issued],
+                [credential for _, _, credential in issued],
+            )
+        except PDSError as err:
+            # nothing was sent yet, so issuance can be retried
+            for exchange, _, _ in issued:
+                results[exchange._id]["reason"] = err.roll_up
+            issued = []
+
+    sent = await gather_bounded(
+        (
+            issue_batch_send(outbound_handler, exchange, connection, credential)
+            for exchange, connection, credential in issued
+        ),
+        ISSUE_BATCH_CONCURRENCY,
+        return_exceptions=True,
+    )
+    delivered = []
+    for (exchange, _, _), error in zip(issued, sent):
+        if isinstance(error, Exception):
+            # the exchange keeps its state, so issuance can be retried
+            LOGGER.error("Error sending credential for %s: %s", exchange._id, error)
+            results[exchange._id]["reason"] = f"Error sending credential {error}"
+        else:
+            exchange.state = CredentialExchangeRecord.STATE_ISSUED
+            results[exchange._id]["success"] = True
+            delivered.append(exchange)
+    await gather_bounded(
+        (exchange.save(context) for exchange in delivered), ISSUE_BATCH_CONCURRENCY
+    )
+
+    return web.json_response({"success": True, "results": list(results.values())})
+
+
 async def routes_get_public_did(context):
     wallet: BaseWallet = await context.inject(BaseWallet)
     public_did = await wallet.get_public_did()
@@ -176,6 +311,7 @@ async def register(app: web.Application):
     app.add_routes(
         [
             web.post("/issue-credential/issue", issue_credential),
+            web.post("/issue-credential/issue-batch", issue_credential_batch),
             web.post("/issue-credential/request", request_credential),
             web.get(
                 "/issue-credential/exchange/record",
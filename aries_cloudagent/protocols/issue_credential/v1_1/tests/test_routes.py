@@ -6,9 +6,17 @@ from aiohttp import web as aio_web
 from .....config.injection_context import InjectionContext
 from .....holder.base import BaseHolder
 from .....messaging.request_context import RequestContext
-from .....wallet.base import DIDInfo
+from .....issuer.base import BaseIssuer
+from .....issuer.pds import PDSIssuer
+from .....pdstorage_thcf.base import BasePDS
+from .....pdstorage_thcf.error import PDSError
+from .....pdstorage_thcf.local import LocalPDS
+from .....pdstorage_thcf.models.saved_personal_storage import SavedPDS
+from .....wallet.base import BaseWallet, DIDInfo
+from .....wallet.basic import BasicWallet
 
 from .. import routes as test_module
+from ..models.credential_exchange import CredentialExchangeRecord
 from aries_cloudagent.storage.base import BaseStorage
 from aries_cloudagent.storage.basic import BasicStorage
 from aries_cloudagent.connections.models.connection_record import ConnectionRecord
@@ -43,3 +51,138 @@ class TestCredentialRoutes(AsyncTestCase):
 
             await test_module.request_credential(mock)
             mock_response.assert_called_once()
+
+    async def test_issue_credential_batch(self):
+        context = RequestContext(base_context=InjectionContext(enforce_typing=False))
+        wallet = BasicWallet()
+        await wallet.create_public_did()
+        context.injector.bind_instance(BaseWallet, wallet)
+        context.injector.bind_instance(BaseStorage, BasicStorage())
+        context.injector.bind_instance(BaseIssuer, PDSIssuer(wallet))
+        context.injector.bind_instance(BasePDS, LocalPDS())
+        await SavedPDS(state=SavedPDS.ACTIVE).save(context)
+        connection_id = await ConnectionRecord(
+            state=ConnectionRecord.STATE_ACTIVE
+        ).save(context)
+
+        exchange_ids = []
+        for state in (
+            CredentialExchangeRecord.STATE_REQUEST_RECEIVED,
+            CredentialExchangeRecord.STATE_ISSUED,
+            CredentialExchangeRecord.STATE_REQUEST_RECEIVED,
+        ):
+            exchange = CredentialExchangeRecord(
+                connection_id=connection_id,
+                role=CredentialExchangeRecord.ROLE_ISSUER,
+                state=state,
+                thread_id=f"thread-{len(exchange_ids)}",
+                credential_request={
+                    "credential_type": "TYPE_EXAMPLE",
+                    "credential_values": {"index": len(exchange_ids)},
+                },
+            )
+            exchange_ids.append(await exchange.save(context))
+        exchange_ids.append(
+            await CredentialExchangeRecord(
+                connection_id=connection_id,
+                role=CredentialExchangeRecord.ROLE_ISSUER,
+                state=CredentialExchangeRecord.STATE_REQUEST_RECEIVED,
+                thread_id="thread-no-request",
+            ).save(context)
+        )
+
+        outbound = async_mock.CoroutineMock()
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(
+            return_value={"credential_exchange_ids": exchange_ids + ["missing"]}
+        )
+        mock.app = {"request_context": context, "outbound_message_router": outbound}
+
+        with async_mock.patch.object(test_module.web, "json_response") as mock_response:
+            await test_module.issue_credential_batch(mock)
+        results = mock_response.call_args[0][0]["results"]
+
+        assert [result["credential_exchange_id"] for result in results] == (
+            exchange_ids + ["missing"]
+        )
+        assert [result["success"] for result in results] == [
+            True,
+            False,
+            True,
+            False,
+            False,
+        ]
+        assert results[1]["reason"] == "Invalid exchange state"
+        assert results[3]["reason"].endswith("Exchange has no credential request")
+        assert outbound.call_count == 2
+        for exchange_id in (exchange_ids[0], exchange_ids[2]):
+            exchange = await CredentialExchangeRecord.retrieve_by_id(
+                context, exchange_id
+            )
+            assert exchange.state == CredentialExchangeRecord.STATE_ISSUED
+            credential = await exchange.credential_pds_get(context)
+            assert credential["credentialSubject"]["index"] == exchange_ids.index(
+                exchange_id
+            )
+
+    async def test_issue_credential_batch_pds_error(self):
+        context = RequestContext(base_context=InjectionContext(enforce_typing=False))
+        wallet = BasicWallet()
+        await wallet.create_public_did()
+        context.injector.bind_instance(BaseWallet, wallet)
+        context.injector.bind_instance(BaseStorage, BasicStorage())
+        context.injector.bind_instance(BaseIssuer, PDSIssuer(wallet))
+        connection_id = await ConnectionRecord(
+            state=ConnectionRecord.STATE_ACTIVE
+        ).save(context)
+        exchange_id = await CredentialExchangeRecord(
+            connection_id=connection_id,
+            role=CredentialExchangeRecord.ROLE_ISSUER,
+            state=CredentialExchangeRecord.STATE_REQUEST_RECEIVED,
+            thread_id="thread",
+            credential_request={"credential_values": {"name": "value"}},
+        ).save(context)
+
+        outbound = async_mock.CoroutineMock()
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(
+            return_value={"credential_exchange_ids": [exchange_id]}
+        )
+        mock.app = {"request_context": context, "outbound_message_router": outbound}
+
+        with async_mock.patch.object(
+            test_module.CredentialExchangeRecord,
+            "issuer_credentials_pds_set",
+            async_mock.CoroutineMock(side_effect=PDSError("no pds")),
+        ), async_mock.patch.object(test_module.web, "json_response") as mock_response:
+            await test_module.issue_credential_batch(mock)
+        results = mock_response.call_args[0][0]["results"]
+
+        assert results == [
+            {
+                "credential_exchange_id": exchange_id,
+                "success": False,
+                "reason": "no pds.",
+            }
+        ]
+        outbound.assert_not_called()
+        exchange = await CredentialExchangeRecord.retrieve_by_id(context, exchange_id)
+        assert exchange.state == CredentialExchangeRecord.STATE_REQUEST_RECEIVED
+
+    async def test_issue_credential_batch_bad_request(self):
+        mock = async_mock.MagicMock()
+        mock.json = async_mock.CoroutineMock(return_value={})
+        mock.app = {
+            "request_context": RequestContext(),
+            "outbound_message_router": async_mock.CoroutineMock(),
+        }
+        with self.assertRaises(aio_web.HTTPBadRequest):
+            await test_module.issue_credential_batch(mock)
+
+    async def test_batch_error_reason(self):
+        assert (
+            test_module.batch_error_reason(aio_web.HTTPNotFound(reason="gone"))
+            == "gone"
+        )
+        assert test_module.batch_error_reason(RuntimeError("boom")) == "boom"
+        assert test_module.batch_error_reason(KeyError()) == "KeyError"
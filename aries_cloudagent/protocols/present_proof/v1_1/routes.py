@@ -10,7 +10,7 @@ from aiohttp_apispec import (
     querystring_schema,
     request_schema,
 )
-from marshmallow import fields
+from marshmallow import fields, validate
 from ....connections.models.connection_record import ConnectionRecord
 from ....holder.base import BaseHolder, HolderError
 from .models.presentation_exchange import THCFPresentationExchange
@@ -22,10 +22,12 @@ from .models.utils import retrieve_exchange
 import logging
 from aries_cloudagent.pdstorage_thcf.api import (
     load_multiple,
+    pds_get_active_name,
     pds_link_dri,
     pds_get_usage_policy_if_active_pds_supports_it,
 )
 from aries_cloudagent.holder.pds import CREDENTIALS_TABLE
+from aries_cloudagent.holder.models.credential_index import CredentialIndexRecord
 from aries_cloudagent.pdstorage_thcf.error import PDSError
 from aries_cloudagent.protocols.issue_credential.v1_1.routes import (
     routes_get_public_did,
@@ -59,6 +61,16 @@ class RetrieveExchangeQuerySchema(OpenAPISchema):
     initiator = fields.Str(required=False)
     role = fields.Str(required=False)
     state = fields.Str(required=False)
+    offset = fields.Int(
+        required=False,
+        description="Number of records to skip",
+        validate=validate.Range(min=0),
+    )
+    limit = fields.Int(
+        required=False,
+        description="Maximum number of records",
+        validate=validate.Range(min=0),
+    )
 
 
 class AcknowledgeProofSchema(OpenAPISchema):
@@ -283,7 +295,25 @@ async def verify_usage_policy(controller_usage_policy, subject_usage_policy):
 async def retrieve_credential_exchange_api(request: web.BaseRequest):
     context = request.app["request_context"]
 
-    records = await THCFPresentationExchange.query(context, tag_filter=request.query)
+    tag_filter = {
+        key: value
+        for key, value in request.query.items()
+        if key not in ("offset", "limit")
+    }
+    try:
+        offset = int(request.query.get("offset", 0))
+        limit = int(request.query.get("limit", 0))
+    except ValueError:
+        raise web.HTTPBadRequest(reason="offset and limit must be integers")
+    if offset < 0 or limit < 0:
+        raise web.HTTPBadRequest(reason="offset and limit must not be negative")
+
+    records = await THCFPresentationExchange.query(context, tag_filter=tag_filter)
+    records.sort(key=lambda record: (record.created_at or "", record._id))
+    total = len(records)
+    records = records[offset:]
+    if limit:
+        records = records[:limit]
     usage_policy = await pds_get_usage_policy_if_active_pds_supports_it(context)
 
     result = []
@@ -298,43 +328,52 @@ async def retrieve_credential_exchange_api(request: web.BaseRequest):
         result.append(serialize)
 
     """
-    Download credentials
+    Index credentials stored before the credential index existed
     """
 
     try:
-        credentials = await load_multiple(context, table=CREDENTIALS_TABLE)
-    except json.JSONDecodeError:
-        LOGGER.warn(
-            "Error parsing credentials, perhaps there are no credentials in store %s",
-        )
-        credentials = {}
+        pds_name = await pds_get_active_name(context)
     except PDSError as err:
         LOGGER.warn("PDSError %s", err.roll_up)
-        credentials = {}
+        pds_name = None
+
+    if pds_name and not await CredentialIndexRecord.is_built(context, pds_name):
+        try:
+            credentials = await load_multiple(context, table=CREDENTIALS_TABLE)
+        except json.JSONDecodeError:
+            LOGGER.warn(
+                "Error parsing credentials, perhaps there are no credentials in store",
+            )
+            credentials = []
+        except PDSError as err:
+            LOGGER.warn("PDSError %s", err.roll_up)
+            credentials = None
+        if credentials is not None:
+            await CredentialIndexRecord.index_credentials(
+                context, credentials, pds_name
+            )
 
     """
     Match the credential requests with credentials in the possesion of the agent
-    in this case we check if both issuer_did and oca_schema_dri are correct
+    in this case we check if oca_schema_dri and, if requested, issuer_did are
+    correct
     """
 
+    matches = {}
     for rec in result:
-        rec["list_of_matching_credentials"] = []
-        for cred in credentials:
-            try:
-                cred_content = json.loads(cred["content"])
-            except (json.JSONDecodeError, TypeError):
-                cred_content = cred["content"]
-
-            record_base_dri = rec["presentation_request"].get(
-                "schema_base_dri", "INVALIDA"
-            )
-            cred_base_dri = cred_content["credentialSubject"].get(
-                "oca_schema_dri", "INVALIDC"
-            )
-            if record_base_dri == cred_base_dri:
-                rec["list_of_matching_credentials"].append(cred["dri"])
+        presentation_request = rec.get("presentation_request") or {}
+        key = (
+            presentation_request.get("schema_base_dri"),
+            presentation_request.get("issuer_did"),
+        )
+        if key[0] is None:
+            rec["list_of_matching_credentials"] = []
+            continue
+        if key not in matches:
+            matches[key] = await CredentialIndexRecord.retrieve_dris(context, *key)
+        rec["list_of_matching_credentials"] = matches[key]
 
-    return web.json_response({"success": True, "result": result})
+    return web.json_response({"success": True, "result": result, "total": total})
 
 
 async def register(app: web.Application):
@@ -426,4 +465,4 @@ async def test_usage_policy():
     print(usage, msg)
 
 
-run_standalone_async(__name__, test_usage_policy)
\ No newline at end of file
+run_standalone_async(__name__, test_usage_policy)
@@ -10,7 +10,7 @@ from .....messaging.base_handler import (
 )
 from .....protocols.connections.v1_0.manager import ConnectionManager
 from ..manager import RoutingManager, RoutingManagerError
-from ..messages.forward import Forward
+from ..messages.forward import Forward, raw_forward_msg
 
 
 class ForwardHandler(BaseHandler):
@@ -27,8 +27,12 @@ class ForwardHandler(BaseHandler):
             "Received forward for: %s", context.message_receipt.recipient_verkey
         )
 
-        packed = context.message.msg
-        packed = json.dumps(packed).encode("ascii")
+        # pass on the inner message as received when possible
+        packed = raw_forward_msg(context.message_receipt.raw_message)
+        if packed:
+            packed = packed.encode("utf-8")
+        else:
+            packed = json.dumps(context.message.msg).encode("ascii")
         rt_mgr = RoutingManager(context)
         target = context.message.to
 
@@ -38,11 +42,14 @@ class ForwardHandler(BaseHandler):
             self._logger.exception("Error resolving recipient for forwarded message")
             return
 
-        # load connection
-        connection_mgr = ConnectionManager(context)
-        connection_targets = await connection_mgr.get_connection_targets(
-            connection_id=recipient.connection_id
-        )
+        connection_targets = await rt_mgr.get_recipient_targets(target)
+        if not connection_targets:
+            # load connection
+            connection_mgr = ConnectionManager(context)
+            connection_targets = await connection_mgr.get_connection_targets(
+                connection_id=recipient.connection_id
+            )
+            await rt_mgr.set_recipient_targets(target, connection_targets)
         # TODO: validate that there is 1 target, with 1 verkey. warn otherwise
         connection_verkey = connection_targets[0].recipient_keys[0]
 
@@ -56,14 +56,54 @@ class TestForwardHandler(AsyncTestCase):
                 )
             )
 
+            mock_mgr.return_value.get_recipient_targets = async_mock.CoroutineMock(
+                return_value=None
+            )
+            mock_mgr.return_value.set_recipient_targets = async_mock.CoroutineMock()
+
             await handler.handle(self.context, responder)
 
+            mock_mgr.return_value.set_recipient_targets.assert_awaited_once_with(
+                "sample-did",
+                mock_connection_mgr.return_value.get_connection_targets.return_value,
+            )
             messages = responder.messages
             assert len(messages) == 1
             (result, target) = messages[0]
             assert json.loads(result) == self.context.message.msg
             assert target["connection_id"] == "dummy"
 
+    async def test_handle_raw_indexed(self):
+        raw_msg = '{"protected": "e30=", "ciphertext": "YWJj"}'
+        self.context.message_receipt = MessageReceipt(
+            recipient_verkey=TEST_VERKEY,
+            raw_message=f'{{"to": "sample-did", "msg": {raw_msg}}}',
+        )
+        handler = test_module.ForwardHandler()
+        targets = [ConnectionTarget(recipient_keys=["recip_key"])]
+
+        responder = MockResponder()
+        with async_mock.patch.object(
+            test_module, "RoutingManager", autospec=True
+        ) as mock_mgr, async_mock.patch.object(
+            test_module, "ConnectionManager", autospec=True
+        ) as mock_connection_mgr:
+            mock_mgr.return_value.get_recipient = async_mock.CoroutineMock(
+                return_value=RouteRecord(connection_id="dummy")
+            )
+            mock_mgr.return_value.get_recipient_targets = async_mock.CoroutineMock(
+                return_value=targets
+            )
+
+            await handler.handle(self.context, responder)
+
+            mock_connection_mgr.assert_not_called()
+            messages = responder.messages
+            assert len(messages) == 1
+            (result, target) = messages[0]
+            assert result == raw_msg.encode("utf-8")
+            assert target["target_list"] is targets
+
     async def test_handle_receipt_no_recipient_verkey(self):
         self.context.message_receipt = MessageReceipt()
         handler = test_module.ForwardHandler()
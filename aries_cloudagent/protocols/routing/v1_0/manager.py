@@ -4,6 +4,7 @@ import json
 from typing import Sequence
 
 from ....config.injection_context import InjectionContext
+from ....connections.models.connection_target import ConnectionTarget
 from ....core.error import BaseError
 from ....messaging.util import time_now
 from ....storage.base import BaseStorage, StorageRecord
@@ -17,6 +18,7 @@ from .messages.route_update_request import RouteUpdateRequest
 from .models.route_record import RouteRecord
 from .models.route_update import RouteUpdate
 from .models.route_updated import RouteUpdated
+from .route_index import RouteIndex
 
 
 class RoutingManagerError(BaseError):
@@ -54,6 +56,36 @@ class RoutingManager:
         """
         return self._context
 
+    async def route_index(self) -> RouteIndex:
+        """
+        Get the index of the forward routes, loading it on first use.
+
+        Returns:
+            The loaded `RouteIndex`, or None if it is not enabled
+
+        """
+        index: RouteIndex = await self._context.inject(RouteIndex, required=False)
+        if index and not index.loaded:
+            async with index.lock:
+                if not index.loaded:
+                    index.load(await self.get_routes())
+        return index
+
+    async def get_recipient_targets(
+        self, recip_verkey: str
+    ) -> Sequence[ConnectionTarget]:
+        """Find the indexed connection targets of a route, if they are known."""
+        index = await self.route_index()
+        return index and index.get_targets(recip_verkey)
+
+    async def set_recipient_targets(
+        self, recip_verkey: str, targets: Sequence[ConnectionTarget]
+    ):
+        """Index the connection targets resolved for a route."""
+        index = await self.route_index()
+        if index:
+            index.set_targets(recip_verkey, targets)
+
     async def get_recipient(self, recip_verkey: str) -> RouteRecord:
         """
         Resolve the recipient for a verkey.
@@ -65,6 +97,13 @@ class RoutingManager:
             The `RouteRecord` associated with this verkey
 
         """
+        index = await self.route_index()
+        if index:
+            route = index.get(recip_verkey)
+            if route:
+                return route
+
+        # not indexed, the route may have been added by another worker process
         storage: BaseStorage = await self._context.inject(BaseStorage)
         try:
             record = await storage.search_records(
@@ -77,13 +116,16 @@ class RoutingManager:
         except StorageNotFoundError:
             raise RouteNotFoundError("No route defined for verkey: %s", recip_verkey)
         value = json.loads(record.value)
-        return RouteRecord(
+        route = RouteRecord(
             record_id=record.id,
             connection_id=record.tags["connection_id"],
             recipient_key=record.tags["recipient_key"],
             created_at=value.get("created_at"),
             updated_at=value.get("updated_at"),
         )
+        if index:
+            index.add(route)
+        return route
 
     async def get_routes(
         self, client_connection_id: str = None, tag_filter: dict = None
@@ -121,7 +163,7 @@ class RoutingManager:
         async for record in storage.search_records(RoutingManager.RECORD_TYPE, filters):
             value = json.loads(record.value)
             value.update(record.tags)
-            results.append(RouteRecord(**value))
+            results.append(RouteRecord(record_id=record.id, **value))
         return results
 
     async def create_route_record(
@@ -148,6 +190,7 @@ class RoutingManager:
             json.dumps(value),
             {"connection_id": client_connection_id, "recipient_key": recipient_key},
         )
+        index = await self.route_index()
         storage: BaseStorage = await self._context.inject(BaseStorage)
         await storage.add_record(record)
         result = RouteRecord(
@@ -157,15 +200,20 @@ class RoutingManager:
             created_at=value["created_at"],
             updated_at=value["updated_at"],
         )
+        if index:
+            index.add(result)
         return result
 
     async def delete_route_record(self, route: RouteRecord):
         """Remove an existing route record."""
         if route and route.record_id:
+            index = await self.route_index()
             storage: BaseStorage = await self._context.inject(BaseStorage)
             await storage.delete_record(
                 StorageRecord(None, None, None, route.record_id)
             )
+            if index:
+                index.remove(route.recipient_key)
 
     async def update_routes(
         self, client_connection_id: str, updates: Sequence[RouteUpdate]
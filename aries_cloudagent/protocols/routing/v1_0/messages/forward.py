@@ -1,7 +1,9 @@
 """Represents a forward message."""
 
 import json
+import re
 
+from json.decoder import scanstring
 from typing import Union
 
 from marshmallow import EXCLUDE, fields, pre_load
@@ -12,6 +14,9 @@ from ..message_types import FORWARD, PROTOCOL_PACKAGE
 
 HANDLER_CLASS = f"{PROTOCOL_PACKAGE}.handlers.forward_handler.ForwardHandler"
 
+_DECODER = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
 
 class Forward(AgentMessage):
     """Represents a request to forward a message to a connected agent."""
@@ -38,6 +43,51 @@ class Forward(AgentMessage):
         self.msg = msg
 
 
+def raw_forward_msg(raw_message: Union[str, bytes]) -> str:
+    """
+    Find the JSON text of the message inside a forward message.
+
+    This lets the inner message be forwarded as it was received, instead of
+    being serialized again.
+
+    Args:
+        raw_message: The JSON text of the forward message
+
+    Returns:
+        The JSON object forwarded in the `msg` member, or None if it cannot be
+        found as an object
+
+    """
+    if not raw_message:
+        return None
+    try:
+        if isinstance(raw_message, bytes):
+            raw_message = raw_message.decode("utf-8")
+        idx = _WHITESPACE.match(raw_message).end()
+        if not raw_message.startswith("{", idx):
+            return None
+        found = None
+        while True:
+            idx = _WHITESPACE.match(raw_message, idx + 1).end()
+            if not raw_message.startswith('"', idx):
+                return None
+            name, idx = scanstring(raw_message, idx + 1)
+            idx = _WHITESPACE.match(raw_message, idx).end()
+            if not raw_message.startswith(":", idx):
+                return None
+            idx = _WHITESPACE.match(raw_message, idx + 1).end()
+            _, end = _DECODER.raw_decode(raw_message, idx)
+            if name == "msg":
+                # a later duplicate wins, as when parsing the message
+                found = raw_message[idx:end] if raw_message[idx] == "{" else None
+            idx = _WHITESPACE.match(raw_message, end).end()
+            if not raw_message.startswith(",", idx):
+                break
+        return found if raw_message.startswith("}", idx) else None
+    except ValueError:  # includes JSON and unicode decoding errors
+        return None
+
+
 class ForwardSchema(AgentMessageSchema):
     """Forward message schema used in serialization/deserialization."""
 
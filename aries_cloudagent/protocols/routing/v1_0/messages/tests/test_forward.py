@@ -1,6 +1,6 @@
 import json
 
-from ..forward import Forward, ForwardSchema
+from ..forward import Forward, ForwardSchema, raw_forward_msg
 from ...message_types import FORWARD, PROTOCOL_PACKAGE
 
 from unittest import mock, TestCase
@@ -54,3 +54,27 @@ class TestForwardSchema(TestCase):
         assert {"msg": MSG} == ForwardSchema().handle_str_message(
             data={"msg": json.dumps(MSG)}
         )
+
+
+class TestRawForwardMsg(TestCase):
+    def test_raw_msg(self):
+        inner = '{"protected": "e30=",  "ciphertext": "YWJj", "iv": "\\u0041"}'
+        raw = f'{{"@type": "{FORWARD}", "to": "to", "msg" : {inner} }}'
+        assert raw_forward_msg(raw) == inner
+        assert raw_forward_msg(raw.encode("utf-8")) == inner
+        assert json.loads(raw_forward_msg(raw)) == json.loads(raw)["msg"]
+
+        message = Forward(to="to", msg={"some": ["msg", {"msg": "nested"}]})
+        raw = message.to_json()
+        assert json.loads(raw_forward_msg(raw)) == message.msg
+
+    def test_raw_msg_none(self):
+        assert raw_forward_msg(None) is None
+        assert raw_forward_msg("") is None
+        assert raw_forward_msg("[]") is None
+        assert raw_forward_msg("{}") is None
+        assert raw_forward_msg('{"to": "to"}') is None
+        assert raw_forward_msg('{"msg": "{}"}') is None
+        assert raw_forward_msg('{"msg": {"a": 1}, "to"}') is None
+        assert raw_forward_msg('{"msg": {"a": 1}') is None
+        assert raw_forward_msg(b"\xff") is None
@@ -0,0 +1,86 @@
+"""In-memory index of the forward routes of a mediator."""
+
+import asyncio
+import time
+
+from typing import Iterable, Sequence
+
+from ....connections.models.connection_target import ConnectionTarget
+
+from .models.route_record import RouteRecord
+
+
+class RouteIndexEntry:
+    """A route with the connection targets it forwards to, once resolved."""
+
+    __slots__ = ("route", "targets", "targets_expiry")
+
+    def __init__(self, route: RouteRecord):
+        """Initialize the entry."""
+        self.route = route
+        self.targets: Sequence[ConnectionTarget] = None
+        self.targets_expiry: float = None
+
+
+class RouteIndex:
+    """
+    Routes by recipient key, loaded from storage once.
+
+    The routing manager keeps the index in sync as it creates and deletes route
+    records, so resolving the recipient of a forward message needs no storage
+    search. The connection targets of each route are kept for `TARGETS_TTL`
+    seconds, the same time as in the shared connection target cache.
+    """
+
+    TARGETS_TTL = 3600
+
+    def __init__(self, targets_ttl: float = None):
+        """Initialize the route index."""
+        self.loaded = False
+        self.targets_ttl = self.TARGETS_TTL if targets_ttl is None else targets_ttl
+        self._lock: asyncio.Lock = None
+        self._routes = {}
+
+    @property
+    def lock(self) -> asyncio.Lock:
+        """Accessor for the lock held while loading the index."""
+        if not self._lock:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    @property
+    def count(self) -> int:
+        """Accessor for the number of indexed routes."""
+        return len(self._routes)
+
+    def load(self, routes: Iterable[RouteRecord]):
+        """Replace the indexed routes with the ones found in storage."""
+        self._routes = {route.recipient_key: RouteIndexEntry(route) for route in routes}
+        self.loaded = True
+
+    def get(self, recipient_key: str) -> RouteRecord:
+        """Find the route of a recipient key, if it is indexed."""
+        entry = self._routes.get(recipient_key)
+        return entry and entry.route
+
+    def add(self, route: RouteRecord):
+        """Index a new route."""
+        self._routes[route.recipient_key] = RouteIndexEntry(route)
+
+    def remove(self, recipient_key: str):
+        """Remove the route of a recipient key."""
+        self._routes.pop(recipient_key, None)
+
+    def get_targets(self, recipient_key: str) -> Sequence[ConnectionTarget]:
+        """Find the connection targets of a route, unless they have expired."""
+        entry = self._routes.get(recipient_key)
+        if entry and entry.targets and entry.targets_expiry > time.perf_counter():
+            return entry.targets
+        return None
+
+    def set_targets(self, recipient_key: str, targets: Sequence[ConnectionTarget]):
+        """Keep the connection targets resolved for a route."""
+        entry = self._routes.get(recipient_key)
+        if entry:
+            entry.targets = targets
+            entry.targets_expiry = time.perf_counter() + self.targets_ttl
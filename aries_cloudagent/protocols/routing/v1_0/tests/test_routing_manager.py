@@ -2,8 +2,9 @@ from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
 from aries_cloudagent.config.injection_context import InjectionContext
+from aries_cloudagent.connections.models.connection_target import ConnectionTarget
 from aries_cloudagent.messaging.request_context import RequestContext
-from aries_cloudagent.storage.base import BaseStorage
+from aries_cloudagent.storage.base import BaseStorage, StorageRecord
 from aries_cloudagent.storage.basic import BasicStorage
 from aries_cloudagent.storage.error import (
     StorageDuplicateError,
@@ -16,6 +17,7 @@ from ..manager import RoutingManager, RoutingManagerError, RouteNotFoundError
 from ..models.route_record import RouteRecord
 from ..models.route_update import RouteUpdate
 from ..models.route_updated import RouteUpdated
+from ..route_index import RouteIndex
 
 TEST_CONN_ID = "conn-id"
 TEST_VERKEY = "3Dn1SJNPaCXcvvJvSbsFWP2xaCjMom3can8CQNhWrTRx"
@@ -278,3 +280,75 @@ class TestRoutingManager(AsyncTestCase):
             outbound_handler=mock_outbound_handler,
         )
         mock_outbound_handler.assert_called_once()
+
+
+class TestRoutingManagerIndex(AsyncTestCase):
+    async def setUp(self):
+        self.context = InjectionContext(enforce_typing=False)
+        self.storage = BasicStorage()
+        self.context.injector.bind_instance(BaseStorage, self.storage)
+        self.index = RouteIndex()
+        self.context.injector.bind_instance(RouteIndex, self.index)
+        self.manager = RoutingManager(self.context)
+
+    async def test_load(self):
+        await self.storage.add_record(
+            StorageRecord(
+                RoutingManager.RECORD_TYPE,
+                "{}",
+                {"connection_id": TEST_CONN_ID, "recipient_key": TEST_ROUTE_VERKEY},
+            )
+        )
+        assert await self.manager.route_index() is self.index
+        assert self.index.loaded and self.index.count == 1
+
+        with async_mock.patch.object(
+            self.storage, "search_records", async_mock.MagicMock()
+        ) as mock_search:
+            record = await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+            mock_search.assert_not_called()
+        assert record.connection_id == TEST_CONN_ID
+        assert record.record_id
+
+    async def test_create_delete(self):
+        record = await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
+        assert self.index.get(TEST_ROUTE_VERKEY) is record
+
+        results = await self.manager.update_routes(
+            client_connection_id=TEST_CONN_ID,
+            updates=[
+                RouteUpdate(
+                    recipient_key=TEST_ROUTE_VERKEY, action=RouteUpdate.ACTION_DELETE
+                )
+            ],
+        )
+        assert results[0].result == RouteUpdated.RESULT_SUCCESS
+        assert self.index.get(TEST_ROUTE_VERKEY) is None
+        assert not await self.manager.get_routes()
+        with self.assertRaises(RouteNotFoundError):
+            await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+
+    async def test_get_recipient_not_indexed(self):
+        await self.manager.route_index()
+        # added by another process
+        await RoutingManager(self.context).create_route_record(
+            TEST_CONN_ID, TEST_ROUTE_VERKEY
+        )
+        self.index.remove(TEST_ROUTE_VERKEY)
+
+        record = await self.manager.get_recipient(TEST_ROUTE_VERKEY)
+        assert record.connection_id == TEST_CONN_ID
+        assert self.index.get(TEST_ROUTE_VERKEY) is record
+
+    async def test_recipient_targets(self):
+        assert await RoutingManager(InjectionContext()).route_index() is None
+        await self.manager.create_route_record(TEST_CONN_ID, TEST_ROUTE_VERKEY)
+        targets = [ConnectionTarget(recipient_keys=[TEST_VERKEY])]
+
+        assert not await self.manager.get_recipient_targets(TEST_ROUTE_VERKEY)
+        await self.manager.set_recipient_targets(TEST_ROUTE_VERKEY, targets)
+        assert await self.manager.get_recipient_targets(TEST_ROUTE_VERKEY) is targets
+
+        self.index.targets_ttl = -1
+        await self.manager.set_recipient_targets(TEST_ROUTE_VERKEY, targets)
+        assert not await self.manager.get_recipient_targets(TEST_ROUTE_VERKEY)
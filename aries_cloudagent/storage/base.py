@@ -1,14 +1,23 @@
 """Abstract base classes for non-secrets storage."""
 
+import logging
+
 from abc import ABC, abstractmethod
-from typing import Mapping, Sequence
+from collections import OrderedDict
+from typing import Mapping, Sequence, Tuple
 
-from .error import StorageDuplicateError, StorageNotFoundError
+from .error import StorageDuplicateError, StorageError, StorageNotFoundError
 from .record import StorageRecord
 
 
 DEFAULT_PAGE_SIZE = 100
 
+OP_ADD = "add"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+
+LOGGER = logging.getLogger(__name__)
+
 
 class BaseStorage(ABC):
     """Abstract Non-Secrets interface."""
@@ -62,6 +71,19 @@ class BaseStorage(ABC):
 
         """
 
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags in one write.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: New tags
+
+        """
+        await self.update_record_value(record, value)
+        await self.update_record_tags(record, tags)
+
     @abstractmethod
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
@@ -85,6 +107,89 @@ class BaseStorage(ABC):
 
         """
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store.
+
+        Args:
+            records: The `StorageRecord`s to be stored
+
+        """
+        for record in records:
+            await self.add_record(record)
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Replace the value and tags of several existing records.
+
+        Args:
+            records: The `StorageRecord`s to update, with their new values and tags
+
+        """
+        for record in records:
+            await self.update_record(record, record.value, record.tags)
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records.
+
+        Args:
+            records: The `StorageRecord`s to delete
+
+        """
+        for record in records:
+            await self.delete_record(record)
+
+    def transaction(self) -> "StorageTransaction":
+        """
+        Start a unit of work, committed when its context manager exits.
+
+        Returns:
+            A new `StorageTransaction`
+
+        """
+        return StorageTransaction(self)
+
+    async def apply_operations(self, operations: Sequence[Tuple[str, StorageRecord]]):
+        """
+        Apply the writes of a transaction, all of them or none.
+
+        Records are read before they are updated or deleted, and the writes
+        already applied are reverted if a later one fails.
+
+        Args:
+            operations: The `(operation, record)` pairs to apply, in order
+
+        """
+        applied = []
+        try:
+            for operation, record in operations:
+                if operation == OP_ADD:
+                    await self.add_record(record)
+                    applied.append((OP_DELETE, record))
+                    continue
+                previous = await self.get_record(record.type, record.id)
+                if operation == OP_UPDATE:
+                    await self.update_record(record, record.value, record.tags)
+                    applied.append((OP_UPDATE, previous))
+                else:
+                    await self.delete_record(record)
+                    applied.append((OP_ADD, previous))
+        except Exception:
+            for operation, record in reversed(applied):
+                try:
+                    if operation == OP_ADD:
+                        await self.add_record(record)
+                    elif operation == OP_UPDATE:
+                        await self.update_record(record, record.value, record.tags)
+                    else:
+                        await self.delete_record(record)
+                except StorageError:
+                    LOGGER.exception(
+                        "Error reverting %s of record: %s", operation, record.id
+                    )
+            raise
+
     @abstractmethod
     def search_records(
         self,
@@ -112,6 +217,119 @@ class BaseStorage(ABC):
         return "<{}>".format(self.__class__.__name__)
 
 
+class StorageTransaction:
+    """
+    Storage writes collected and committed together.
+
+    Used as an async context manager, the writes are committed when the block
+    exits without an error and discarded otherwise. Several writes to the same
+    record are merged, so each record is written at most once.
+    """
+
+    def __init__(self, store: BaseStorage):
+        """
+        Initialize a `StorageTransaction` instance.
+
+        Args:
+            store: `BaseStorage` to commit the writes to
+
+        """
+        self._operations = OrderedDict()
+        self._store = store
+        self.committed = False
+
+    @property
+    def store(self) -> BaseStorage:
+        """Accessor for the `BaseStorage` the writes are committed to."""
+        return self._store
+
+    @property
+    def operations(self) -> Sequence[Tuple[str, StorageRecord]]:
+        """Accessor for the `(operation, record)` pairs to be committed."""
+        return list(self._operations.values())
+
+    def _stage(self, operation: str, record: StorageRecord):
+        """Merge a write with the earlier writes to the same record."""
+        if not record:
+            raise StorageError("No record provided")
+        if not record.id:
+            raise StorageError("Record has no ID")
+        if self.committed:
+            raise StorageError("Transaction already committed")
+        previous = self._operations.get(record.id)
+        if previous:
+            if operation == OP_ADD and previous[0] != OP_DELETE:
+                raise StorageDuplicateError("Duplicate record")
+            if operation != OP_ADD and previous[0] == OP_DELETE:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+            if previous[0] == OP_ADD:
+                if operation == OP_DELETE:
+                    del self._operations[record.id]
+                    return
+                operation = OP_ADD
+            elif previous[0] == OP_DELETE:
+                operation = OP_UPDATE
+        self._operations[record.id] = (operation, record)
+
+    async def add_record(self, record: StorageRecord):
+        """
+        Add a new record to the store on commit.
+
+        Args:
+            record: `StorageRecord` to be stored
+
+        """
+        self._stage(OP_ADD, record)
+
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags on commit.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: New tags
+
+        """
+        self._stage(OP_UPDATE, record and record._replace(value=value, tags=tags))
+
+    async def delete_record(self, record: StorageRecord):
+        """
+        Delete an existing record on commit.
+
+        Args:
+            record: `StorageRecord` to delete
+
+        """
+        self._stage(OP_DELETE, record)
+
+    async def commit(self):
+        """Apply the collected writes to the store."""
+        if self.committed:
+            raise StorageError("Transaction already committed")
+        self.committed = True
+        await self._store.apply_operations(self.operations)
+
+    def rollback(self):
+        """Discard the collected writes."""
+        self._operations.clear()
+
+    async def __aenter__(self):
+        """Context manager enter."""
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        """Context manager exit."""
+        if exc_type or self.committed:
+            self.rollback()
+        else:
+            await self.commit()
+
+    def __repr__(self) -> str:
+        """Human readable representation of `StorageTransaction`."""
+        return "<{}>".format(self.__class__.__name__)
+
+
 class BaseStorageRecordSearch(ABC):
     """Represent an active stored records search."""
 
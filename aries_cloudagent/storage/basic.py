@@ -1,9 +1,9 @@
 """Basic in-memory storage implementation (non-wallet)."""
 
 from collections import OrderedDict
-from typing import Mapping, Sequence
+from typing import Mapping, Sequence, Tuple
 
-from .base import BaseStorage, BaseStorageRecordSearch
+from .base import OP_ADD, OP_DELETE, OP_UPDATE, BaseStorage, BaseStorageRecordSearch
 from .error import (
     StorageError,
     StorageDuplicateError,
@@ -105,6 +105,24 @@ class BasicStorage(BaseStorage):
             raise StorageNotFoundError("Record not found: {}".format(record.id))
         self._records[record.id] = oldrec._replace(tags=dict(tags or {}))
 
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags in one write.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: New tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+
+        """
+        oldrec = self._records.get(record.id)
+        if not oldrec:
+            raise StorageNotFoundError("Record not found: {}".format(record.id))
+        self._records[record.id] = oldrec._replace(value=value, tags=dict(tags or {}))
+
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
     ):
@@ -144,6 +162,76 @@ class BasicStorage(BaseStorage):
             raise StorageNotFoundError("Record not found: {}".format(record.id))
         del self._records[record.id]
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store, all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to be stored
+
+        """
+        await self.apply_operations([(OP_ADD, record) for record in records])
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Replace the value and tags of several existing records, all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to update, with their new values and tags
+
+        """
+        await self.apply_operations([(OP_UPDATE, record) for record in records])
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records, all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to delete
+
+        """
+        await self.apply_operations([(OP_DELETE, record) for record in records])
+
+    async def apply_operations(self, operations: Sequence[Tuple[str, StorageRecord]]):
+        """
+        Apply the writes of a transaction, all of them or none.
+
+        Every write is checked before the first one is applied.
+
+        Args:
+            operations: The `(operation, record)` pairs to apply, in order
+
+        Raises:
+            StorageError: If a record or its ID is missing
+            StorageDuplicateError: If an added record already exists
+            StorageNotFoundError: If an updated or deleted record is not found
+
+        """
+        pending = {}
+        for operation, record in operations:
+            if not record:
+                raise StorageError("No record provided")
+            if not record.id:
+                raise StorageError("Record has no ID")
+            oldrec = pending.get(record.id, self._records.get(record.id))
+            if operation == OP_ADD:
+                if oldrec:
+                    raise StorageDuplicateError("Duplicate record")
+                pending[record.id] = record
+            elif not oldrec:
+                raise StorageNotFoundError("Record not found: {}".format(record.id))
+            elif operation == OP_UPDATE:
+                pending[record.id] = oldrec._replace(
+                    value=record.value, tags=dict(record.tags or {})
+                )
+            else:
+                pending[record.id] = None
+        for record_id, record in pending.items():
+            if record:
+                self._records[record_id] = record
+            else:
+                self._records.pop(record_id, None)
+
     def search_records(
         self,
         type_filter: str,
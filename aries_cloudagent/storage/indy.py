@@ -1,5 +1,6 @@
 """Indy implementation of BaseStorage interface."""
 
+import asyncio
 import json
 from typing import Mapping, Sequence
 
@@ -14,6 +15,7 @@ from .error import (
     StorageSearchError,
 )
 from .record import StorageRecord
+from ..utils.task_queue import gather_bounded
 from ..wallet.indy import IndyWallet
 
 
@@ -31,6 +33,8 @@ def _validate_record(record: StorageRecord):
 class IndyStorage(BaseStorage):
     """Indy Non-Secrets interface."""
 
+    BATCH_LIMIT = 50
+
     def __init__(self, wallet: IndyWallet):
         """
         Initialize a `BasicStorage` instance.
@@ -166,6 +170,28 @@ class IndyStorage(BaseStorage):
                 raise StorageNotFoundError(f"Record not found: {record.id}")
             raise StorageError(str(x_indy))
 
+    async def update_record(self, record: StorageRecord, value: str, tags: Mapping):
+        """
+        Update an existing stored record's value and tags.
+
+        The non-secrets API has no single call for both, so the two wallet
+        calls are issued together rather than one after the other.
+
+        Args:
+            record: `StorageRecord` to update
+            value: The new value
+            tags: New tags
+
+        Raises:
+            StorageNotFoundError: If record not found
+            StorageError: If a libindy error occurs
+
+        """
+        await asyncio.gather(
+            self.update_record_value(record, value),
+            self.update_record_tags(record, tags),
+        )
+
     async def delete_record_tags(
         self, record: StorageRecord, tags: (Sequence, Mapping)
     ):
@@ -209,6 +235,55 @@ class IndyStorage(BaseStorage):
                 raise StorageNotFoundError(f"Record not found: {record.id}")
             raise StorageError(str(x_indy))
 
+    async def add_records(self, records: Sequence[StorageRecord]):
+        """
+        Add several new records to the store.
+
+        The wallet calls are issued concurrently, and records after a failed
+        one may still be added: use a transaction to add all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to be stored
+
+        """
+        await gather_bounded(
+            (self.add_record(record) for record in records), self.BATCH_LIMIT
+        )
+
+    async def update_records(self, records: Sequence[StorageRecord]):
+        """
+        Replace the value and tags of several existing records.
+
+        The wallet calls are issued concurrently, and records after a failed
+        one may still be updated: use a transaction to update all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to update, with their new values and tags
+
+        """
+        await gather_bounded(
+            (
+                self.update_record(record, record.value, record.tags)
+                for record in records
+            ),
+            self.BATCH_LIMIT,
+        )
+
+    async def delete_records(self, records: Sequence[StorageRecord]):
+        """
+        Delete several existing records.
+
+        The wallet calls are issued concurrently, and records after a failed
+        one may still be deleted: use a transaction to delete all of them or none.
+
+        Args:
+            records: The `StorageRecord`s to delete
+
+        """
+        await gather_bounded(
+            (self.delete_record(record) for record in records), self.BATCH_LIMIT
+        )
+
     def search_records(
         self,
         type_filter: str,
@@ -9,6 +9,7 @@ from aries_cloudagent.storage.error import (
     StorageSearchError,
 )
 
+from aries_cloudagent.storage.base import OP_ADD, OP_DELETE, OP_UPDATE, BaseStorage
 from aries_cloudagent.storage.indy import IndyStorageRecordSearch
 from aries_cloudagent.storage.basic import (
     BasicStorage,
@@ -112,6 +113,85 @@ class TestBasicStorage:
         with pytest.raises(StorageNotFoundError):
             await store.update_record_tags(missing, {})
 
+    @pytest.mark.asyncio
+    async def test_update_record(self, store):
+        record = test_record({"a": "A"})
+        await store.add_record(record)
+        await store.update_record(record, "UPDATED", {"b": "B"})
+        result = await store.get_record(record.type, record.id)
+        assert result.value == "UPDATED"
+        assert result.tags == {"b": "B"}
+
+        missing = test_missing_record()
+        with pytest.raises(StorageNotFoundError):
+            await store.update_record(missing, missing.value, {})
+
+    @pytest.mark.asyncio
+    async def test_batch(self, store):
+        records = [test_record({"a": str(idx)}) for idx in range(3)]
+        await store.add_records(records)
+        for record in records:
+            assert await store.get_record(record.type, record.id)
+
+        updated = [record._replace(value="UPDATED", tags={}) for record in records]
+        await store.update_records(updated)
+        for record in records:
+            result = await store.get_record(record.type, record.id)
+            assert (result.value, result.tags) == ("UPDATED", {})
+
+        await store.delete_records(records)
+        for record in records:
+            with pytest.raises(StorageNotFoundError):
+                await store.get_record(record.type, record.id)
+
+    @pytest.mark.asyncio
+    async def test_transaction(self, store):
+        record = test_record({"a": "A"})
+        removed = test_record()
+        await store.add_record(removed)
+
+        async with store.transaction() as txn:
+            await txn.add_record(record)
+            await txn.update_record(record, "UPDATED", {"b": "B"})
+            await txn.delete_record(removed)
+            with pytest.raises(StorageDuplicateError):
+                await txn.add_record(record)
+            with pytest.raises(StorageNotFoundError):
+                await txn.update_record(removed, "UPDATED", {})
+            assert len(txn.operations) == 2
+            with pytest.raises(StorageNotFoundError):
+                await store.get_record(record.type, record.id)
+
+        assert txn.committed
+        result = await store.get_record(record.type, record.id)
+        assert (result.value, result.tags) == ("UPDATED", {"b": "B"})
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record(removed.type, removed.id)
+
+    @pytest.mark.asyncio
+    async def test_transaction_x(self, store):
+        record = test_record()
+        await store.add_record(record)
+        added = test_record()
+
+        with pytest.raises(ValueError):
+            async with store.transaction() as txn:
+                await txn.add_record(added)
+                raise ValueError()
+        assert not txn.operations
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record(added.type, added.id)
+
+        with pytest.raises(StorageNotFoundError):
+            async with store.transaction() as txn:
+                await txn.add_record(added)
+                await txn.update_record(record, "UPDATED", {"a": "A"})
+                await txn.delete_record(test_missing_record())
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record(added.type, added.id)
+        result = await store.get_record(record.type, record.id)
+        assert (result.value, result.tags) == (record.value, record.tags)
+
     @pytest.mark.asyncio
     async def test_delete_tags(self, store):
         record = test_record({"a": "A"})
@@ -263,3 +343,27 @@ class TestBasicStorage:
         with pytest.raises(StorageSearchError) as excinfo:
             basic_tag_query_match(TAGS, {"a": -1})
         assert "Expected string or dict for filter value" in str(excinfo.value)
+
+    @pytest.mark.asyncio
+    async def test_apply_operations_revert(self, store):
+        updated = test_record({"a": "A"})
+        deleted = test_record()
+        await store.add_records([updated, deleted])
+        added = test_record()
+
+        # the generic implementation, reverting applied writes on error
+        with pytest.raises(StorageNotFoundError):
+            await BaseStorage.apply_operations(
+                store,
+                [
+                    (OP_ADD, added),
+                    (OP_UPDATE, updated._replace(value="UPDATED", tags={})),
+                    (OP_DELETE, deleted),
+                    (OP_UPDATE, test_missing_record()),
+                ],
+            )
+        with pytest.raises(StorageNotFoundError):
+            await store.get_record(added.type, added.id)
+        result = await store.get_record(updated.type, updated.id)
+        assert (result.value, result.tags) == (updated.value, updated.tags)
+        assert await store.get_record(deleted.type, deleted.id)
@@ -7,6 +7,24 @@ class TransportError(BaseError):
     """Base class for all transport errors."""
 
 
+class TransportBusyError(TransportError):
+    """Inbound message rejected, the agent is too busy to accept it."""
+
+    def __init__(
+        self, *args, retry_after: int = None, sender_limited: bool = False, **kwargs
+    ):
+        """
+        Initialize a TransportBusyError instance.
+
+        Args:
+            retry_after: The number of seconds after which to retry
+            sender_limited: The sender, not the agent, is over its limit
+        """
+        super().__init__(*args, **kwargs)
+        self.retry_after = retry_after
+        self.sender_limited = sender_limited
+
+
 class WireFormatError(TransportError):
     """Base class for wire-format errors."""
 
@@ -20,6 +20,7 @@ class BaseInboundTransport(ABC):
         *,
         max_message_size: int = 0,
         wire_format: BaseWireFormat = None,
+        reuse_port: bool = False,
     ):
         """
         Initialize the inbound transport instance.
@@ -27,10 +28,13 @@ class BaseInboundTransport(ABC):
         Args:
             scheme: The transport scheme identifier
             create_session: Method to create a new inbound session
+            reuse_port: Bind with SO_REUSEPORT, sharing the port between
+                worker processes
         """
 
         self._create_session = create_session
         self._max_message_size = max_message_size
+        self._reuse_port = reuse_port
         self._scheme = scheme
         self.wire_format: BaseWireFormat = wire_format
 
@@ -39,6 +43,11 @@ class BaseInboundTransport(ABC):
         """Accessor for this transport's max message size."""
         return self._max_message_size
 
+    @property
+    def reuse_port(self) -> bool:
+        """Accessor for whether the port is shared with other processes."""
+        return self._reuse_port
+
     @property
     def scheme(self):
         """Accessor for this transport's scheme."""
@@ -5,10 +5,22 @@ The delivery queue holds and manages messages that have not yet
 been delivered to their intended destination.
 
 """
+import base64
+import json
+import logging
+import sqlite3
 import time
 
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Iterable, Sequence, Union
+
+from ...connections.models.connection_target import ConnectionTarget
+from ..error import TransportError
 from ..outbound.message import OutboundMessage
 
+LOGGER = logging.getLogger(__name__)
+
 
 class QueuedMessage:
     """
@@ -17,14 +29,25 @@ class QueuedMessage:
     Allows tracking Metadata.
     """
 
-    def __init__(self, msg: OutboundMessage):
+    def __init__(
+        self,
+        msg: OutboundMessage,
+        *,
+        keys: Iterable[str] = (),
+        message_id: int = None,
+        size: int = 0,
+        timestamp: float = None,
+    ):
         """
         Create Wrapper for queued message.
 
         Automatically sets timestamp on create.
         """
+        self.keys = set(keys)
+        self.message_id = message_id
         self.msg = msg
-        self.timestamp = time.time()
+        self.size = size
+        self.timestamp = time.time() if timestamp is None else timestamp
 
     def older_than(self, compare_timestamp: float) -> bool:
         """
@@ -38,6 +61,233 @@ class QueuedMessage:
         return self.timestamp < compare_timestamp
 
 
+def message_size(msg: OutboundMessage) -> int:
+    """Find the number of bytes counted against the queue budgets for a message."""
+    payload = msg.enc_payload or msg.payload
+    if isinstance(payload, (str, bytes)):
+        return len(payload)
+    return len(str(payload))
+
+
+def _encode_payload(payload: Union[str, bytes]):
+    if isinstance(payload, bytes):
+        return {"b64": base64.b64encode(payload).decode("ascii")}
+    return payload
+
+
+def _decode_payload(payload) -> Union[str, bytes]:
+    if isinstance(payload, dict):
+        return base64.b64decode(payload["b64"])
+    return payload
+
+
+def _encode_target(target: ConnectionTarget) -> dict:
+    return {
+        "did": target.did,
+        "endpoint": target.endpoint,
+        "label": target.label,
+        "recipient_keys": target.recipient_keys,
+        "routing_keys": target.routing_keys,
+        "sender_key": target.sender_key,
+    }
+
+
+def serialize_message(msg: OutboundMessage) -> str:
+    """Convert an outbound message to the JSON kept by the delivery store."""
+    return json.dumps(
+        {
+            "connection_id": msg.connection_id,
+            "enc_payload": _encode_payload(msg.enc_payload),
+            "endpoint": msg._endpoint,
+            "payload": _encode_payload(msg.payload),
+            "reply_session_id": msg.reply_session_id,
+            "reply_thread_id": msg.reply_thread_id,
+            "reply_to_verkey": msg.reply_to_verkey,
+            "reply_from_verkey": msg.reply_from_verkey,
+            "target": msg.target and _encode_target(msg.target),
+            "target_list": [_encode_target(target) for target in msg.target_list],
+            "to_session_only": msg.to_session_only,
+        }
+    )
+
+
+def deserialize_message(value: str) -> OutboundMessage:
+    """Restore an outbound message from the JSON kept by the delivery store."""
+    data = json.loads(value)
+    return OutboundMessage(
+        connection_id=data["connection_id"],
+        enc_payload=_decode_payload(data["enc_payload"]),
+        endpoint=data["endpoint"],
+        payload=_decode_payload(data["payload"]),
+        reply_session_id=data["reply_session_id"],
+        reply_thread_id=data["reply_thread_id"],
+        reply_to_verkey=data["reply_to_verkey"],
+        reply_from_verkey=data["reply_from_verkey"],
+        target=data["target"] and ConnectionTarget(**data["target"]),
+        target_list=[ConnectionTarget(**target) for target in data["target_list"]],
+        to_session_only=data["to_session_only"],
+    )
+
+
+class DeliveryStore:
+    """
+    SQLite file keeping the queued messages across restarts.
+
+    Writes run in order on a dedicated thread, so queueing and delivering
+    messages never waits for the disk on the event loop. Message ids are
+    assigned by the store up front, and the body of a message is kept in
+    memory until it is written.
+    """
+
+    def __init__(self, path: str):
+        """
+        Open the store, creating it if needed.
+
+        Args:
+            path: the database file, which must not be shared between processes
+
+        """
+        self._path = path
+        # message ids to serialized messages not written yet
+        self._unwritten = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="delivery-store"
+        )
+        try:
+            self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS queued_messages (
+                    id INTEGER PRIMARY KEY, timestamp REAL NOT NULL,
+                    size INTEGER NOT NULL, message TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS queued_message_keys (
+                    message_id INTEGER NOT NULL, key TEXT NOT NULL,
+                    PRIMARY KEY (message_id, key)
+                );
+                """
+            )
+            self._next_id = (
+                self._conn.execute("SELECT MAX(id) FROM queued_messages").fetchone()[0]
+                or 0
+            ) + 1
+        except sqlite3.Error as err:
+            raise TransportError(f"Error opening delivery queue store: {err}") from err
+
+    @property
+    def path(self) -> str:
+        """Accessor for the database path."""
+        return self._path
+
+    def load(self) -> Sequence[QueuedMessage]:
+        """Load the queued messages in the order they were added, without bodies."""
+        queued = {
+            row[0]: QueuedMessage(
+                None, message_id=row[0], timestamp=row[1], size=row[2]
+            )
+            for row in self._conn.execute(
+                "SELECT id, timestamp, size FROM queued_messages ORDER BY id"
+            )
+        }
+        for message_id, key in self._conn.execute(
+            "SELECT message_id, key FROM queued_message_keys"
+        ):
+            if message_id in queued:
+                queued[message_id].keys.add(key)
+        return list(queued.values())
+
+    def _submit(self, func, *args) -> Future:
+        """Run a database call on the store thread, logging its errors."""
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._log_error)
+        return future
+
+    def _log_error(self, future: Future):
+        if not future.cancelled() and future.exception():
+            LOGGER.error("Error updating delivery queue store: %s", future.exception())
+
+    def add(self, queued: QueuedMessage) -> Future:
+        """Store a new message and the keys it is queued for."""
+        queued.message_id = self._next_id
+        self._next_id += 1
+        message = serialize_message(queued.msg)
+        self._unwritten[queued.message_id] = message
+        return self._submit(
+            self._add,
+            queued.message_id,
+            queued.timestamp,
+            queued.size,
+            message,
+            list(queued.keys),
+        )
+
+    def _add(
+        self,
+        message_id: int,
+        timestamp: float,
+        size: int,
+        message: str,
+        keys: Sequence[str],
+    ):
+        with self._conn:
+            self._conn.execute(
+                "INSERT INTO queued_messages (id, timestamp, size, message) "
+                "VALUES (?, ?, ?, ?)",
+                (message_id, timestamp, size, message),
+            )
+            self._conn.executemany(
+                "INSERT INTO queued_message_keys (message_id, key) VALUES (?, ?)",
+                ((message_id, key) for key in keys),
+            )
+        # a message failing to be written stays readable from memory
+        self._unwritten.pop(message_id, None)
+
+    def get(self, message_id: int) -> OutboundMessage:
+        """Load the body of a message, after the writes queued before."""
+        message = self._unwritten.get(message_id)
+        if message is None:
+            message = self._executor.submit(self._get, message_id).result()
+        return message and deserialize_message(message)
+
+    def _get(self, message_id: int) -> str:
+        row = self._conn.execute(
+            "SELECT message FROM queued_messages WHERE id = ?", (message_id,)
+        ).fetchone()
+        return row and row[0]
+
+    def remove_key(self, message_id: int, key: str) -> Future:
+        """Stop queueing a message for one of its keys."""
+        return self._submit(self._remove_key, message_id, key)
+
+    def _remove_key(self, message_id: int, key: str):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM queued_message_keys WHERE message_id = ? AND key = ?",
+                (message_id, key),
+            )
+
+    def remove(self, message_id: int) -> Future:
+        """Remove a message."""
+        self._unwritten.pop(message_id, None)
+        return self._submit(self._remove, message_id)
+
+    def _remove(self, message_id: int):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM queued_message_keys WHERE message_id = ?", (message_id,)
+            )
+            self._conn.execute(
+                "DELETE FROM queued_messages WHERE id = ?", (message_id,)
+            )
+
+    def close(self):
+        """Close the database once the pending writes are done."""
+        self._executor.shutdown(wait=True)
+        self._conn.close()
+
+
 class DeliveryQueue:
     """
     DeliveryQueue class.
@@ -45,15 +295,112 @@ class DeliveryQueue:
     Manages undelivered messages.
     """
 
-    def __init__(self) -> None:
+    DEFAULT_MAX_BYTES = 64 << 20
+    DEFAULT_MAX_BYTES_PER_KEY = 8 << 20
+    DEFAULT_MAX_MEMORY_BYTES = 8 << 20
+
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = None,
+        max_bytes: int = None,
+        max_bytes_per_key: int = None,
+        path: str = None,
+        max_memory_bytes: int = None,
+    ) -> None:
         """
         Initialize an instance of DeliveryQueue.
 
-        This uses an in memory structure to queue messages.
+        Messages are queued in memory, by recipient key in the order they were
+        added. When the queued messages exceed the byte budgets, the oldest
+        ones are dropped. With a store path, messages are also written to disk
+        and survive restarts, and only `max_memory_bytes` of message bodies
+        are held in memory: the others are read back when they are delivered.
+
+        Args:
+            ttl_seconds: the time messages are held before they expire
+            max_bytes: the byte budget of all the queued messages
+            max_bytes_per_key: the byte budget of the messages for each key
+            path: the database file of the on-disk store, if any
+            max_memory_bytes: the bytes of message bodies held in memory,
+                when using the on-disk store
         """
 
         self.queue_by_key = {}
-        self.ttl_seconds = 604800  # one week
+        self.bytes_by_key = {}
+        self.ttl_seconds = ttl_seconds or 604800  # one week
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.max_bytes_per_key = max_bytes_per_key or self.DEFAULT_MAX_BYTES_PER_KEY
+        self.max_memory_bytes = max_memory_bytes or self.DEFAULT_MAX_MEMORY_BYTES
+        self.total_bytes = 0
+        self.memory_bytes = 0
+        self.dropped = 0
+        self.expired = 0
+        # all queued messages in the order they were added, to expire them
+        self._by_time = OrderedDict()
+        self._store = DeliveryStore(path) if path else None
+        if self._store:
+            for queued in self._store.load():
+                if queued.keys:
+                    self._append(queued)
+                else:
+                    self._store.remove(queued.message_id)
+
+    @property
+    def store(self) -> DeliveryStore:
+        """Accessor for the on-disk store, if any."""
+        return self._store
+
+    def _append(self, queued: QueuedMessage):
+        """Add a message to the queues of its keys."""
+        self._by_time[queued] = None
+        self.total_bytes += queued.size
+        if queued.msg:
+            self.memory_bytes += queued.size
+        for key in queued.keys:
+            if key not in self.queue_by_key:
+                self.queue_by_key[key] = deque()
+                self.bytes_by_key[key] = 0
+            self.queue_by_key[key].append(queued)
+            self.bytes_by_key[key] += queued.size
+
+    def _unlink(self, queued: QueuedMessage, key: str):
+        """Account for a message taken out of the queue of one of its keys."""
+        if not self.queue_by_key[key]:
+            del self.queue_by_key[key]
+            del self.bytes_by_key[key]
+        else:
+            self.bytes_by_key[key] -= queued.size
+        queued.keys.discard(key)
+        if queued.keys:
+            if self._store:
+                self._store.remove_key(queued.message_id, key)
+            return
+
+        self.total_bytes -= queued.size
+        if queued.msg:
+            self.memory_bytes -= queued.size
+            queued.msg = None
+        if self._store:
+            self._store.remove(queued.message_id)
+        self._by_time.pop(queued, None)
+
+    def _remove(self, queued: QueuedMessage, key: str):
+        """Take a message out of the queue of one of its keys."""
+        key_queue = self.queue_by_key[key]
+        if key_queue[0] is queued:
+            key_queue.popleft()
+        else:
+            key_queue.remove(queued)
+        self._unlink(queued, key)
+
+    def _body(self, queued: QueuedMessage) -> OutboundMessage:
+        """Get the body of a message, reading it from the store if needed."""
+        if not queued.msg:
+            # held in memory from now on, as it is about to be delivered
+            queued.msg = self._store.get(queued.message_id)
+            self.memory_bytes += queued.size
+        return queued.msg
 
     def expire_messages(self, ttl=None):
         """
@@ -65,12 +412,16 @@ class DeliveryQueue:
 
         ttl_seconds = ttl or self.ttl_seconds
         horizon = time.time() - ttl_seconds
-        for key in self.queue_by_key.keys():
-            self.queue_by_key[key] = [
-                wm for wm in self.queue_by_key[key] if not wm.older_than(horizon)
-            ]
-
-    def add_message(self, msg: OutboundMessage):
+        by_time = self._by_time
+        while by_time:
+            queued = next(iter(by_time))
+            if not queued.older_than(horizon):
+                break
+            for key in list(queued.keys):
+                self._remove(queued, key)
+            self.expired += 1
+
+    def add_message(self, msg: OutboundMessage) -> bool:
         """
         Add an OutboundMessage to delivery queue.
 
@@ -78,17 +429,43 @@ class DeliveryQueue:
 
         Args:
             msg: The OutboundMessage to add
+
+        Returns:
+            True if the message was queued, False if it exceeds the budgets
+
         """
         keys = set()
         if msg.target:
             keys.update(msg.target.recipient_keys)
         if msg.reply_to_verkey:
             keys.add(msg.reply_to_verkey)
-        wrapped_msg = QueuedMessage(msg)
-        for recipient_key in keys:
-            if recipient_key not in self.queue_by_key:
-                self.queue_by_key[recipient_key] = []
-            self.queue_by_key[recipient_key].append(wrapped_msg)
+        if not keys:
+            return False
+        size = message_size(msg)
+        if size > self.max_bytes or size > self.max_bytes_per_key:
+            self.dropped += 1
+            return False
+
+        self.expire_messages()
+        # make room by dropping the oldest messages
+        for key in keys:
+            key_queue = self.queue_by_key.get(key)
+            while key_queue and self.bytes_by_key[key] + size > self.max_bytes_per_key:
+                self._remove(key_queue[0], key)
+                self.dropped += 1
+        while self.total_bytes + size > self.max_bytes:
+            oldest = next(iter(self._by_time))
+            for key in list(oldest.keys):
+                self._remove(oldest, key)
+            self.dropped += 1
+
+        queued = QueuedMessage(msg, keys=keys, size=size)
+        if self._store:
+            self._store.add(queued)
+            if self.memory_bytes + size > self.max_memory_bytes:
+                queued.msg = None
+        self._append(queued)
+        return True
 
     def has_message_for_key(self, key: str):
         """
@@ -97,9 +474,7 @@ class DeliveryQueue:
         Args:
             key: The key to use for lookup
         """
-        if key in self.queue_by_key and len(self.queue_by_key[key]):
-            return True
-        return False
+        return key in self.queue_by_key
 
     def message_count_for_key(self, key: str):
         """
@@ -121,18 +496,24 @@ class DeliveryQueue:
             key: The key to use for lookup
         """
         if key in self.queue_by_key:
-            return self.queue_by_key[key].pop(0).msg
+            queued = self.queue_by_key[key].popleft()
+            msg = self._body(queued)
+            self._unlink(queued, key)
+            return msg
 
     def inspect_all_messages_for_key(self, key: str):
         """
         Return all messages for key.
 
+        Messages may be removed from the queue while iterating.
+
         Args:
             key: The key to use for lookup
         """
         if key in self.queue_by_key:
-            for wrapped_msg in self.queue_by_key[key]:
-                yield wrapped_msg.msg
+            for queued in list(self.queue_by_key[key]):
+                if key in queued.keys:
+                    yield self._body(queued)
 
     def remove_message_for_key(self, key: str, msg: OutboundMessage):
         """
@@ -143,9 +524,27 @@ class DeliveryQueue:
             msg: The message to remove from the queue
         """
         if key in self.queue_by_key:
-            for wrapped_msg in self.queue_by_key[key]:
-                if wrapped_msg.msg == msg:
-                    self.queue_by_key[key].remove(wrapped_msg)
-                    if not self.queue_by_key[key]:
-                        del self.queue_by_key[key]
+            key_queue = self.queue_by_key[key]
+            if key_queue[0].msg is msg:
+                self._remove(key_queue[0], key)
+                return
+            for queued in key_queue:
+                if queued.msg == msg:
+                    self._remove(queued, key)
                     break  # exit processing loop
+
+    def stats(self) -> dict:
+        """Get the sizes and counters of the queue."""
+        return {
+            "keys": len(self.queue_by_key),
+            "total_bytes": self.total_bytes,
+            "memory_bytes": self.memory_bytes,
+            "dropped": self.dropped,
+            "expired": self.expired,
+        }
+
+    def close(self):
+        """Close the on-disk store, if any."""
+        if self._store:
+            self._store.close()
+            self._store = None
@@ -5,6 +5,7 @@ import logging
 from aiohttp import web
 
 from ...messaging.error import MessageParseError
+from ..error import TransportBusyError
 
 from .base import BaseInboundTransport, InboundTransportSetupError
 
@@ -50,7 +51,12 @@ class HttpTransport(BaseInboundTransport):
         app = await self.make_application()
         runner = web.AppRunner(app)
         await runner.setup()
-        self.site = web.TCPSite(runner, host=self.host, port=self.port)
+        self.site = web.TCPSite(
+            runner,
+            host=self.host,
+            port=self.port,
+            reuse_port=self.reuse_port or None,
+        )
         try:
             await self.site.start()
         except OSError:
@@ -93,6 +99,13 @@ class HttpTransport(BaseInboundTransport):
                 inbound = await session.receive(body)
             except MessageParseError:
                 raise web.HTTPBadRequest()
+            except TransportBusyError as e:
+                headers = {}
+                if e.retry_after:
+                    headers["Retry-After"] = str(e.retry_after)
+                if e.sender_limited:
+                    raise web.HTTPTooManyRequests(headers=headers)
+                raise web.HTTPServiceUnavailable(headers=headers)
 
             if inbound.receipt.direct_response_requested:
                 response = await session.wait_response()
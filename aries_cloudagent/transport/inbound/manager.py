@@ -64,7 +64,23 @@ class InboundTransportManager:
 
         # Setup queue for undelivered messages
         if self.context.settings.get("transport.enable_undelivered_queue"):
-            self.undelivered_queue = DeliveryQueue()
+            settings = self.context.settings
+            path = settings.get("transport.undelivered.path")
+            worker_id = settings.get("transport.worker_id")
+            if path and worker_id is not None:
+                # the store cannot be shared between worker processes
+                path = f"{path}.{worker_id}"
+            self.undelivered_queue = DeliveryQueue(
+                ttl_seconds=settings.get_int("transport.undelivered.ttl"),
+                max_bytes=settings.get_int("transport.undelivered.max_bytes"),
+                max_bytes_per_key=settings.get_int(
+                    "transport.undelivered.max_key_bytes"
+                ),
+                path=path,
+                max_memory_bytes=settings.get_int(
+                    "transport.undelivered.max_memory_bytes"
+                ),
+            )
 
         # self.session_limit = asyncio.Semaphore(50)
 
@@ -97,6 +113,7 @@ class InboundTransportManager:
                 config.port,
                 self.create_session,
                 max_message_size=self.max_message_size,
+                reuse_port=bool(self.context.settings.get("transport.reuse_port")),
             ),
             imported_class.__qualname__,
         )
@@ -140,6 +157,8 @@ class InboundTransportManager:
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
+        if self.undelivered_queue:
+            self.undelivered_queue.close()
 
     async def create_session(
         self,
@@ -244,10 +263,14 @@ class InboundTransportManager:
                 for (
                     undelivered_message
                 ) in self.undelivered_queue.inspect_all_messages_for_key(key):
-                    if session.accept_response(undelivered_message):
+                    accepted = session.accept_response(undelivered_message)
+                    if accepted:
                         LOGGER.debug(
                             "Sending previously undelivered message via inbound session"
                         )
                         self.undelivered_queue.remove_message_for_key(
                             key, undelivered_message
                         )
+                    elif accepted.retry:
+                        # the session is busy, leave the rest for later
+                        break
@@ -1,4 +1,8 @@
 import asyncio
+import os
+import sqlite3
+import tempfile
+
 from unittest import mock, TestCase
 
 from asynctest import TestCase as AsyncTestCase
@@ -7,6 +11,8 @@ from asynctest import mock as async_mock
 from ....connections.models.connection_target import ConnectionTarget
 from ....transport.outbound.message import OutboundMessage
 
+from ...error import TransportError
+from .. import delivery_queue as test_module
 from ..delivery_queue import DeliveryQueue
 
 
@@ -64,3 +70,167 @@ class TestDeliveryQueue(AsyncTestCase):
     async def test_count_zero_with_no_items(self):
         queue = DeliveryQueue()
         assert queue.message_count_for_key("aaa") == 0
+
+    async def test_remove_while_inspecting(self):
+        queue = DeliveryQueue()
+
+        t = ConnectionTarget(recipient_keys=["aaa"])
+        msgs = [OutboundMessage(payload=str(i), target=t) for i in range(3)]
+        for msg in msgs:
+            queue.add_message(msg)
+        for msg in queue.inspect_all_messages_for_key("aaa"):
+            queue.remove_message_for_key("aaa", msg)
+        assert queue.has_message_for_key("aaa") is False
+        assert queue.total_bytes == 0
+
+    async def test_multiple_keys(self):
+        queue = DeliveryQueue()
+
+        t = ConnectionTarget(recipient_keys=["aaa", "bbb"])
+        msg = OutboundMessage(payload="x", target=t)
+        queue.add_message(msg)
+        assert queue.get_one_message_for_key("aaa") is msg
+        assert queue.total_bytes == 1
+        assert queue.get_one_message_for_key("bbb") is msg
+        assert queue.total_bytes == 0
+        assert queue.get_one_message_for_key("bbb") is None
+        assert not queue.add_message(OutboundMessage(payload="x"))
+
+    async def test_byte_budgets(self):
+        queue = DeliveryQueue(max_bytes=9, max_bytes_per_key=6)
+
+        def add(key, payload):
+            msg = OutboundMessage(
+                payload=payload, target=ConnectionTarget(recipient_keys=[key])
+            )
+            return queue.add_message(msg)
+
+        assert add("aaa", "123")
+        assert add("aaa", "456")
+        assert add("aaa", "7")  # drops the oldest message of the key
+        assert [m.payload for m in queue.inspect_all_messages_for_key("aaa")] == [
+            "456",
+            "7",
+        ]
+        assert queue.bytes_by_key["aaa"] == 4
+
+        assert add("bbb", "abcdef")  # drops the oldest message of all
+        assert [m.payload for m in queue.inspect_all_messages_for_key("aaa")] == ["7"]
+        assert queue.total_bytes == 7
+        assert queue.dropped == 2
+
+        assert not add("ccc", "too long")
+        assert queue.dropped == 3
+        assert queue.stats()["keys"] == 2
+
+    async def test_expire_time_index(self):
+        queue = DeliveryQueue(ttl_seconds=60)
+
+        t = ConnectionTarget(recipient_keys=["aaa"])
+        with async_mock.patch.object(test_module.time, "time") as mock_time:
+            mock_time.return_value = 1000.0
+            old = OutboundMessage(payload="old", target=t)
+            queue.add_message(old)
+            mock_time.return_value = 1050.0
+            new = OutboundMessage(
+                payload="new", target=ConnectionTarget(recipient_keys=["aaa", "bbb"])
+            )
+            queue.add_message(new)
+
+            mock_time.return_value = 1070.0
+            queue.expire_messages()
+            assert list(queue.inspect_all_messages_for_key("aaa")) == [new]
+            assert queue.expired == 1
+
+            queue.remove_message_for_key("aaa", new)
+            mock_time.return_value = 1200.0
+            queue.add_message(OutboundMessage(payload="x", reply_to_verkey="ccc"))
+            assert not queue.has_message_for_key("bbb")
+            assert queue.total_bytes == 1
+            assert queue.expired == 2
+
+    async def test_delivered_released(self):
+        queue = DeliveryQueue()
+
+        pinned = OutboundMessage(payload="old", reply_to_verkey="offline")
+        queue.add_message(pinned)
+        for _ in range(10):
+            msg = OutboundMessage(payload="x" * 1000, reply_to_verkey="online")
+            queue.add_message(msg)
+            assert queue.get_one_message_for_key("online") is msg
+        assert len(queue._by_time) == 1
+        assert queue.total_bytes == queue.memory_bytes == 3
+
+        queue.add_message(OutboundMessage(payload="new", reply_to_verkey="online"))
+        queued = next(iter(queue.queue_by_key["online"]))
+        queue.get_one_message_for_key("online")
+        assert queued.msg is None
+
+    async def test_store(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "queue.db")
+            queue = DeliveryQueue(path=path, max_memory_bytes=1)
+
+            t = ConnectionTarget(
+                recipient_keys=["aaa", "bbb"], endpoint="http://localhost"
+            )
+            first = OutboundMessage(payload="first", target=t, reply_thread_id="thid")
+            second = OutboundMessage(payload="x", enc_payload=b"\x00\xff", target=t)
+            third = OutboundMessage(payload="third", reply_to_verkey="aaa")
+            for msg in (first, second, third):
+                assert queue.add_message(msg)
+            assert queue.memory_bytes == 0
+            # messages only held on disk are read back when they are requested
+            restored = queue.get_one_message_for_key("bbb")
+            assert restored is not first and restored.payload == "first"
+            assert restored.reply_thread_id == "thid"
+            queue.remove_message_for_key("aaa", restored)
+            queue.close()
+
+            # the queued messages are read back after a restart
+            queue = DeliveryQueue(path=path)
+            assert queue.memory_bytes == 0
+            assert queue.total_bytes == 7
+            assert queue.message_count_for_key("aaa") == 2
+            assert queue.message_count_for_key("bbb") == 1
+
+            restored = queue.get_one_message_for_key("aaa")
+            assert restored.enc_payload == b"\x00\xff"
+            assert restored.target.recipient_keys == ["aaa", "bbb"]
+            assert restored.target.endpoint == "http://localhost"
+            assert queue.message_count_for_key("bbb") == 1
+
+            msgs = list(queue.inspect_all_messages_for_key("aaa"))
+            assert [m.payload for m in msgs] == ["third"]
+            queue.remove_message_for_key("aaa", msgs[0])
+            queue.close()
+
+            queue = DeliveryQueue(path=path)
+            assert not queue.has_message_for_key("aaa")
+            assert queue.get_one_message_for_key("bbb").payload == "x"
+            queue.close()
+
+            queue = DeliveryQueue(path=path)
+            assert queue.total_bytes == 0
+            queue.close()
+
+    async def test_store_write_failure(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            queue = DeliveryQueue(
+                path=os.path.join(tmp_dir, "queue.db"), max_memory_bytes=1
+            )
+            msg = OutboundMessage(payload="first", reply_to_verkey="aaa")
+            with mock.patch.object(
+                queue.store, "_add", mock.MagicMock(side_effect=sqlite3.Error("full"))
+            ):
+                assert queue.add_message(msg)
+                queue.store._executor.submit(lambda: None).result()
+            assert queue.memory_bytes == 0
+            # the body of a message not written is kept by the store
+            assert queue.get_one_message_for_key("aaa").payload == "first"
+            assert not queue.store._unwritten
+            queue.close()
+
+    async def test_store_x(self):
+        with self.assertRaises(TransportError):
+            DeliveryQueue(path="/no/such/dir/queue.db")
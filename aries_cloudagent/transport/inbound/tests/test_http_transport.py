@@ -103,6 +103,40 @@ class TestHttpTransport(AioHTTPTestCase):
 
         await self.transport.stop()
 
+    @unittest_run_loop
+    async def test_start_reuse_port(self):
+        transport = HttpTransport(
+            "0.0.0.0", self.port, self.create_session, reuse_port=True
+        )
+        assert transport.reuse_port
+        with async_mock.patch.object(
+            test_module.web, "TCPSite", async_mock.MagicMock()
+        ) as mock_site:
+            mock_site.return_value = async_mock.MagicMock(
+                start=async_mock.CoroutineMock()
+            )
+            await transport.start()
+            assert mock_site.call_args[1]["reuse_port"] is True
+
+    @unittest_run_loop
+    async def test_send_message_busy(self):
+        await self.transport.start()
+
+        test_message = {"test": "message"}
+        for sender_limited, status in ((True, 429), (False, 503)):
+            self.session = None
+            with async_mock.patch.object(
+                self, "receive_message", async_mock.MagicMock()
+            ) as mock_receive:
+                mock_receive.side_effect = test_module.TransportBusyError(
+                    retry_after=2, sender_limited=sender_limited
+                )
+                async with self.client.post("/", json=test_message) as resp:
+                    assert resp.status == status
+                    assert resp.headers["Retry-After"] == "2"
+
+        await self.transport.stop()
+
     @unittest_run_loop
     async def test_send_message_outliers(self):
         await self.transport.start()
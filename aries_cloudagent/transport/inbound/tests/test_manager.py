@@ -8,7 +8,9 @@ from ...outbound.message import OutboundMessage
 
 from ...wire_format import BaseWireFormat
 from ..base import InboundTransportConfiguration, InboundTransportRegistrationError
+from .. import manager as test_module
 from ..manager import InboundTransportManager
+from ..receipt import MessageReceipt
 
 
 class TestInboundTransportManager(AsyncTestCase):
@@ -57,6 +59,22 @@ class TestInboundTransportManager(AsyncTestCase):
 
         assert mgr.undelivered_queue
 
+    async def test_setup_worker_store(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.enable_undelivered_queue": True,
+                "transport.undelivered.path": "undelivered.db",
+                "transport.worker_id": 2,
+            }
+        )
+        mgr = InboundTransportManager(context, None)
+        with async_mock.patch.object(
+            test_module, "DeliveryQueue", async_mock.MagicMock()
+        ) as mock_queue:
+            await mgr.setup()
+        assert mock_queue.call_args[1]["path"] == "undelivered.db.2"
+
     async def test_start_stop(self):
         transport = async_mock.MagicMock()
         transport.start = async_mock.CoroutineMock()
@@ -193,6 +211,36 @@ class TestInboundTransportManager(AsyncTestCase):
             mock_accept.assert_called_once_with(test_outbound)
         assert not mgr.undelivered_queue.has_message_for_key(test_verkey)
 
+    async def test_process_undelivered_busy(self):
+        context = InjectionContext()
+        context.update_settings(
+            {
+                "transport.enable_undelivered_queue": True,
+                "transport.undelivered.max_bytes": 4096,
+            }
+        )
+        test_verkey = "test-verkey"
+        mgr = InboundTransportManager(context, None)
+        await mgr.setup()
+        assert mgr.undelivered_queue.max_bytes == 4096
+
+        for payload in ("one", "two"):
+            mgr.return_undelivered(
+                OutboundMessage(payload=payload, reply_to_verkey=test_verkey)
+            )
+
+        session = await mgr.create_session(
+            "http", can_respond=True, wire_format=async_mock.MagicMock()
+        )
+        session.add_reply_verkeys(test_verkey)
+        session.reply_mode = MessageReceipt.REPLY_MODE_ALL
+
+        mgr.process_undelivered(session)
+        assert session.response_buffer.payload == "one"
+        assert mgr.undelivered_queue.message_count_for_key(test_verkey) == 1
+
+        await mgr.stop()
+
     async def test_return_undelivered_false(self):
         context = InjectionContext()
         context.update_settings({"transport.enable_undelivered_queue": False})
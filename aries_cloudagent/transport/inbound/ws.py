@@ -6,6 +6,7 @@ import logging
 from aiohttp import web, WSMessage, WSMsgType
 
 from ...messaging.error import MessageParseError
+from ..error import TransportBusyError
 
 from .base import BaseInboundTransport, InboundTransportSetupError
 
@@ -54,7 +55,12 @@ class WsTransport(BaseInboundTransport):
         app = await self.make_application()
         runner = web.AppRunner(app)
         await runner.setup()
-        self.site = web.TCPSite(runner, host=self.host, port=self.port)
+        self.site = web.TCPSite(
+            runner,
+            host=self.host,
+            port=self.port,
+            reuse_port=self.reuse_port or None,
+        )
         try:
             await self.site.start()
         except OSError:
@@ -108,6 +114,8 @@ class WsTransport(BaseInboundTransport):
                             await session.receive(msg.data)
                         except MessageParseError:
                             await ws.close(1003)  # unsupported data error
+                        except TransportBusyError:
+                            await ws.close(1013)  # try again later
                     elif msg.type == WSMsgType.ERROR:
                         LOGGER.error(
                             "Websocket connection closed with exception: %s",
@@ -1,10 +1,11 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
-import time
-
+from collections import deque
 from typing import Callable, Type, Union
 from urllib.parse import urlparse
 
@@ -52,6 +53,7 @@ class QueuedOutboundMessage:
         self.error: Exception = None
         self.message = message
         self.payload: Union[str, bytes] = None
+        self.probe = False
         self.retries = None
         self.retry_at: float = None
         self.state = self.STATE_NEW
@@ -60,10 +62,30 @@ class QueuedOutboundMessage:
         self.transport_id: str = transport_id
 
 
+class EndpointState:
+    """Delivery failures of one endpoint, for its backoff and circuit breaking."""
+
+    def __init__(self):
+        """Initialize the endpoint state."""
+        self.failures = 0
+        self.open_until: float = None
+        self.parked = deque()
+        self.probing = False
+        self.scheduled = False
+
+
 class OutboundTransportManager:
     """Outbound transport manager class."""
 
     MAX_RETRY_COUNT = 4
+    # delay before the first retry to an endpoint, doubled on each failure
+    RETRY_DELAY = 10.0
+    RETRY_MAX_DELAY = 600.0
+    # consecutive failures after which deliveries to an endpoint are held back
+    CIRCUIT_THRESHOLD = 5
+    # task queue priority classes of the deliveries
+    PRIORITY_MESSAGE = "message"
+    PRIORITY_WEBHOOK = "webhook"
 
     def __init__(
         self, context: InjectionContext, handle_not_delivered: Callable = None
@@ -79,14 +101,18 @@ class OutboundTransportManager:
         self.context = context
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
+        self.outbound_active = set()
         self.outbound_event = asyncio.Event()
         self.outbound_new = []
+        self.outbound_pending = deque()
+        self.outbound_retry = []
+        self.endpoints = {}
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
         self.task_queue = TaskQueue(max_active=200)
         self._process_task: asyncio.Task = None
+        self._retry_seq = itertools.count()
         if self.context.settings.get("transport.max_outbound_retry"):
             self.MAX_RETRY_COUNT = self.context.settings["transport.max_outbound_retry"]
 
@@ -282,6 +308,33 @@ class OutboundTransportManager:
         self.outbound_new.append(queued)
         self.process_queued()
 
+    @property
+    def outbound_buffer(self) -> list:
+        """Accessor for all the messages being delivered, for reporting."""
+        return list(
+            itertools.chain(
+                self.outbound_new,
+                self.outbound_pending,
+                self.outbound_active,
+                (
+                    item
+                    for _, _, item in self.outbound_retry
+                    if not isinstance(item, EndpointState)
+                ),
+                *(state.parked for state in self.endpoints.values()),
+            )
+        )
+
+    @property
+    def has_work(self) -> bool:
+        """Accessor for whether any message is waiting or being delivered."""
+        return bool(
+            self.outbound_new
+            or self.outbound_pending
+            or self.outbound_active
+            or self.outbound_retry
+        )
+
     def process_queued(self) -> asyncio.Task:
         """
         Start the process to deliver queued messages if necessary.
@@ -291,7 +344,7 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif self.has_work:
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -307,96 +360,127 @@ class OutboundTransportManager:
             self._process_task = None
 
     async def _process_loop(self):
-        """Continually kick off encoding and delivery on outbound messages."""
+        """Kick off encoding and delivery of the messages which changed state."""
         # Note: this method should not call async methods apart from
         # waiting for the updated event, to avoid yielding to other queue methods
 
         while True:
             self.outbound_event.clear()
             loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered:
-                            self.handle_not_delivered(queued.context, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-                    else:
-                        retry_count += 1
-
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.context.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END."
-                        + queued.endpoint,
-                        perf_counter=p_time,
-                    )
 
-                upd_buffer.append(queued)
+            retry = self.outbound_retry
+            while retry and retry[0][0] <= loop_time:
+                item = heapq.heappop(retry)[2]
+                if isinstance(item, EndpointState):
+                    self.endpoint_due(item, loop_time)
+                else:
+                    item.retry_at = None
+                    self.deliver_ready(item, loop_time)
 
-            new_pending = 0
             new_messages = self.outbound_new
             self.outbound_new = []
-
             for queued in new_messages:
                 if queued.state == QueuedOutboundMessage.STATE_NEW:
                     if queued.message and queued.message.enc_payload:
                         queued.payload = queued.message.enc_payload
                         queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
+                        self.deliver_ready(queued, loop_time)
                     else:
-                        queued.state = QueuedOutboundMessage.STATE_ENCODE
-                        p_time = trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.START",
-                        )
-                        self.encode_queued_message(queued)
-                        trace_event(
-                            self.context.settings,
-                            queued.message if queued.message else queued.payload,
-                            outcome="OutboundTransportManager.ENCODE.END",
-                            perf_counter=p_time,
-                        )
+                        self.encode_ready(queued)
                 else:
-                    new_pending += 1
+                    self.deliver_ready(queued, loop_time)
 
-                upd_buffer.append(queued)
+            pending = self.outbound_pending
+            while pending:
+                self.deliver_ready(pending.popleft(), loop_time)
 
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
-            else:
+            if not (self.outbound_active or retry):
                 break
+            if retry:
+                # wake up exactly when the next retry is due
+                timeout = max(0.0, retry[0][0] - get_timer())
+                try:
+                    await asyncio.wait_for(self.outbound_event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self.outbound_event.wait()
+
+    def encode_ready(self, queued: QueuedOutboundMessage):
+        """Start encoding a new message."""
+        queued.state = QueuedOutboundMessage.STATE_ENCODE
+        self.outbound_active.add(queued)
+        p_time = trace_event(
+            self.context.settings,
+            queued.message if queued.message else queued.payload,
+            outcome="OutboundTransportManager.ENCODE.START",
+        )
+        self.encode_queued_message(queued)
+        trace_event(
+            self.context.settings,
+            queued.message if queued.message else queued.payload,
+            outcome="OutboundTransportManager.ENCODE.END",
+            perf_counter=p_time,
+        )
+
+    def deliver_ready(self, queued: QueuedOutboundMessage, now: float):
+        """Start delivering an encoded message, unless its endpoint is failing."""
+        state = self.endpoints.get(self.endpoint_key(queued.endpoint))
+        if state and state.open_until is not None:
+            if state.probing or now < state.open_until:
+                # wait for the circuit to close, without using up a retry
+                queued.state = QueuedOutboundMessage.STATE_RETRY
+                state.parked.append(queued)
+                self.schedule_endpoint(state)
+                return
+            # the circuit is half open, this delivery probes the endpoint
+            state.probing = True
+            queued.probe = True
+
+        queued.state = QueuedOutboundMessage.STATE_DELIVER
+        self.outbound_active.add(queued)
+        p_time = trace_event(
+            self.context.settings,
+            queued.message if queued.message else queued.payload,
+            outcome="OutboundTransportManager.DELIVER.START." + queued.endpoint,
+        )
+        self.deliver_queued_message(queued)
+        trace_event(
+            self.context.settings,
+            queued.message if queued.message else queued.payload,
+            outcome="OutboundTransportManager.DELIVER.END." + queued.endpoint,
+            perf_counter=p_time,
+        )
+
+    def endpoint_due(self, state: EndpointState, now: float):
+        """Probe an endpoint once its circuit may close."""
+        state.scheduled = False
+        if state.parked and not state.probing:
+            self.deliver_ready(state.parked.popleft(), now)
+
+    def schedule_endpoint(self, state: EndpointState):
+        """Schedule the next probe of an endpoint with an open circuit."""
+        if not state.scheduled and not state.probing:
+            state.scheduled = True
+            heapq.heappush(
+                self.outbound_retry, (state.open_until, next(self._retry_seq), state)
+            )
+
+    def schedule_retry(self, queued: QueuedOutboundMessage, retry_at: float):
+        """Schedule the next delivery attempt of a message."""
+        queued.state = QueuedOutboundMessage.STATE_RETRY
+        queued.retry_at = retry_at
+        heapq.heappush(self.outbound_retry, (retry_at, next(self._retry_seq), queued))
+
+    @classmethod
+    def endpoint_key(cls, endpoint: str) -> str:
+        """Find the key of the endpoint state shared by the URLs of one host."""
+        parsed = urlparse(endpoint or "")
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def retry_delay(self, failures: int) -> float:
+        """Find the backoff delay after a number of consecutive failures."""
+        return min(self.RETRY_DELAY * 2 ** (failures - 1), self.RETRY_MAX_DELAY)
 
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
@@ -422,11 +506,13 @@ class OutboundTransportManager:
 
     def finished_encode(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message encoding."""
+        self.outbound_active.discard(queued)
         if completed.exc_info:
             queued.error = completed.exc_info
-            queued.state = QueuedOutboundMessage.STATE_DONE
+            self.finish(queued)
         else:
             queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.outbound_pending.append(queued)
         queued.task = None
         self.process_queued()
 
@@ -436,13 +522,27 @@ class OutboundTransportManager:
         queued.task = self.task_queue.run(
             transport.handle_message(queued.context, queued.payload, queued.endpoint),
             lambda completed: self.finished_deliver(queued, completed),
+            priority=self.PRIORITY_MESSAGE if queued.message else self.PRIORITY_WEBHOOK,
         )
         return queued.task
 
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        self.outbound_active.discard(queued)
+        key = self.endpoint_key(queued.endpoint)
+        state = self.endpoints.get(key)
+        probe = queued.probe
+        queued.probe = False
+
         if completed.exc_info:
             queued.error = completed.exc_info
+            now = get_timer()
+            if not state:
+                state = self.endpoints[key] = EndpointState()
+            if probe or state.open_until is None:
+                state.failures += 1
+                if probe or state.failures >= self.CIRCUIT_THRESHOLD:
+                    self.open_circuit(state, queued, now)
 
             if queued.retries:
                 if LOGGER.isEnabledFor(logging.DEBUG):
@@ -466,20 +566,60 @@ class OutboundTransportManager:
                         queued.error,
                     )
                 queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                if state.open_until is not None:
+                    queued.state = QueuedOutboundMessage.STATE_RETRY
+                    state.parked.append(queued)
+                    self.schedule_endpoint(state)
+                else:
+                    self.schedule_retry(queued, now + self.retry_delay(state.failures))
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
                     exc_info=queued.error,
                 )
-                queued.state = QueuedOutboundMessage.STATE_DONE
+                self.finish(queued)
         else:
             queued.error = None
             queued.state = QueuedOutboundMessage.STATE_DONE
+            if state:
+                # the endpoint is back, release the messages waiting for it
+                del self.endpoints[key]
+                for parked in state.parked:
+                    parked.state = QueuedOutboundMessage.STATE_PENDING
+                self.outbound_pending.extend(state.parked)
         queued.task = None
         self.process_queued()
 
+    def open_circuit(
+        self, state: EndpointState, failed: QueuedOutboundMessage, now: float
+    ):
+        """Stop delivering to a failing endpoint until its backoff delay passes."""
+        state.probing = False
+        state.open_until = now + self.retry_delay(state.failures)
+        # the messages waiting for the endpoint used up an attempt with this failure
+        parked = state.parked
+        state.parked = deque()
+        for queued in parked:
+            if queued.retries:
+                queued.retries -= 1
+                state.parked.append(queued)
+            else:
+                queued.error = failed.error
+                self.finish(queued)
+        self.schedule_endpoint(state)
+
+    def finish(self, queued: QueuedOutboundMessage):
+        """Finish with a message, reporting it if it could not be delivered."""
+        queued.state = QueuedOutboundMessage.STATE_DONE
+        if queued.error:
+            LOGGER.exception(
+                "Outbound message could not be delivered to %s",
+                queued.endpoint,
+                exc_info=queued.error,
+            )
+            if self.handle_not_delivered:
+                self.handle_not_delivered(queued.context, queued.message)
+
     async def flush(self):
         """Wait for any queued messages to be delivered."""
         proc_task = self.process_queued()
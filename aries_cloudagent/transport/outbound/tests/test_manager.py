@@ -1,4 +1,5 @@
 import asyncio
+import heapq
 import json
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
@@ -175,7 +176,9 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = async_mock.MagicMock(retries=1)
+        mock_queued = async_mock.MagicMock(
+            retries=1, endpoint="http://1.2.3.4:8081", probe=False
+        )
         mock_task = async_mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -193,12 +196,14 @@ class TestOutboundTransportManager(AsyncTestCase):
         mock_queued = async_mock.MagicMock(
             state=QueuedOutboundMessage.STATE_RETRY,
             retry_at=test_module.get_timer() - 1,
+            endpoint="http://1.2.3.4:8081",
         )
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.schedule_retry(mock_queued, mock_queued.retry_at)
+        assert mgr.outbound_buffer == [mock_queued]
 
         with async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
@@ -207,6 +212,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is None
+            assert not mgr.outbound_retry
 
     async def test_process_loop_retry_later(self):
         mock_queued = async_mock.MagicMock(
@@ -217,15 +223,39 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.schedule_retry(mock_queued, mock_queued.retry_at)
 
         with async_mock.patch.object(
-            test_module.asyncio, "sleep", async_mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
+            test_module.asyncio, "wait_for", async_mock.CoroutineMock()
+        ) as mock_wait_for:
+            mock_wait_for.side_effect = KeyError()
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is not None
+            # sleeps until the retry is due instead of polling
+            timeout = mock_wait_for.call_args[0][1]
+            assert 3500 < timeout <= 3600
+            mock_wait_for.call_args[0][0].close()
+
+    async def test_process_loop_retry_wakeup(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://1.2.3.4:8081"
+        mgr.schedule_retry(queued, test_module.get_timer() + 0.05)
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver:
+
+            def delivered(queued):
+                mgr.finished_deliver(queued, async_mock.MagicMock(exc_info=None))
+
+            mock_deliver.side_effect = delivered
+            await asyncio.wait_for(mgr._process_loop(), 1)
+            mock_deliver.assert_called_once_with(queued)
+        assert queued.state == QueuedOutboundMessage.STATE_DONE
+        assert not mgr.outbound_buffer
 
     async def test_process_loop_new(self):
         context = InjectionContext()
@@ -236,6 +266,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             async_mock.MagicMock(
                 state=test_module.QueuedOutboundMessage.STATE_NEW,
                 message=async_mock.MagicMock(enc_payload=b"encr"),
+                endpoint="http://1.2.3.4:8081",
             )
         ]
         with async_mock.patch.object(
@@ -249,6 +280,31 @@ class TestOutboundTransportManager(AsyncTestCase):
 
             with self.assertRaises(KeyError):
                 await mgr._process_loop()
+            mock_deliver.assert_called_once()
+
+    async def test_process_loop_new_encode(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+
+        queued = async_mock.MagicMock(
+            state=test_module.QueuedOutboundMessage.STATE_NEW,
+            message=async_mock.MagicMock(enc_payload=None),
+        )
+        mgr.outbound_new = [queued]
+        with async_mock.patch.object(
+            mgr, "encode_queued_message", async_mock.MagicMock()
+        ) as mock_encode, async_mock.patch.object(
+            mgr.outbound_event, "wait", async_mock.CoroutineMock()
+        ) as mock_wait, async_mock.patch.object(
+            test_module, "trace_event", async_mock.MagicMock()
+        ) as mock_trace:
+            mock_wait.side_effect = KeyError()
+
+            with self.assertRaises(KeyError):
+                await mgr._process_loop()
+            mock_encode.assert_called_once_with(queued)
+            assert queued.state == QueuedOutboundMessage.STATE_ENCODE
+            assert mgr.outbound_active == {queued}
 
     async def test_process_loop_new_deliver(self):
         context = InjectionContext()
@@ -259,6 +315,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             async_mock.MagicMock(
                 state=test_module.QueuedOutboundMessage.STATE_DELIVER,
                 message=async_mock.MagicMock(enc_payload=b"encr"),
+                endpoint="http://1.2.3.4:8081",
             )
         ]
         with async_mock.patch.object(
@@ -275,7 +332,7 @@ class TestOutboundTransportManager(AsyncTestCase):
 
     async def test_process_loop_x(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE,
+            state=QueuedOutboundMessage.STATE_DELIVER,
             error=KeyError(),
             endpoint="http://1.2.3.4:8081",
             payload="Hello world",
@@ -284,20 +341,26 @@ class TestOutboundTransportManager(AsyncTestCase):
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.finish(mock_queued)
+        assert mock_queued.state == QueuedOutboundMessage.STATE_DONE
+        mock_handle_not_delivered.assert_called_once_with(
+            mock_queued.context, mock_queued.message
+        )
 
         await mgr._process_loop()
 
     async def test_finished_deliver_x_log_debug(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE, retries=1
+            state=QueuedOutboundMessage.STATE_DONE,
+            retries=1,
+            endpoint="http://1.2.3.4:8081",
+            probe=False,
         )
         mock_completed_x = async_mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         context = InjectionContext()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(context, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
         with async_mock.patch.object(
             test_module.LOGGER, "exception", async_mock.MagicMock()
         ) as mock_logger_exception, async_mock.patch.object(
@@ -309,3 +372,104 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_process:
             mock_logger_enabled.return_value = True  # cover debug logging
             mgr.finished_deliver(mock_queued, mock_completed_x)
+            assert mgr.outbound_buffer == [mock_queued]
+
+    async def test_finished_deliver_backoff(self):
+        context = InjectionContext()
+        mgr = OutboundTransportManager(context)
+        failed = async_mock.MagicMock(exc_info=(KeyError, KeyError("nope"), None))
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://1.2.3.4:8081/path"
+        queued.retries = 3
+
+        delays = []
+        with async_mock.patch.object(
+            mgr, "process_queued", async_mock.MagicMock()
+        ), async_mock.patch.object(test_module, "get_timer") as mock_timer:
+            mock_timer.return_value = 100.0
+            for _ in range(3):
+                mgr.finished_deliver(queued, failed)
+                assert queued.state == QueuedOutboundMessage.STATE_RETRY
+                delays.append(heapq.heappop(mgr.outbound_retry)[0] - 100.0)
+        assert delays == [mgr.RETRY_DELAY, mgr.RETRY_DELAY * 2, mgr.RETRY_DELAY * 4]
+        assert queued.retries == 0
+
+        # other paths on the same host share the backoff
+        state = mgr.endpoints[mgr.endpoint_key("http://1.2.3.4:8081/other")]
+        assert state.failures == 3
+        assert mgr.retry_delay(100) == mgr.RETRY_MAX_DELAY
+
+        # success resets the endpoint
+        mgr.finished_deliver(queued, async_mock.MagicMock(exc_info=None))
+        assert queued.state == QueuedOutboundMessage.STATE_DONE
+        assert not mgr.endpoints
+
+    async def test_circuit_breaker(self):
+        context = InjectionContext()
+        mock_handle_not_delivered = async_mock.MagicMock()
+        mgr = OutboundTransportManager(context, mock_handle_not_delivered)
+        mgr.CIRCUIT_THRESHOLD = 2
+        failed = async_mock.MagicMock(exc_info=(KeyError, KeyError("nope"), None))
+        endpoint = "http://1.2.3.4:8081"
+
+        def queue_message(retries):
+            queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+            queued.endpoint = endpoint
+            queued.payload = "{}"
+            queued.retries = retries
+            return queued
+
+        first, second, waiting, last = (queue_message(r) for r in (4, 4, 4, 0))
+        with async_mock.patch.object(
+            mgr, "process_queued", async_mock.MagicMock()
+        ), async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver, async_mock.patch.object(
+            test_module, "get_timer"
+        ) as mock_timer:
+            mock_timer.return_value = 100.0
+            mgr.finished_deliver(first, failed)
+            state = mgr.endpoints[mgr.endpoint_key(endpoint)]
+            assert state.open_until is None
+
+            # the circuit opens on reaching the threshold
+            mgr.finished_deliver(second, failed)
+            assert state.open_until == 100.0 + mgr.RETRY_DELAY * 2
+            assert list(state.parked) == [second]
+
+            # deliveries to the endpoint are held back without using a retry
+            mgr.deliver_ready(waiting, 101.0)
+            mgr.deliver_ready(last, 101.0)
+            assert list(state.parked) == [second, waiting, last]
+            assert waiting.retries == 4
+            mock_deliver.assert_not_called()
+
+            # the endpoint timer sends a single probe
+            entries = [item for _, _, item in mgr.outbound_retry]
+            assert entries.count(state) == 1
+            mgr.endpoint_due(state, state.open_until)
+            mock_deliver.assert_called_once_with(second)
+            assert second.probe and state.probing
+            mgr.deliver_ready(first, state.open_until)
+            assert state.parked[-1] is first
+
+            # a failed probe opens the circuit for longer and uses up a retry
+            mock_timer.return_value = 200.0
+            mgr.finished_deliver(second, failed)
+            assert state.open_until == 200.0 + mgr.RETRY_DELAY * 4
+            assert not state.probing
+            assert waiting.retries == 3
+            assert last.state == QueuedOutboundMessage.STATE_DONE
+            mock_handle_not_delivered.assert_called_once()
+            assert last not in state.parked
+
+            # a successful probe releases the held messages
+            mgr.endpoint_due(state, state.open_until)
+            probe = mock_deliver.call_args[0][0]
+            mgr.finished_deliver(probe, async_mock.MagicMock(exc_info=None))
+            assert not mgr.endpoints
+            assert set(mgr.outbound_pending) == {first, second, waiting} - {probe}
+            assert all(
+                queued.state == QueuedOutboundMessage.STATE_PENDING
+                for queued in mgr.outbound_pending
+            )
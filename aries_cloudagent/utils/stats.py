@@ -1,9 +1,131 @@
 """Classes for tracking performance and timing."""
 
+import bisect
 import functools
 import inspect
+import itertools
 import time
-from typing import Sequence, TextIO, Union
+from math import frexp
+from typing import Mapping, Sequence, TextIO, Tuple, Union
+
+# the percentiles reported for each timed name
+PERCENTILES = (0.5, 0.95, 0.99)
+
+# histogram bucket layout, module globals are the fastest to read when recording
+_MIN_VALUE = 1e-6
+_SCALE = 1 / _MIN_VALUE
+_SUB_BITS = 3
+_SUB_SCALE = 2 << _SUB_BITS
+_BUCKETS = 32 << _SUB_BITS
+
+
+class Histogram:
+    """
+    Latency histogram of fixed size with log-linear buckets, HDR style.
+
+    Every power of two above `MIN_VALUE` is split into `SUB_BUCKETS` equal
+    buckets, so percentiles are accurate to a few percent at any scale.
+    Besides the totals, the counts are kept in a ring of time slots which
+    together cover the sliding window the percentiles are reported for.
+    """
+
+    MIN_VALUE = _MIN_VALUE
+    SUB_BITS = _SUB_BITS
+    SUB_BUCKETS = 1 << _SUB_BITS
+    BUCKETS = _BUCKETS
+
+    def __init__(self, window: float = 60.0, slots: int = 6, now: float = None):
+        """
+        Initialize the Histogram instance.
+
+        Args:
+            window: The number of seconds covered by the sliding window
+            slots: The number of slots the window advances by
+            now: The current time, by the `Timer` clock
+        """
+        self.sum = 0.0
+        self.totals = [0] * self.BUCKETS
+        self._slot_length = window / slots
+        self._slots = [[0] * self.BUCKETS for _ in range(slots)]
+        self._slot = 0
+        self._current = self._slots[0]
+        self._slot_end = (Timer.now() if now is None else now) + self._slot_length
+
+    @classmethod
+    def bucket_index(cls, value: float) -> int:
+        """Find the bucket holding a value."""
+        if value <= _MIN_VALUE:
+            return 0
+        mantissa, exponent = frexp(value * _SCALE)
+        index = ((exponent - 1) << _SUB_BITS) + int((mantissa - 0.5) * _SUB_SCALE)
+        return index if index < _BUCKETS else _BUCKETS - 1
+
+    @classmethod
+    def bucket_value(cls, index: int) -> float:
+        """Find the value representing a bucket, its midpoint."""
+        octave, sub = divmod(index, cls.SUB_BUCKETS)
+        return cls.MIN_VALUE * (1 << octave) * (1 + (sub + 0.5) / cls.SUB_BUCKETS)
+
+    def record(self, value: float, now: float):
+        """Record a value at the given time."""
+        # the bucket index is computed inline, this runs for every timed call
+        if now >= self._slot_end:
+            self._advance(now)
+        if value > _MIN_VALUE:
+            mantissa, exponent = frexp(value * _SCALE)
+            index = ((exponent - 1) << _SUB_BITS) + int((mantissa - 0.5) * _SUB_SCALE)
+            if index >= _BUCKETS:
+                index = _BUCKETS - 1
+        else:
+            index = 0
+        self._current[index] += 1
+        self.totals[index] += 1
+        self.sum += value
+
+    @property
+    def count(self) -> int:
+        """Accessor for the number of recorded values."""
+        return sum(self.totals)
+
+    def _advance(self, now: float):
+        """Move on to the slot of the given time, clearing the expired slots."""
+        elapsed = int((now - self._slot_end) // self._slot_length) + 1
+        for _ in range(min(elapsed, len(self._slots))):
+            self._slot = (self._slot + 1) % len(self._slots)
+            self._slots[self._slot] = [0] * self.BUCKETS
+        self._current = self._slots[self._slot]
+        self._slot_end += elapsed * self._slot_length
+
+    def window_counts(self, now: float = None) -> Sequence[int]:
+        """Merge the counts of the slots in the sliding window."""
+        now = Timer.now() if now is None else now
+        if now >= self._slot_end:
+            self._advance(now)
+        return [sum(counts) for counts in zip(*self._slots)]
+
+    @classmethod
+    def quantiles(
+        cls, counts: Sequence[int], quantiles: Sequence[float] = PERCENTILES
+    ) -> Sequence[float]:
+        """Estimate quantiles from bucket counts, None for no values."""
+        cumulative = list(itertools.accumulate(counts))
+        total = cumulative[-1]
+        if not total:
+            return [None] * len(quantiles)
+        return [
+            cls.bucket_value(bisect.bisect_left(cumulative, max(1, q * total)))
+            for q in quantiles
+        ]
+
+    def percentiles(
+        self,
+        quantiles: Sequence[float] = PERCENTILES,
+        window: bool = True,
+        now: float = None,
+    ) -> Sequence[float]:
+        """Estimate quantiles over the sliding window, or all values."""
+        counts = self.window_counts(now) if window else self.totals
+        return self.quantiles(counts, quantiles)
 
 
 class Stats:
@@ -11,6 +133,7 @@ class Stats:
 
     def __init__(self):
         """Initialize the Stats instance."""
+        self.counters = {}
         self.counts = {}
         self.max_time = {}
         self.min_time = {}
@@ -29,16 +152,24 @@ class Stats:
             self.min_time[name] = duration
             self.total_time[name] = duration
 
+    def increment(self, name: str, amount: int = 1):
+        """Increment a named counter."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
     def extract(self, names: Sequence[str] = None) -> dict:
         """Summarize the stats in a dictionary."""
         counts = self.counts.copy()
         all_names = set(counts)
         if names is None:
             names = all_names
+            counters = self.counters.copy()
             maxes = self.max_time.copy()
             mins = self.min_time.copy()
             totals = self.total_time.copy()
         else:
+            counters = {
+                name: val for (name, val) in self.counters.items() if name in names
+            }
             names = set(names).intersection(all_names)
             counts = {name: val for (name, val) in counts.items() if name in names}
             maxes = {
@@ -52,6 +183,7 @@ class Stats:
         return {
             "avg": {name: totals[name] / counts[name] for name in names},
             "count": counts,
+            "counters": counters,
             "max": maxes,
             "min": mins,
             "total": totals,
@@ -61,10 +193,16 @@ class Stats:
 class Timer:
     """Timer instance for a running task."""
 
-    def __init__(self, collector: "Collector", groups: Sequence[str]):
+    def __init__(
+        self,
+        collector: "Collector",
+        groups: Sequence[str],
+        labels: Mapping[str, str] = None,
+    ):
         """Initialize the Timer instance."""
         self.collector = collector
         self.groups = groups
+        self.labels = labels
         self.start_time = None
 
     @classmethod
@@ -82,7 +220,7 @@ class Timer:
         if self.start_time:
             dur = self.now() - self.start_time
             for grp in self.groups:
-                self.collector.log(grp, dur, self.start_time)
+                self.collector.log(grp, dur, self.start_time, self.labels)
         self.start_time = None
 
     def __enter__(self):
@@ -94,20 +232,90 @@ class Timer:
         self.stop()
 
 
+def series_name(name: str, labels: Tuple[Tuple[str, str], ...] = ()) -> str:
+    """Format the name of a labeled series for display."""
+    if not labels:
+        return name
+    return name + "{" + ",".join(f"{key}={value}" for key, value in labels) + "}"
+
+
+def prometheus_escape(value) -> str:
+    """Escape a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def prometheus_labels(labels: Sequence[Tuple[str, str]]) -> str:
+    """Format Prometheus labels."""
+    if not labels:
+        return ""
+    return (
+        "{"
+        + ",".join(f'{key}="{prometheus_escape(value)}"' for key, value in labels)
+        + "}"
+    )
+
+
+def prometheus_gauges(name: str, values: Mapping, description: str) -> str:
+    """
+    Format a dictionary of numbers as a Prometheus gauge labeled by key.
+
+    Nested dictionaries of numbers per class, as the task queue priorities,
+    are labeled with the class as well.
+    """
+
+    def number(value) -> bool:
+        return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+    lines = [f"# HELP {name} {description}", f"# TYPE {name} gauge"]
+    for key, value in sorted(values.items()):
+        if number(value):
+            lines.append(f"{name}{prometheus_labels((('stat', key),))} {value:.6g}")
+        elif isinstance(value, Mapping):
+            for cls, fields in sorted(value.items()):
+                if not isinstance(fields, Mapping):
+                    continue
+                for field, field_value in sorted(fields.items()):
+                    if number(field_value):
+                        labels = prometheus_labels(
+                            (("stat", f"{key}_{field}"), ("class", cls))
+                        )
+                        lines.append(f"{name}{labels} {field_value:.6g}")
+    return "\n".join(lines) + "\n"
+
+
 class Collector:
     """Collector for a set of statistics."""
 
-    def __init__(self, *, enabled: bool = True, log_path: str = None):
-        """Initialize the Collector instance."""
+    def __init__(
+        self,
+        *,
+        enabled: bool = True,
+        log_path: str = None,
+        window: float = 60.0,
+        window_slots: int = 6,
+    ):
+        """
+        Initialize the Collector instance.
+
+        Args:
+            enabled: Whether statistics are collected
+            log_path: A file each timing is written to
+            window: The number of seconds percentiles are reported over
+            window_slots: The number of slots the window advances by
+        """
         self._enabled = enabled
         self._log_file: TextIO = None
         self._log_path = log_path
         self._stats = None
+        self._histograms = {}
+        self._window = window
+        self._window_slots = window_slots
         self.reset()
 
     def reset(self):
         """Reset the collector's statistics."""
         self._stats = Stats()
+        self._histograms = {}
         if self._log_file:
             self._log_file.close()
             self._log_file = None
@@ -124,15 +332,34 @@ class Collector:
         """Setter for the collector's enabled property."""
         self._enabled = val
 
-    def log(self, name: str, duration: float, start: float = None):
+    def log(
+        self,
+        name: str,
+        duration: float,
+        start: float = None,
+        labels: Mapping[str, str] = None,
+    ):
         """Log an entry in the statistics if the collector is enabled."""
         if self._enabled:
             self._stats.log(name, duration)
+            now = time.perf_counter() if start is None else start + duration
+            key = (name, tuple(sorted(labels.items()))) if labels else name
+            histogram = self._histograms.get(key)
+            if not histogram:
+                histogram = self._histograms[key] = Histogram(
+                    self._window, self._window_slots, now - duration
+                )
+            histogram.record(duration, now)
             if self._log_file:
                 if start is None:
-                    start = time.perf_counter() - duration
+                    start = now - duration
                 self._log_file.write(f"{name} {start:.5f} {duration:.5f}\n")
 
+    def increment(self, name: str, amount: int = 1):
+        """Increment a named counter if the collector is enabled."""
+        if self._enabled:
+            self._stats.increment(name, amount)
+
     def mark(self, *names):
         """Make a custom decorator function for adding to the set of groups."""
         return lambda fn: self(fn, names)
@@ -196,15 +423,77 @@ class Collector:
         else:
             raise ValueError(f"Expected function or coroutine, got: {fn}")
 
-    def timer(self, *groups):
+    def timer(self, *groups, labels: Mapping[str, str] = None):
         """Create a new timer attached to this collector."""
-        return Timer(self, groups)
+        return Timer(self, groups, labels)
 
     @property
     def results(self) -> dict:
         """Accessor for the current set of collected statistics."""
-        return self._stats.extract()
+        return self.extract()
 
     def extract(self, groups: Sequence[str] = None) -> dict:
         """Extract statistics for a specific set of groups."""
-        return self._stats.extract(groups)
+        results = self._stats.extract(groups)
+        results["percentiles"] = self.percentiles(groups)
+        return results
+
+    def _series(self):
+        """Iterate over the timed series, unlabeled series are keyed by name."""
+        series = [
+            (key, ()) + (histogram,) if isinstance(key, str) else key + (histogram,)
+            for key, histogram in self._histograms.items()
+        ]
+        return sorted(series, key=lambda item: item[:2])
+
+    def percentiles(self, groups: Sequence[str] = None) -> dict:
+        """Report the percentiles of each series over the sliding window."""
+        now = Timer.now()
+        results = {}
+        for name, labels, histogram in self._series():
+            if groups is None or name in groups:
+                values = histogram.percentiles(now=now)
+                results[series_name(name, labels)] = {
+                    f"p{round(q * 100)}": value for q, value in zip(PERCENTILES, values)
+                }
+        return results
+
+    def prometheus(self, prefix: str = "acapy") -> str:
+        """
+        Format the statistics in the Prometheus text exposition format.
+
+        The timings are reported as one summary, labeled with the timed name,
+        its quantiles cover the sliding window. The counters are reported as
+        one counter labeled with the counter name.
+        """
+        now = Timer.now()
+        lines = [
+            f"# HELP {prefix}_timing_seconds Timings of agent operations",
+            f"# TYPE {prefix}_timing_seconds summary",
+        ]
+        for name, labels, histogram in self._series():
+            series = (("name", name),) + labels
+            values = histogram.percentiles(now=now)
+            for quantile, value in zip(PERCENTILES, values):
+                if value is not None:
+                    quantile_labels = prometheus_labels(
+                        series + (("quantile", str(quantile)),)
+                    )
+                    lines.append(
+                        f"{prefix}_timing_seconds{quantile_labels} {value:.6g}"
+                    )
+            series_labels = prometheus_labels(series)
+            lines.append(
+                f"{prefix}_timing_seconds_sum{series_labels} {histogram.sum:.6g}"
+            )
+            lines.append(
+                f"{prefix}_timing_seconds_count{series_labels} {histogram.count}"
+            )
+        counters = self._stats.counters
+        if counters:
+            lines.append(f"# HELP {prefix}_events_total Counts of agent events")
+            lines.append(f"# TYPE {prefix}_events_total counter")
+            for name in sorted(counters):
+                name_labels = prometheus_labels((("name", name),))
+                lines.append(f"{prefix}_events_total{name_labels} {counters[name]}")
+        return "\n".join(lines) + "\n"
@@ -3,7 +3,8 @@
 import asyncio
 import logging
 import time
-from typing import Callable, Coroutine, Tuple
+from collections import deque
+from typing import Callable, Coroutine, Iterable, Mapping, Sequence, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
@@ -22,6 +23,33 @@ async def coro_timed(coro: Coroutine, timing: dict):
         timing["ended"] = time.perf_counter()
 
 
+async def gather_bounded(
+    coros: Iterable[Coroutine], limit: int = 0, return_exceptions: bool = False
+) -> Sequence:
+    """
+    Run coroutines concurrently, with at most `limit` of them active at once.
+
+    Args:
+        coros: The coroutines to run
+        limit: The maximum number of active coroutines, or 0 for no limit
+        return_exceptions: Return exceptions as results instead of raising
+
+    Returns: the results, in the order of the input coroutines
+
+    """
+    if not limit:
+        return await asyncio.gather(*coros, return_exceptions=return_exceptions)
+    semaphore = asyncio.Semaphore(limit)
+
+    async def bounded(coro: Coroutine):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(
+        *(bounded(coro) for coro in coros), return_exceptions=return_exceptions
+    )
+
+
 def task_exc_info(task: asyncio.Task):
     """Extract exception info from an asyncio task."""
     if not task or not task.done():
@@ -65,6 +93,7 @@ class PendingTask:
         ident: str = None,
         task_future: asyncio.Future = None,
         queued_time: float = None,
+        priority: str = None,
     ):
         """
         Initialize the pending task.
@@ -75,6 +104,7 @@ class PendingTask:
             ident: A string identifier for the task
             task_future: A future to be resolved to the asyncio Task
             queued_time: When the pending task was added to the queue
+            priority: The priority class of the task
         """
         if not asyncio.iscoroutine(coro):
             raise ValueError(f"Expected coroutine, got {coro}")
@@ -84,6 +114,7 @@ class PendingTask:
         self.queued_time: float = queued_time
         self.unqueued_time: float = None
         self.ident = ident or coro_ident(coro)
+        self.priority = priority or TaskQueue.DEFAULT_PRIORITY
         self.task_future = task_future or asyncio.get_event_loop().create_future()
 
     def cancel(self):
@@ -121,11 +152,68 @@ class PendingTask:
         return f"<{self.__class__.__name__} ident={self.ident}>"
 
 
+class PriorityStats:
+    """Track the active and pending tasks of one priority class."""
+
+    def __init__(self, max_active: int = 0):
+        """
+        Initialize the priority class stats.
+
+        Args:
+            max_active: The maximum number of active tasks of the class, or 0
+                to be limited by the queue only
+        """
+        self.max_active = max_active
+        self.active = 0
+        self.pending = deque()
+        self.started = 0
+        self.wait_count = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    @property
+    def ready(self) -> bool:
+        """Accessor for whether another task of the class may be started."""
+        return not self.max_active or self.active < self.max_active
+
+    def record_wait(self, wait: float):
+        """Record the time a task of the class spent in the pending queue."""
+        self.wait_count += 1
+        self.wait_total += wait
+        if wait > self.wait_max:
+            self.wait_max = wait
+
+    def serialize(self) -> dict:
+        """Return the current metrics of the class."""
+        return {
+            "max_active": self.max_active,
+            "active": self.active,
+            "pending": len(self.pending),
+            "started": self.started,
+            "wait_count": self.wait_count,
+            "wait_avg": self.wait_count and self.wait_total / self.wait_count,
+            "wait_max": self.wait_max,
+        }
+
+
 class TaskQueue:
-    """A class for managing a set of asyncio tasks."""
+    """
+    A class for managing a set of asyncio tasks.
+
+    Tasks are assigned to priority classes. Pending tasks are kept in one
+    queue per class and started in turn, one from each class having room,
+    so a busy class cannot starve the others. A class may be given its own
+    limit on active tasks, below the limit of the queue.
+    """
+
+    DEFAULT_PRIORITY = "default"
 
     def __init__(
-        self, max_active: int = 0, timed: bool = False, trace_fn: Callable = None
+        self,
+        max_active: int = 0,
+        timed: bool = False,
+        trace_fn: Callable = None,
+        priorities: Mapping[str, int] = None,
     ):
         """
         Initialize the task queue.
@@ -134,10 +222,16 @@ class TaskQueue:
             max_active: The maximum number of tasks to automatically run
             timed: A flag indicating that timing should be collected for tasks
             trace_fn: A callback for all completed tasks
+            priorities: The maximum number of active tasks of each priority
+                class, 0 for no limit besides `max_active`
         """
         self.loop = asyncio.get_event_loop()
-        self.active_tasks = []
-        self.pending_tasks = []
+        self.active_tasks = set()
+        self.priorities = {}
+        self._rotation = deque()
+        self._pending_count = 0
+        for name, limit in (priorities or {}).items():
+            self.add_priority(name, limit)
         self.timed = timed
         self.total_done = 0
         self.total_failed = 0
@@ -167,6 +261,15 @@ class TaskQueue:
             or self.current_size < self._max_active
         )
 
+    @property
+    def pending_tasks(self) -> Sequence[PendingTask]:
+        """Accessor for the pending tasks of all priority classes."""
+        return [
+            pending
+            for priority in self.priorities.values()
+            for pending in priority.pending
+        ]
+
     @property
     def current_active(self) -> int:
         """Accessor for the current number of active tasks in the queue."""
@@ -175,12 +278,53 @@ class TaskQueue:
     @property
     def current_pending(self) -> int:
         """Accessor for the current number of pending tasks in the queue."""
-        return len(self.pending_tasks)
+        return self._pending_count
 
     @property
     def current_size(self) -> int:
         """Accessor for the total number of tasks in the queue."""
-        return len(self.active_tasks) + len(self.pending_tasks)
+        return len(self.active_tasks) + self._pending_count
+
+    def add_priority(self, name: str, max_active: int = 0) -> PriorityStats:
+        """
+        Add a priority class, or update the limit of an existing one.
+
+        Args:
+            name: The name of the priority class
+            max_active: The maximum number of active tasks of the class
+        """
+        priority = self.priorities.get(name)
+        if priority:
+            priority.max_active = max_active
+        else:
+            priority = self.priorities[name] = PriorityStats(max_active)
+            self._rotation.append(name)
+        return priority
+
+    def get_priority(self, name: str = None) -> PriorityStats:
+        """Fetch a priority class by name, adding it without a limit if unknown."""
+        name = name or self.DEFAULT_PRIORITY
+        return self.priorities.get(name) or self.add_priority(name)
+
+    def stats(self) -> dict:
+        """Return the queue depth and wait time metrics of each priority class."""
+        return {
+            name: priority.serialize() for name, priority in self.priorities.items()
+        }
+
+    def _has_room(self) -> bool:
+        return not self._max_active or len(self.active_tasks) < self._max_active
+
+    def _next_pending(self) -> PendingTask:
+        """Take the next pending task of the classes in turn, skipping full ones."""
+        for _ in range(len(self._rotation)):
+            name = self._rotation[0]
+            self._rotation.rotate(-1)
+            priority = self.priorities[name]
+            if priority.pending and priority.ready:
+                self._pending_count -= 1
+                return priority.pending.popleft()
+        return None
 
     def __bool__(self) -> bool:
         """
@@ -199,7 +343,7 @@ class TaskQueue:
         """Start the process to run queued tasks."""
         if self._drain_task and not self._drain_task.done():
             self._drain_evt.set()
-        elif self.pending_tasks:
+        elif self._pending_count:
             self._drain_task = self.loop.create_task(self._drain_loop())
             self._drain_task.add_done_callback(lambda task: self._drain_done(task))
         return self._drain_task
@@ -218,12 +362,16 @@ class TaskQueue:
         # waiting for the drain event, to avoid yielding to other queue methods
         while True:
             self._drain_evt.clear()
-            while self.pending_tasks and (
-                not self._max_active or len(self.active_tasks) < self._max_active
-            ):
-                pending: PendingTask = self.pending_tasks.pop(0)
-                if pending.queued_time:
-                    pending.unqueued_time = time.perf_counter()
+            while self._pending_count and self._has_room():
+                pending = self._next_pending()
+                if not pending:
+                    # the classes with pending tasks are at their limits
+                    break
+                pending.unqueued_time = time.perf_counter()
+                self.get_priority(pending.priority).record_wait(
+                    pending.unqueued_time - pending.queued_time
+                )
+                if self.timed:
                     timing = {
                         "queued": pending.queued_time,
                         "unqueued": pending.unqueued_time,
@@ -231,13 +379,17 @@ class TaskQueue:
                 else:
                     timing = None
                 task = self.run(
-                    pending.coro, pending.complete_hook, pending.ident, timing
+                    pending.coro,
+                    pending.complete_hook,
+                    pending.ident,
+                    timing,
+                    pending.priority,
                 )
                 try:
                     pending.task = task
                 except ValueError:
                     LOGGER.warning("Pending task future already fulfilled")
-            if self.pending_tasks:
+            if self._pending_count:
                 await self._drain_evt.wait()
             else:
                 break
@@ -249,9 +401,10 @@ class TaskQueue:
         Args:
             pending: The `PendingTask` to add to the task queue
         """
-        if self.timed and not pending.queued_time:
+        if not pending.queued_time:
             pending.queued_time = time.perf_counter()
-        self.pending_tasks.append(pending)
+        self.get_priority(pending.priority).pending.append(pending)
+        self._pending_count += 1
         self.drain()
 
     def add_active(
@@ -260,6 +413,7 @@ class TaskQueue:
         task_complete: Callable = None,
         ident: str = None,
         timing: dict = None,
+        priority: str = None,
     ) -> asyncio.Task:
         """
         Register an active async task with an optional completion callback.
@@ -269,10 +423,17 @@ class TaskQueue:
             task_complete: An optional callback to run on completion
             ident: A string identifer for the task
             timing: An optional dictionary of timing information
+            priority: The priority class of the task
         """
-        self.active_tasks.append(task)
+        priority = priority or self.DEFAULT_PRIORITY
+        stats = self.get_priority(priority)
+        self.active_tasks.add(task)
+        stats.active += 1
+        stats.started += 1
         task.add_done_callback(
-            lambda fut: self.completed_task(task, task_complete, ident, timing)
+            lambda fut: self.completed_task(
+                task, task_complete, ident, timing, priority
+            )
         )
         self.total_started += 1
         return task
@@ -283,6 +444,7 @@ class TaskQueue:
         task_complete: Callable = None,
         ident: str = None,
         timing: dict = None,
+        priority: str = None,
     ) -> asyncio.Task:
         """
         Start executing a coroutine as an async task, bypassing the pending queue.
@@ -292,6 +454,7 @@ class TaskQueue:
             task_complete: An optional callback to run on completion
             ident: A string identifier for the task
             timing: An optional dictionary of timing information
+            priority: The priority class the task is counted in
 
         Returns: the new asyncio task instance
 
@@ -307,10 +470,14 @@ class TaskQueue:
                 timing = dict()
             coro = coro_timed(coro, timing)
         task = self.loop.create_task(coro)
-        return self.add_active(task, task_complete, ident, timing)
+        return self.add_active(task, task_complete, ident, timing, priority)
 
     def put(
-        self, coro: Coroutine, task_complete: Callable = None, ident: str = None
+        self,
+        coro: Coroutine,
+        task_complete: Callable = None,
+        ident: str = None,
+        priority: str = None,
     ) -> PendingTask:
         """
         Add a new task to the queue, delaying execution if busy.
@@ -319,15 +486,21 @@ class TaskQueue:
             coro: The coroutine to run
             task_complete: A callback to run on completion
             ident: A string identifier for the task
+            priority: The priority class of the task, the default class if
+                not given
 
         Returns: a future resolving to the asyncio task instance once queued
 
         """
-        pending = PendingTask(coro, task_complete, ident)
+        pending = PendingTask(coro, task_complete, ident, priority=priority)
+        stats = self.get_priority(pending.priority)
         if self._cancelled:
             pending.cancel()
-        elif self.ready:
-            pending.task = self.run(coro, task_complete, pending.ident)
+        elif self._has_room() and stats.ready and not stats.pending:
+            stats.record_wait(0.0)
+            pending.task = self.run(
+                coro, task_complete, pending.ident, priority=pending.priority
+            )
         else:
             self.add_pending(pending)
         return pending
@@ -338,6 +511,7 @@ class TaskQueue:
         task_complete: Callable,
         ident: str,
         timing: dict = None,
+        priority: str = None,
     ):
         """Clean up after a task has completed and run callbacks."""
         exc_info = task_exc_info(task)
@@ -358,10 +532,9 @@ class TaskQueue:
                     self._trace_fn(completed)
             except Exception:
                 LOGGER.exception("Error finalizing task %s", completed)
-        try:
+        if task in self.active_tasks:
             self.active_tasks.remove(task)
-        except ValueError:
-            pass
+            self.get_priority(priority).active -= 1
         self.drain()
 
     def cancel_pending(self):
@@ -369,9 +542,11 @@ class TaskQueue:
         if self._drain_task:
             self._drain_task.cancel()
             self._drain_task = None
-        for pending in self.pending_tasks:
-            pending.cancel()
-        self.pending_tasks = []
+        for priority in self.priorities.values():
+            for pending in priority.pending:
+                pending.cancel()
+            priority.pending.clear()
+        self._pending_count = 0
 
     def cancel(self):
         """Cancel any pending or active tasks in the queue."""
@@ -3,7 +3,7 @@ from tempfile import NamedTemporaryFile
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
-from ..stats import Collector
+from ..stats import Collector, Histogram, prometheus_gauges
 
 
 class TestStats(AsyncTestCase):
@@ -96,5 +96,84 @@ class TestStats(AsyncTestCase):
         results = stats.extract([])
         assert not results["avg"]
 
+        stats.increment("hits")
+        stats.increment("hits", 2)
+        stats.increment("misses")
+        assert stats.results["counters"] == {"hits": 3, "misses": 1}
+        assert stats.extract(["hits"])["counters"] == {"hits": 3}
+
+        stats.enabled = False
+        stats.increment("hits")
+        assert stats.results["counters"]["hits"] == 3
+        stats.enabled = True
+
         stats.reset()
         assert not stats.results["avg"]
+
+    async def test_histogram_buckets(self):
+        assert Histogram.bucket_index(0) == 0
+        assert Histogram.bucket_index(Histogram.MIN_VALUE) == 0
+        assert Histogram.bucket_index(1e9) == Histogram.BUCKETS - 1
+        for value in (2e-6, 3.3e-5, 0.001, 0.0123, 0.5, 1.0, 42.0):
+            index = Histogram.bucket_index(value)
+            assert abs(Histogram.bucket_value(index) - value) / value < 0.07
+        indexes = [Histogram.bucket_index(n / 1000) for n in range(1, 5000)]
+        assert indexes == sorted(indexes)
+
+    async def test_histogram_percentiles(self):
+        histogram = Histogram(window=60.0, slots=6, now=0.0)
+        for n in range(1, 1001):
+            histogram.record(n / 1000, now=n / 100)
+        assert histogram.count == 1000
+        assert round(histogram.sum, 6) == 500.5
+
+        p50, p95, p99 = histogram.percentiles(now=10.0)
+        assert abs(p50 - 0.5) < 0.04
+        assert abs(p95 - 0.95) < 0.07
+        assert abs(p99 - 0.99) < 0.07
+
+        # the values recorded in the first slots left the sliding window
+        p50, _, _ = histogram.percentiles(now=65.0)
+        assert p50 > 0.6
+        assert histogram.percentiles(now=200.0) == [None, None, None]
+        assert abs(histogram.percentiles(window=False)[0] - 0.5) < 0.04
+
+    async def test_percentiles_labels(self):
+        stats = Collector()
+        stats.log("test", 0.01)
+        with stats.timer("timed", labels={"route": "/a"}):
+            pass
+        stats.log("timed", 0.02, labels={"route": "/b"})
+        stats.increment("hits")
+
+        percentiles = stats.results["percentiles"]
+        assert set(percentiles) == {"test", "timed{route=/a}", "timed{route=/b}"}
+        assert set(percentiles["test"]) == {"p50", "p95", "p99"}
+        assert abs(percentiles["test"]["p99"] - 0.01) < 0.001
+        assert set(stats.extract(["test"])["percentiles"]) == {"test"}
+
+        text = stats.prometheus()
+        assert "# TYPE acapy_timing_seconds summary" in text
+        assert 'acapy_timing_seconds_count{name="timed",route="/b"} 1' in text
+        assert 'acapy_timing_seconds{name="test",quantile="0.99"}' in text
+        assert 'acapy_events_total{name="hits"} 1' in text
+
+        stats.reset()
+        assert not stats.results["percentiles"]
+
+    async def test_prometheus_gauges(self):
+        text = prometheus_gauges(
+            "acapy_test",
+            {
+                "sessions": 2,
+                "ready": True,
+                "queues": {"inbound": {"active": 1, "name": "x"}, "other": 2},
+            },
+            "Test gauges",
+        )
+        assert text.splitlines() == [
+            "# HELP acapy_test Test gauges",
+            "# TYPE acapy_test gauge",
+            'acapy_test{stat="queues_active",class="inbound"} 1',
+            'acapy_test{stat="sessions"} 2',
+        ]
@@ -1,7 +1,13 @@
 import asyncio
 from asynctest import mock as async_mock, TestCase as AsyncTestCase
 
-from ..task_queue import CompletedTask, PendingTask, TaskQueue, task_exc_info
+from ..task_queue import (
+    CompletedTask,
+    PendingTask,
+    TaskQueue,
+    gather_bounded,
+    task_exc_info,
+)
 
 
 async def retval(val, *, delay=0):
@@ -11,6 +17,30 @@ async def retval(val, *, delay=0):
 
 
 class TestTaskQueue(AsyncTestCase):
+    async def test_gather_bounded(self):
+        active = []
+        peak = []
+
+        async def track(val):
+            active.append(val)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            active.remove(val)
+            return val
+
+        result = await gather_bounded((track(i) for i in range(6)), 2)
+        assert result == list(range(6))
+        assert max(peak) == 2
+
+        result = await gather_bounded([retval(1), retval(2)])
+        assert result == [1, 2]
+
+        async def fail():
+            raise ValueError()
+
+        result = await gather_bounded([retval(1), fail()], 1, return_exceptions=True)
+        assert result[0] == 1 and isinstance(result[1], ValueError)
+
     async def test_run(self):
         queue = TaskQueue()
         task = None
@@ -225,3 +255,48 @@ class TestTaskQueue(AsyncTestCase):
         assert len(completed) == 2
         assert "queued" not in completed[0][1]
         assert "queued" in completed[1][1]
+
+    async def test_priorities(self):
+        started = []
+
+        async def track(val):
+            started.append(val)
+            await asyncio.sleep(0.01)
+
+        queue = TaskQueue(max_active=2, priorities={"inbound": 1, "admin": 0})
+        for val in ("i1", "i2", "i3"):
+            queue.put(track(val), priority="inbound")
+        for val in ("a1", "a2"):
+            queue.put(track(val), priority="admin")
+        assert queue.current_active == 2
+        assert queue.current_pending == 3
+        assert len(queue.pending_tasks) == 3
+
+        stats = queue.stats()
+        assert stats["inbound"]["active"] == 1
+        assert stats["inbound"]["pending"] == 2
+        assert stats["admin"]["active"] == 1
+        assert stats["admin"]["pending"] == 1
+
+        await queue.flush()
+        # inbound is limited to one active task, admin tasks are not starved
+        assert started.index("a2") < started.index("i3")
+        stats = queue.stats()
+        assert stats["inbound"]["started"] == 3
+        assert stats["inbound"]["wait_count"] == 3
+        assert stats["inbound"]["wait_max"] > 0
+        assert stats["admin"]["active"] == 0
+        assert not queue.current_size
+
+    async def test_priority_default(self):
+        queue = TaskQueue(1)
+        queue.run(retval(1))
+        queue.put(retval(2), priority="other")
+        assert queue.current_pending == 1
+        assert queue.stats()["other"]["pending"] == 1
+        assert queue.stats()[TaskQueue.DEFAULT_PRIORITY]["active"] == 1
+        queue.add_priority("other", 3)
+        assert queue.priorities["other"].max_active == 3
+        await queue.flush()
+        assert queue.stats()["other"]["pending"] == 0
+        assert queue.stats()[TaskQueue.DEFAULT_PRIORITY]["active"] == 0
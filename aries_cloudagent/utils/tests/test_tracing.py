@@ -1,3 +1,4 @@
+import asyncio
 import json
 import requests
 
@@ -142,13 +143,139 @@ class TestTracing(AsyncTestCase):
             "trace.target": "http://fluentd:8080/",
             "trace.tag": "acapy.trace",
         }
-        test_module.trace_event(
-            context,
-            message,
-            handler="message_handler",
-            perf_counter=None,
-            outcome="processed OK",
+        with async_mock.patch.object(
+            test_module.TraceExporter, "send", async_mock.CoroutineMock()
+        ) as mock_send:
+            test_module.trace_event(
+                context,
+                message,
+                handler="message_handler",
+                perf_counter=None,
+                outcome="processed OK",
+            )
+            await test_module.close_trace_exporters()
+            mock_send.assert_awaited_once()
+
+    async def test_post_event_exporter(self):
+        message = Ping()
+        context = {
+            "trace.enabled": True,
+            "trace.target": "http://fluentd:8080/",
+            "trace.tag": "acapy.trace",
+            "trace.batch_size": 2,
+        }
+        exporter = test_module.get_trace_exporter(context, "http://fluentd:8080/tag")
+        assert exporter.batch_size == 2
+        assert (
+            test_module.get_trace_exporter(context, "http://fluentd:8080/tag")
+            is exporter
         )
+        other = test_module.get_trace_exporter(
+            {"trace.batch_size": 3}, "http://fluentd:8080/tag"
+        )
+        assert other.batch_size == 3
+        other.export({})
+        exporter.export({})
+        stats = test_module.trace_exporter_stats()
+        assert stats["http://fluentd:8080/tag"]["buffered"] == 2
+        with async_mock.patch.object(
+            test_module.TraceExporter, "send", async_mock.CoroutineMock()
+        ):
+            await test_module.close_trace_exporters()
+
+        with async_mock.patch.object(
+            test_module.TraceExporter, "send", async_mock.CoroutineMock()
+        ) as mock_send, async_mock.patch.object(
+            test_module.requests, "post", async_mock.MagicMock()
+        ) as mock_post:
+            for outcome in ("one", "two", "three"):
+                test_module.trace_event(context, message, outcome=outcome)
+            mock_post.assert_not_called()
+
+            stats = test_module.trace_exporter_stats()
+            url = "http://fluentd:8080/acapy.trace"
+            assert stats[url]["buffered"] == 3
+
+            # the full batch is sent without waiting for the flush interval
+            await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            assert mock_send.call_count == 1
+            batch = mock_send.call_args[0][0]
+            assert [event["outcome"] for event in batch] == ["one", "two"]
+
+            await test_module.close_trace_exporters()
+            assert mock_send.call_count == 2
+            assert mock_send.call_args[0][0][0]["outcome"] == "three"
+            assert not test_module.trace_exporter_stats()
+
+    async def test_exporter_send(self):
+        exporter = test_module.TraceExporter("http://fluentd:8080/", buffer_size=2)
+        exporter.export({"outcome": "one"})
+        exporter.export({"outcome": "two"})
+        exporter.export({"outcome": "three"})
+        assert exporter.stats() == {
+            "buffered": 2,
+            "dropped": 1,
+            "failed": 0,
+            "sent": 0,
+        }
+
+        mock_response = async_mock.MagicMock(raise_for_status=async_mock.MagicMock())
+        mock_session = async_mock.MagicMock(
+            post=async_mock.MagicMock(
+                return_value=async_mock.MagicMock(
+                    __aenter__=async_mock.CoroutineMock(return_value=mock_response),
+                    __aexit__=async_mock.CoroutineMock(return_value=None),
+                )
+            ),
+            close=async_mock.CoroutineMock(),
+        )
+        exporter._session = mock_session
+        await exporter.flush()
+        assert exporter.sent == 2
+        assert json.loads(mock_session.post.call_args[1]["data"]) == [
+            {"outcome": "two"},
+            {"outcome": "three"},
+        ]
+
+        mock_response.raise_for_status.side_effect = ValueError("bad request")
+        exporter.export({"outcome": "four"})
+        await exporter.close()
+        assert exporter.failed == 1
+        mock_session.close.assert_awaited_once_with()
+
+        exporter._session = mock_session
+        mock_response.raise_for_status.side_effect = asyncio.CancelledError()
+        with self.assertRaises(asyncio.CancelledError):
+            await exporter.send([{"outcome": "five"}])
+        assert exporter.failed == 1
+
+    def test_sample_ratio(self):
+        context = {
+            "trace.enabled": True,
+            "trace.target": "log",
+            "trace.tag": "acapy.trace",
+            "trace.sample_ratio": 0.0,
+        }
+        with async_mock.patch.object(
+            test_module, "decode_inbound_message", async_mock.MagicMock()
+        ) as mock_decode:
+            test_module.trace_event(context, Ping())
+            mock_decode.assert_not_called()
+            test_module.trace_event(context, Ping(), force_trace=True)
+            mock_decode.assert_called_once()
+            context["trace.sample_ratio"] = 1.0
+            test_module.trace_event(context, Ping())
+            assert mock_decode.call_count == 2
+
+            # a bad setting records the event rather than raising
+            context["trace.sample_ratio"] = "bad"
+            test_module.trace_event(context, Ping())
+            assert mock_decode.call_count == 3
+
+        assert test_module.parse_sample_ratio("0.5") == 0.5
+        with self.assertRaises(ValueError):
+            test_module.parse_sample_ratio(1.5)
 
     async def test_post_event_with_error(self):
         message = Ping()
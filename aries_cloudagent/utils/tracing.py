@@ -1,11 +1,16 @@
 """Event tracing."""
 
+import asyncio
 import json
 import logging
+import random
 import time
 import datetime
 import requests
 
+from collections import deque
+
+from aiohttp import ClientSession, ClientTimeout
 from marshmallow import fields
 
 from ..transport.inbound.message import InboundMessage
@@ -39,6 +44,183 @@ class AdminAPIMessageTracingSchema(OpenAPISchema):
     )
 
 
+class TraceExporter:
+    """
+    Send trace events to an http endpoint in the background.
+
+    Events are kept in a bounded buffer, dropping the oldest ones when it is
+    full, and posted as JSON arrays once a batch is complete or the flush
+    interval has passed.
+    """
+
+    BATCH_SIZE = 100
+    BUFFER_SIZE = 10000
+    FLUSH_INTERVAL = 1.0
+    TIMEOUT = 10.0
+
+    def __init__(
+        self,
+        url: str,
+        buffer_size: int = None,
+        batch_size: int = None,
+        flush_interval: float = None,
+    ):
+        """Initialize the exporter."""
+        self.url = url
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.buffer = deque(maxlen=max(buffer_size or self.BUFFER_SIZE, 1))
+        self.flush_interval = flush_interval or self.FLUSH_INTERVAL
+        self.dropped = 0
+        self.failed = 0
+        self.sent = 0
+        self._session: ClientSession = None
+        self._task: asyncio.Task = None
+        self._wakeup: asyncio.Event = None
+
+    def export(self, event: dict):
+        """Add an event to the buffer, without waiting for it to be sent."""
+        buffer = self.buffer
+        if len(buffer) == buffer.maxlen:
+            self.dropped += 1
+        buffer.append(event)
+        if not self._task:
+            self.start()
+        elif len(buffer) >= self.batch_size:
+            self._wakeup.set()
+
+    def start(self):
+        """Start the background flusher, once there is a running event loop."""
+        try:
+            loop = asyncio.get_event_loop()
+        except RuntimeError:
+            return
+        if not loop.is_running():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = loop.create_task(self._run())
+
+    async def _run(self):
+        """Send the buffered events in batches."""
+        while True:
+            complete = True
+            if len(self.buffer) < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    complete = False
+            self._wakeup.clear()
+            await self.flush(complete)
+
+    async def flush(self, complete: bool = False):
+        """Send the buffered events, or only the complete batches."""
+        buffer = self.buffer
+        while len(buffer) >= (self.batch_size if complete else 1):
+            batch = [buffer.popleft() for _ in range(min(len(buffer), self.batch_size))]
+            await self.send(batch)
+
+    async def send(self, batch: list):
+        """Post a batch of events to the endpoint."""
+        if not self._session:
+            self._session = ClientSession(timeout=ClientTimeout(total=self.TIMEOUT))
+        try:
+            async with self._session.post(
+                self.url,
+                data=json.dumps(batch),
+                headers={"Content-Type": "application/json"},
+            ) as response:
+                response.raise_for_status()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += len(batch)
+            LOGGER.error(
+                "Error sending %d trace events to %s: %s", len(batch), self.url, e
+            )
+        else:
+            self.sent += len(batch)
+
+    async def close(self):
+        """Stop the background flusher and send the remaining events."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def stats(self) -> dict:
+        """Get the event counts of the exporter."""
+        return {
+            "buffered": len(self.buffer),
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "sent": self.sent,
+        }
+
+
+_EXPORTERS = {}
+
+
+def get_trace_exporter(context, url: str) -> TraceExporter:
+    """Get the exporter sending trace events to an endpoint, as configured."""
+    key = (
+        url,
+        context.get("trace.buffer_size"),
+        context.get("trace.batch_size"),
+        context.get("trace.flush_interval"),
+    )
+    exporter = _EXPORTERS.get(key)
+    if not exporter:
+        exporter = _EXPORTERS[key] = TraceExporter(*key)
+    return exporter
+
+
+async def close_trace_exporters():
+    """Send the remaining trace events and close all the exporters."""
+    while _EXPORTERS:
+        _, exporter = _EXPORTERS.popitem()
+        await exporter.close()
+
+
+def trace_exporter_stats() -> dict:
+    """Get the event counts of the trace exporters by endpoint."""
+    stats = {}
+    for exporter in _EXPORTERS.values():
+        counts = stats.setdefault(exporter.url, dict.fromkeys(exporter.stats(), 0))
+        for name, count in exporter.stats().items():
+            counts[name] += count
+    return stats
+
+
+def parse_sample_ratio(value) -> float:
+    """
+    Parse the share of trace events to record.
+
+    Raises:
+        ValueError: If the value is not a number between 0 and 1
+
+    """
+    ratio = float(value)
+    if not 0 <= ratio <= 1:
+        raise ValueError("Trace sample ratio must be between 0 and 1")
+    return ratio
+
+
+def trace_sampled(context) -> bool:
+    """Determine whether to record an event, as per the trace sample ratio."""
+    try:
+        sample_ratio = context.get("trace.sample_ratio")
+        return sample_ratio is None or random.random() < sample_ratio
+    except Exception:
+        LOGGER.exception("Error checking trace sample ratio")
+        return True
+
+
 def get_timer() -> float:
     """Return a timer."""
     return time.perf_counter()
@@ -126,6 +308,8 @@ def trace_event(
             context["trace.target"]: Trace target
                 ("log", "message" or an http endpoint)
             context["trace.tag"]: Tag to be included in trace output
+            context["trace.sample_ratio"]: Share of the events to record as a
+                float, apart from forced ones
         message: the current message, can be an AgentMessage,
             InboundMessage, OutboundMessage or Exchange record
         event: Dict that will be converted to json and posted to the target
@@ -134,6 +318,9 @@ def trace_event(
     ret = time.perf_counter()
 
     if force_trace or tracing_enabled(context, message):
+        if not (force_trace or trace_sampled(context)):
+            return ret
+
         message = decode_inbound_message(message)
 
         # build the event to log
@@ -200,7 +387,6 @@ def trace_event(
             "ellapsed_milli": int(1000 * (ret - perf_counter)) if perf_counter else 0,
             "outcome": str(outcome),
         }
-        event_str = json.dumps(event)
 
         try:
             # check our target - if we get this far we know we are logging the event
@@ -222,15 +408,21 @@ def trace_event(
             elif context["trace.target"] == TRACE_LOG_TARGET:
                 # write to standard log file
                 LOGGER.setLevel(logging.INFO)
-                LOGGER.info(" %s %s", context["trace.tag"], event_str)
+                LOGGER.info(" %s %s", context["trace.tag"], json.dumps(event))
             else:
                 # should be an http endpoint
-                _ = requests.post(
-                    context["trace.target"]
-                    + (context["trace.tag"] if context["trace.tag"] else ""),
-                    data=event_str,
-                    headers={"Content-Type": "application/json"},
+                url = context["trace.target"] + (
+                    context["trace.tag"] if context["trace.tag"] else ""
                 )
+                if raise_errors:
+                    # checking the configuration, report any error to the caller
+                    _ = requests.post(
+                        url,
+                        data=json.dumps(event),
+                        headers={"Content-Type": "application/json"},
+                    )
+                else:
+                    get_trace_exporter(context, url).export(event)
         except Exception as e:
             if raise_errors:
                 raise
@@ -238,7 +430,7 @@ def trace_event(
                 "Error logging trace target: %s tag: %s event: %s",
                 context.get("trace.target"),
                 context.get("trace.tag"),
-                event_str,
+                json.dumps(event),
             )
             LOGGER.exception(e)
 
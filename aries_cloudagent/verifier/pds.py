@@ -7,7 +7,12 @@ from aries_cloudagent.aathcf.credentials import (
     assert_type,
     validate_schema,
 )
-from ..aathcf.credentials import verify_proof
+from ..aathcf.credentials import proof_signing_input
+from ..wallet.crypto import verify_signed_message
+from ..wallet.error import WalletError
+from ..wallet.util import b58_to_bytes
+import asyncio
+import hashlib
 import logging
 from collections import OrderedDict
 
@@ -15,9 +20,81 @@ from collections import OrderedDict
 class PDSVerifier(BaseVerifier):
     """PDS class for verifier."""
 
-    def __init__(self, wallet):
+    # number of proof results remembered
+    CACHE_SIZE = 4096
+    # number of proofs from which signatures are checked in the executor
+    OFFLOAD_THRESHOLD = 8
+
+    def __init__(self, wallet, cache_size: int = None, offload_threshold: int = None):
         self.logger = logging.getLogger(__name__)
         self.wallet = wallet
+        self.cache_size = cache_size or self.CACHE_SIZE
+        self.offload_threshold = offload_threshold or self.OFFLOAD_THRESHOLD
+        self._verified = OrderedDict()
+
+    async def _check_signature(
+        self, message: bytes, signature: bytes, verkey: str, offload: bool
+    ) -> bool:
+        if not offload:
+            try:
+                return await self.wallet.verify_message(message, signature, verkey)
+            except WalletError as err:
+                self.logger.warning("verify_proof error: %s", err.roll_up)
+                return False
+        if not (message and signature and verkey):
+            return False
+        return await asyncio.get_event_loop().run_in_executor(
+            None, verify_signed_message, signature + message, b58_to_bytes(verkey)
+        )
+
+    async def verify_proofs(self, documents: list) -> bool:
+        """
+        Verify the proofs of several documents concurrently.
+
+        Results are cached by the hash of the signed content, signature and
+        verkey, so proofs which were verified before are not checked again.
+        When there are many proofs to check, signatures are checked in the
+        event loop executor instead of the wallet.
+
+        Args:
+            documents: OrderedDicts with a proof field
+
+        Returns:
+            True if every proof is valid
+
+        """
+        pending = OrderedDict()
+        for document in documents:
+            assert_type(document, OrderedDict)
+            try:
+                message, signature, verkey = proof_signing_input(document)
+            except (KeyError, TypeError, ValueError) as err:
+                self.logger.warning("verify_proof invalid proof: %s", err)
+                return False
+            key = hashlib.sha256(
+                b"\0".join((verkey.encode("utf-8"), signature, message))
+            ).digest()
+            result = self._verified.get(key)
+            if result is False:
+                return False
+            if result is None:
+                pending[key] = (message, signature, verkey)
+            else:
+                self._verified.move_to_end(key)
+
+        offload = len(pending) >= self.offload_threshold
+        results = await asyncio.gather(
+            *(
+                self._check_signature(message, signature, verkey, offload)
+                for message, signature, verkey in pending.values()
+            )
+        )
+        for key, result in zip(pending, results):
+            self._verified[key] = result
+        while len(self._verified) > self.cache_size:
+            self._verified.popitem(last=False)
+
+        return all(results)
 
     async def verify_presentation(
         self,
@@ -39,10 +116,10 @@ class PDSVerifier(BaseVerifier):
             rev_reg_defs: revocation registry definitions
             rev_reg_entries: revocation registry entries
         """
-        self.logger.info(
-            f"""verify_presentation input
-        presentation_request {presentation_request}
-        presentation         {presentation}"""
+        self.logger.debug(
+            "verify_presentation input presentation_request %s presentation %s",
+            presentation_request,
+            presentation,
         )
 
         errors1 = validate_schema(
@@ -53,8 +130,9 @@ class PDSVerifier(BaseVerifier):
         )
         if errors1 or errors2:
             self.logger.error(
-                f"presentation_request errors: {errors1} "
-                f"presentation errors: {errors2} "
+                "presentation_request errors: %s presentation errors: %s",
+                errors1,
+                errors2,
             )
             return False
 
@@ -62,17 +140,11 @@ class PDSVerifier(BaseVerifier):
             presentation, OrderedDict
         ), "to preserve order presentation should be OrderedDict"
 
-        proofVerified = await verify_proof(self.wallet, presentation)
-        if proofVerified is False:
-            self.logger.warning("verify_proof presentation proof: %s", proofVerified)
+        documents = [presentation]
+        documents.extend(presentation.get("verifiableCredential").values())
+        verified = await self.verify_proofs(documents)
+        if verified is False:
+            self.logger.warning("verify_proof presentation proofs: %s", verified)
             return False
 
-        for subcred in presentation.get("verifiableCredential"):
-            subproof_verified = await verify_proof(
-                self.wallet, presentation.get("verifiableCredential")[subcred]
-            )
-            if subproof_verified is False:
-                self.logger.warning("verify_proof subproof: %s", subproof_verified)
-                return False
-
         return True
@@ -1,6 +1,10 @@
 from asynctest import TestCase as AsyncTestCase
+from asynctest import mock as async_mock
 from aries_cloudagent.wallet.basic import BasicWallet
+from aries_cloudagent.wallet.crypto import verify_signed_message
 from aries_cloudagent.config.injection_context import InjectionContext
+from aries_cloudagent.aathcf.credentials import create_proof
+from .. import pds as test_module
 from ..pds import PDSVerifier
 from collections import OrderedDict
 
@@ -126,4 +130,42 @@ class TestPDSVerifier(AsyncTestCase):
         # result = await self.verifier.verify_presentation(
         #     pres_request, pres, {}, {}, {}, {}
         # )
-        # assert result == False
\ No newline at end of file
+        # assert result == False
+
+    async def test_verify_proofs_cached(self):
+        wallet = BasicWallet()
+        verkey = (await wallet.create_signing_key()).verkey
+        documents = []
+        for index in range(3):
+            document = OrderedDict([("index", index)])
+            document["proof"] = await create_proof(wallet, document, Exception, verkey)
+            documents.append(document)
+
+        verifier = PDSVerifier(wallet, offload_threshold=3)
+        with async_mock.patch.object(
+            wallet, "verify_message", wraps=wallet.verify_message
+        ) as mock_verify, async_mock.patch.object(
+            test_module, "verify_signed_message", wraps=verify_signed_message
+        ) as mock_offloaded:
+            assert await verifier.verify_proofs(documents[:2])
+            assert mock_verify.call_count == 2
+            assert await verifier.verify_proofs(documents)
+            assert mock_verify.call_count == 3
+            mock_offloaded.assert_not_called()
+
+            verifier = PDSVerifier(wallet, offload_threshold=3)
+            assert await verifier.verify_proofs(documents)
+            assert mock_offloaded.call_count == 3
+            assert mock_verify.call_count == 3
+
+    async def test_verify_proofs_invalid(self):
+        wallet = BasicWallet()
+        document = OrderedDict([("index", 0)])
+        document["proof"] = await create_proof(wallet, document, Exception)
+        tampered = OrderedDict(document, index=1)
+
+        verifier = PDSVerifier(wallet, cache_size=1)
+        assert not await verifier.verify_proofs([document, tampered])
+        assert not await verifier.verify_proofs([tampered])
+        assert not await verifier.verify_proofs([OrderedDict([("index", 0)])])
+        assert len(verifier._verified) == 1
@@ -1,9 +1,11 @@
 """Cryptography functions used by BasicWallet."""
 
 import json
+import threading
 
 from collections import OrderedDict
-from typing import Callable, Optional, Sequence, Tuple
+from functools import lru_cache
+from typing import Callable, Mapping, Optional, Sequence, Tuple
 
 import nacl.bindings
 import nacl.exceptions
@@ -14,6 +16,9 @@ from marshmallow import fields, Schema, ValidationError
 from .error import WalletError
 from .util import bytes_to_b58, bytes_to_b64, b64_to_bytes, b58_to_bytes
 
+# number of converted keys kept by each of the pack key caches
+KEY_CACHE_SIZE = 1024
+
 
 class PackMessageSchema(Schema):
     """Packed message schema."""
@@ -160,15 +165,99 @@ def verify_signed_message(signed: bytes, verkey: bytes) -> bool:
     return True
 
 
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def pack_recipient_key(target_vk: bytes) -> Tuple[str, bytes]:
+    """
+    Convert a recipient verkey for packing, memoized.
+
+    Returns: A tuple of the base58 verkey and the Curve25519 public key
+    """
+    target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+    return bytes_to_b58(target_vk), target_pk
+
+
+class PackKeyCache:
+    """
+    Sender keys of a wallet converted for packing, with their shared keys.
+
+    Entries are indexed by the sender and recipient verkeys and hold secret
+    material: the cache belongs to a wallet, which clears it when it closes
+    or rotates a key. A copy sent to another process starts out empty.
+    """
+
+    def __init__(self, max_size: int = KEY_CACHE_SIZE):
+        """Initialize the cache."""
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, key: tuple, create: Callable):
+        """Find an entry, creating it if needed."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+                return value
+        value = create()
+        with self._lock:
+            self._entries[key] = value
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return value
+
+    def sender_key(self, from_secret: bytes) -> Tuple[bytes, bytes]:
+        """
+        Convert a sender secret for packing.
+
+        Returns: A tuple of the base58 verkey and the Curve25519 secret key
+        """
+        sender_vk = bytes_to_b58(sign_pk_from_sk(from_secret)).encode("ascii")
+        return self._get(
+            (sender_vk,),
+            lambda: (
+                sender_vk,
+                nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret),
+            ),
+        )
+
+    def shared_key(
+        self, sender_vk: bytes, kid: str, target_pk: bytes, sk: bytes
+    ) -> bytes:
+        """Precompute the crypto_box key of a sender and recipient."""
+        return self._get(
+            (sender_vk, kid), lambda: nacl.bindings.crypto_box_beforenm(target_pk, sk)
+        )
+
+    def clear(self):
+        """Remove all the keys."""
+        with self._lock:
+            self._entries.clear()
+
+    def __getstate__(self) -> dict:
+        """Pickle the cache without its keys."""
+        return {"max_size": self.max_size}
+
+    def __setstate__(self, state: dict):
+        """Unpickle an empty cache."""
+        self.__init__(state["max_size"])
+
+
 def prepare_pack_recipient_keys(
-    to_verkeys: Sequence[bytes], from_secret: bytes = None
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> Tuple[str, bytes]:
     """
     Assemble the recipients block of a packed message.
 
+    Recipient key conversions are memoized, and sender keys are kept in the
+    key cache if given, so packing for the same recipients again only costs
+    encrypting the CEK for each of them.
+
     Args:
         to_verkeys: Verkeys of recipients
         from_secret: Secret to use for signing keys
+        key_cache: The sender key cache of the wallet
 
     Returns:
         A tuple of (json result, key)
@@ -176,17 +265,19 @@ def prepare_pack_recipient_keys(
     """
     cek = nacl.bindings.crypto_secretstream_xchacha20poly1305_keygen()
     recips = []
+    if from_secret:
+        key_cache = key_cache or PackKeyCache()
+        sender_vk, sk = key_cache.sender_key(from_secret)
 
     for target_vk in to_verkeys:
-        target_pk = nacl.bindings.crypto_sign_ed25519_pk_to_curve25519(target_vk)
+        kid, target_pk = pack_recipient_key(target_vk)
         if from_secret:
-            sender_pk = sign_pk_from_sk(from_secret)
-            sender_vk = bytes_to_b58(sender_pk).encode("ascii")
             enc_sender = nacl.bindings.crypto_box_seal(sender_vk, target_pk)
-            sk = nacl.bindings.crypto_sign_ed25519_sk_to_curve25519(from_secret)
 
             nonce = nacl.utils.random(nacl.bindings.crypto_box_NONCEBYTES)
-            enc_cek = nacl.bindings.crypto_box(cek, nonce, target_pk, sk)
+            enc_cek = nacl.bindings.crypto_box_afternm(
+                cek, nonce, key_cache.shared_key(sender_vk, kid, target_pk, sk)
+            )
         else:
             enc_sender = None
             nonce = None
@@ -200,7 +291,7 @@ def prepare_pack_recipient_keys(
                         "header",
                         OrderedDict(
                             [
-                                ("kid", bytes_to_b58(target_vk)),
+                                ("kid", kid),
                                 (
                                     "sender",
                                     bytes_to_b64(enc_sender, urlsafe=True)
@@ -335,7 +426,10 @@ def decrypt_plaintext(
 
 
 def encode_pack_message(
-    message: str, to_verkeys: Sequence[bytes], from_secret: bytes = None
+    message: str,
+    to_verkeys: Sequence[bytes],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
 ) -> bytes:
     """
     Assemble a packed message for a set of recipients, optionally including the sender.
@@ -344,12 +438,13 @@ def encode_pack_message(
         message: The message to pack
         to_verkeys: The verkeys to pack the message for
         from_secret: The sender secret
+        key_cache: The sender key cache of the wallet
 
     Returns:
         The encoded message
 
     """
-    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret)
+    recips_json, cek = prepare_pack_recipient_keys(to_verkeys, from_secret, key_cache)
     recips_b64 = bytes_to_b64(recips_json.encode("ascii"), urlsafe=True)
 
     ciphertext, nonce, tag = encrypt_plaintext(message, recips_b64.encode("ascii"), cek)
@@ -408,6 +503,26 @@ def decode_pack_message(
     return message, sender_vk, recip_vk
 
 
+def decode_pack_message_with_keys(
+    enc_message: bytes, keys: Mapping[str, bytes]
+) -> Tuple[str, Optional[str], str]:
+    """
+    Decode a packed message, given the private keys of its possible recipients.
+
+    Unlike decode_pack_message, this takes no callback, so it can run
+    in another thread or process than the wallet holding the keys.
+
+    Args:
+        enc_message: The encrypted message
+        keys: Private keys indexed by verkey
+
+    Returns:
+        A tuple of (message, sender_vk, recip_vk)
+
+    """
+    return decode_pack_message(enc_message, keys.get)
+
+
 def decode_pack_message_outer(enc_message: bytes) -> Tuple[dict, dict, bool]:
     """
     Decode the outer wrapper of a packed message and extract the recipients.
@@ -0,0 +1,115 @@
+"""Executor for the CPU bound wallet crypto, keeping it off the event loop."""
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Sequence
+
+from ..config.base import BaseSettings
+from .crypto import PackKeyCache, encode_pack_message
+from .error import WalletError
+from .util import b58_to_bytes
+
+
+class CryptoExecutor:
+    """
+    Run wallet crypto functions outside of the event loop.
+
+    Modes:
+        thread: run in a thread pool, the event loop default executor unless
+            a number of workers is given
+        process: run in a process pool, so packing and unpacking scale past
+            one core, arguments and results must be picklable
+        inline: run directly on the event loop
+
+    Functions run in a pool receive everything they need as arguments,
+    key material included, so they never read wallet state concurrently
+    with the event loop.
+    """
+
+    MODE_THREAD = "thread"
+    MODE_PROCESS = "process"
+    MODE_INLINE = "inline"
+    MODES = (MODE_THREAD, MODE_PROCESS, MODE_INLINE)
+
+    def __init__(self, mode: str = None, max_workers: int = None):
+        """
+        Initialize a `CryptoExecutor` instance.
+
+        Args:
+            mode: the executor mode, thread by default
+            max_workers: the number of workers of the pool
+
+        """
+        mode = mode or self.MODE_THREAD
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown crypto executor mode: {mode}")
+        self.mode = mode
+        self.max_workers = max_workers
+        self._executor: Executor = None
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings) -> "CryptoExecutor":
+        """Create a `CryptoExecutor` from the wallet.crypto settings."""
+        return cls(
+            settings.get("wallet.crypto.executor"),
+            settings.get_int("wallet.crypto.workers"),
+        )
+
+    @property
+    def executor(self) -> Executor:
+        """Accessor for the pool, created on first use."""
+        if not self._executor:
+            if self.mode == self.MODE_PROCESS:
+                self._executor = ProcessPoolExecutor(self.max_workers)
+            elif self.mode == self.MODE_THREAD and self.max_workers:
+                self._executor = ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="crypto"
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args):
+        """Run a function with the given arguments and return its result."""
+        if self.mode == self.MODE_INLINE:
+            return func(*args)
+        return await asyncio.get_event_loop().run_in_executor(
+            self.executor, func, *args
+        )
+
+    def shutdown(self, wait: bool = True):
+        """Shut down the pool, a new one is created on next use."""
+        if self._executor:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+async def pack_message(
+    crypto: CryptoExecutor,
+    message: str,
+    to_verkeys: Sequence[str],
+    from_secret: bytes = None,
+    key_cache: PackKeyCache = None,
+) -> bytes:
+    """
+    Pack a message for one or more recipients with a wallet crypto executor.
+
+    Args:
+        crypto: The executor to pack the message with
+        message: The message to pack
+        to_verkeys: List of verkeys for which to pack
+        from_secret: The sender secret
+        key_cache: The sender key cache of the wallet
+
+    Returns:
+        The resulting packed message bytes
+
+    Raises:
+        WalletError: If the message is not provided
+
+    """
+    if message is None:
+        raise WalletError("Message not provided")
+
+    keys_bin = [b58_to_bytes(key) for key in to_verkeys]
+    return await crypto.run(
+        encode_pack_message, message, keys_bin, from_secret, key_cache
+    )
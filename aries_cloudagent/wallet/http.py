@@ -1,6 +1,5 @@
 """In-memory implementation of BaseWallet interface."""
 
-import asyncio
 from typing import Sequence
 
 from .base import BaseWallet, KeyInfo, DIDInfo
@@ -10,9 +9,11 @@ from .crypto import (
     validate_seed,
     sign_message,
     verify_signed_message,
-    encode_pack_message,
-    decode_pack_message,
+    PackKeyCache,
+    decode_pack_message_outer,
+    decode_pack_message_with_keys,
 )
+from .crypto_executor import CryptoExecutor, pack_message
 from .error import WalletError, WalletDuplicateError, WalletNotFoundError
 from .util import b58_to_bytes, bytes_to_b58
 
@@ -27,15 +28,18 @@ class HttpWallet(BaseWallet):
         Initialize a `BasicWallet` instance.
 
         Args:
-            config: {name, key, seed, did, auto-create, auto-remove}
+            config: {name, key, seed, did, auto-create, auto-remove,
+                crypto_executor}
 
         """
         if not config:
             config = {}
         super().__init__(config)
         self._name = config.get("name")
+        self._crypto: CryptoExecutor = config.get("crypto_executor") or CryptoExecutor()
         self._keys = {}
         self._local_dids = {}
+        self._pack_keys = PackKeyCache()
         self._pair_dids = {}
 
     @property
@@ -69,8 +73,8 @@ class HttpWallet(BaseWallet):
         print("WALLET TEST HTTP OPEN this does nothing")
 
     async def close(self):
-        """Not applicable to in-memory wallet."""
-        pass
+        """Drop the sender keys converted for packing."""
+        self._pack_keys.clear()
 
     async def create_signing_key(
         self, seed: str = None, metadata: dict = None
@@ -187,6 +191,7 @@ class HttpWallet(BaseWallet):
             }
         )
         self._keys.pop(verkey_enc)
+        self._pack_keys.clear()
         return DIDInfo(did, verkey_enc, self._local_dids[did]["metadata"].copy())
 
     async def create_local_did(
@@ -315,13 +320,20 @@ class HttpWallet(BaseWallet):
 
         """
 
-        keys_and_dids = list(self._local_dids.values()) + list(self._keys.values())
-        for info in keys_and_dids:
-            if info["verkey"] == verkey:
-                return info["secret"]
+        secret = self._find_private_key(verkey)
+        if secret:
+            return secret
 
         raise WalletError("Private key not found for verkey: {}".format(verkey))
 
+    def _find_private_key(self, verkey: str) -> bytes:
+        """Find the private key of a verkey, if it belongs to the wallet."""
+        for info in self._local_dids.values():
+            if info["verkey"] == verkey:
+                return info["secret"]
+        info = self._keys.get(verkey)
+        return info and info["secret"]
+
     async def sign_message(self, message: bytes, from_verkey: str) -> bytes:
         """
         Sign a message using the private key associated with a given verkey.
@@ -394,15 +406,10 @@ class HttpWallet(BaseWallet):
             WalletError: If the message is not provided
 
         """
-        if message is None:
-            raise WalletError("Message not provided")
-
-        keys_bin = [b58_to_bytes(key) for key in to_verkeys]
         secret = self._get_private_key(from_verkey) if from_verkey else None
-        result = await asyncio.get_event_loop().run_in_executor(
-            None, lambda: encode_pack_message(message, keys_bin, secret)
+        return await pack_message(
+            self._crypto, message, to_verkeys, secret, self._pack_keys
         )
-        return result
 
     async def unpack_message(self, enc_message: bytes) -> (str, str, str):
         """
@@ -422,12 +429,21 @@ class HttpWallet(BaseWallet):
         if not enc_message:
             raise WalletError("Message not provided")
         try:
-            (
-                message,
-                from_verkey,
-                to_verkey,
-            ) = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: decode_pack_message(enc_message, self._get_private_key)
+            # only the recipient key is looked up here and sent to the pool,
+            # which never reads the wallet
+            _, recips, _ = decode_pack_message_outer(enc_message)
+            keys = {}
+            for recip_vk in recips:
+                secret = self._find_private_key(recip_vk)
+                if secret:
+                    keys[recip_vk] = secret
+                    break
+            if not keys:
+                raise ValueError(
+                    "No corresponding recipient key found in {}".format(tuple(recips))
+                )
+            message, from_verkey, to_verkey = await self._crypto.run(
+                decode_pack_message_with_keys, enc_message, keys
             )
         except ValueError as e:
             raise WalletError("Message could not be unpacked: {}".format(str(e)))
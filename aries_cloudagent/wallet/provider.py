@@ -4,6 +4,7 @@ import logging
 
 from ..config.base import BaseProvider, BaseInjector, BaseSettings
 from ..utils.classloader import ClassLoader
+from .crypto_executor import CryptoExecutor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -13,6 +14,7 @@ class WalletProvider(BaseProvider):
 
     def __init__(self):
         self.cached_wallets = {}
+        self.crypto_executor: CryptoExecutor = None
 
     WALLET_TYPES = {
         "basic": "aries_cloudagent.wallet.basic.BasicWallet",
@@ -52,6 +54,10 @@ class WalletProvider(BaseProvider):
             wallet_cfg["storage_config"] = settings["wallet.storage_config"]
         if "wallet.storage_creds" in settings:
             wallet_cfg["storage_creds"] = settings["wallet.storage_creds"]
+        # one pool for the pack and unpack crypto of every wallet
+        if not self.crypto_executor:
+            self.crypto_executor = CryptoExecutor.from_settings(settings)
+        wallet_cfg["crypto_executor"] = self.crypto_executor
         wallet = ClassLoader.load_class(wallet_class)(wallet_cfg)
         await wallet.open()
 
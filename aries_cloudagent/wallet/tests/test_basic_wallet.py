@@ -1,7 +1,10 @@
 import pytest
 import time
 
+from asynctest import mock as async_mock
+
 from aries_cloudagent.wallet.basic import BasicWallet
+from aries_cloudagent.wallet.crypto_executor import CryptoExecutor
 from aries_cloudagent.wallet.error import (
     WalletError,
     WalletDuplicateError,
@@ -301,6 +304,52 @@ class TestBasicWallet:
         with pytest.raises(WalletError):
             await wallet.unpack_message(None)
 
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(
+        "mode,workers",
+        [("thread", None), ("thread", 2), ("process", 1), ("inline", None)],
+    )
+    async def test_pack_unpack_crypto_executor(self, mode, workers):
+        executor = CryptoExecutor(mode, workers)
+        wallet = BasicWallet({"name": "basic", "crypto_executor": executor})
+        await wallet.create_local_did(self.test_seed, self.test_did)
+        await wallet.create_local_did(self.test_target_seed, self.test_target_did)
+
+        # the first recipient is not held by the wallet
+        packed = await wallet.pack_message(
+            self.test_message,
+            [self.missing_verkey, self.test_target_verkey],
+            self.test_verkey,
+        )
+        unpacked, from_verkey, to_verkey = await wallet.unpack_message(packed)
+        assert unpacked == self.test_message
+        assert from_verkey == self.test_verkey
+        assert to_verkey == self.test_target_verkey
+
+        # only the secret of the recipient is sent to the executor
+        with async_mock.patch.object(
+            executor, "run", async_mock.CoroutineMock(wraps=executor.run)
+        ) as mock_run:
+            await wallet.unpack_message(packed)
+            assert list(mock_run.call_args[0][2]) == [self.test_target_verkey]
+
+        with pytest.raises(WalletError):
+            await wallet.pack_message(None, [self.test_target_verkey])
+
+        with pytest.raises(WalletError):
+            await wallet.unpack_message(b"bad")
+        executor.shutdown()
+
+        # sender keys are kept by the wallet until it closes
+        assert wallet._pack_keys._entries or mode == "process"
+        await wallet.close()
+        assert not wallet._pack_keys._entries
+
+    def test_crypto_executor_mode(self):
+        with pytest.raises(ValueError):
+            CryptoExecutor("fibers")
+        assert CryptoExecutor().executor is None
+
     @pytest.mark.asyncio
     async def test_signature_round_trip(self, wallet):
         key_info = await wallet.create_signing_key()
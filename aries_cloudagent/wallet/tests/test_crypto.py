@@ -1,5 +1,6 @@
 import base64
 import json
+import pickle
 import pytest
 from unittest import mock, TestCase
 
@@ -139,3 +140,51 @@ class TestUtil(TestCase):
                 ]
             )
         assert "Unexpected iv" in str(excinfo.value)
+
+    def test_pack_key_cache(self):
+        sender_vk, sender_secret = test_module.create_keypair()
+        recipients = [test_module.create_keypair() for _ in range(3)]
+        keys = {
+            test_module.bytes_to_b58(verkey): secret for verkey, secret in recipients
+        }
+        test_module.pack_recipient_key.cache_clear()
+        key_cache = test_module.PackKeyCache()
+
+        with mock.patch.object(
+            test_module.nacl.bindings,
+            "crypto_box_beforenm",
+            mock.MagicMock(wraps=test_module.nacl.bindings.crypto_box_beforenm),
+        ) as mock_beforenm:
+            packed = [
+                test_module.encode_pack_message(
+                    message,
+                    [verkey for verkey, _ in recipients],
+                    sender_secret,
+                    key_cache,
+                )
+                for message in ("one", "two", "three")
+            ]
+            # keys are converted once, also across calls
+            assert test_module.pack_recipient_key.cache_info().misses == 3
+            assert mock_beforenm.call_count == 3
+
+        # the sender key and the 3 shared keys, not sent to other processes
+        assert len(key_cache._entries) == 4
+        assert not pickle.loads(pickle.dumps(key_cache))._entries
+        key_cache.clear()
+        assert not key_cache._entries
+
+        for message, enc_message in zip(("one", "two", "three"), packed):
+            for verkey, secret in recipients:
+                result = test_module.decode_pack_message_with_keys(
+                    enc_message, {test_module.bytes_to_b58(verkey): secret}
+                )
+                assert result == (
+                    message,
+                    test_module.bytes_to_b58(sender_vk),
+                    test_module.bytes_to_b58(verkey),
+                )
+
+        anon = test_module.encode_pack_message("four", [recipients[0][0]])
+        message, sender, _ = test_module.decode_pack_message_with_keys(anon, keys)
+        assert (message, sender) == ("four", None)
@@ -23,8 +23,23 @@ class TestProvider(AsyncTestCase):
 
         assert wallet.opened
         assert wallet.name == "name"
+        assert wallet._crypto is provider.crypto_executor
+        assert wallet._crypto.mode == "thread"
         await wallet.close()
 
+    async def test_provide_crypto_executor(self):
+        provider = test_module.WalletProvider()
+        settings = Settings(
+            values={
+                "wallet.type": "basic",
+                "wallet.crypto.executor": "process",
+                "wallet.crypto.workers": 2,
+            }
+        )
+        wallet = await provider.provide(settings, None)
+        assert wallet._crypto.mode == "process"
+        assert wallet._crypto.max_workers == 2
+
     @pytest.mark.indy
     async def test_provide_indy(self):
         provider = test_module.WalletProvider()
@@ -0,0 +1,180 @@
+"""
+Measure the inbound throughput of an agent started with a number of workers.
+
+For each worker count an agent is started with `--workers <count>`, flooded
+with plaintext trust pings over HTTP for a fixed time, and stopped. The
+throughput of each run is reported against the single worker run.
+"""
+
+import asyncio
+import os
+import signal
+import subprocess
+import sys
+import time
+import uuid
+
+from aiohttp import ClientError, ClientSession, TCPConnector
+
+ACA_PY = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "bin",
+    "aca-py",
+)
+PING_TYPE = "did:sov:BzCbsNYhMrjHiqZDTUASHg;spec/trust_ping/1.0/ping"
+
+
+def start_agent(port: int, workers: int, extra_args: list) -> subprocess.Popen:
+    """Start an agent listening for inbound HTTP on the given port."""
+    args = [
+        sys.executable,
+        ACA_PY,
+        "start",
+        "--inbound-transport",
+        "http",
+        "127.0.0.1",
+        str(port),
+        "--outbound-transport",
+        "http",
+        "--log-level",
+        "error",
+        "--workers",
+        str(workers),
+    ]
+    return subprocess.Popen(args + extra_args, start_new_session=True)
+
+
+async def wait_ready(url: str, timeout: float = 60.0):
+    """Wait for the agent to accept messages."""
+    deadline = time.perf_counter() + timeout
+    async with ClientSession() as session:
+        while time.perf_counter() < deadline:
+            try:
+                async with session.get(url) as resp:
+                    if resp.status == 200:
+                        return
+            except ClientError:
+                pass
+            await asyncio.sleep(0.5)
+    raise TimeoutError(f"Agent at {url} did not start")
+
+
+async def flood(url: str, concurrency: int, duration: float) -> dict:
+    """Send pings from concurrent clients, counting the responses."""
+    counts = {"ok": 0, "busy": 0, "error": 0}
+    deadline = time.perf_counter() + duration
+
+    async def client(session: ClientSession):
+        while time.perf_counter() < deadline:
+            ping = {"@type": PING_TYPE, "@id": str(uuid.uuid4())}
+            try:
+                async with session.post(url, json=ping) as resp:
+                    await resp.read()
+                    if resp.status == 200:
+                        counts["ok"] += 1
+                    elif resp.status in (429, 503):
+                        counts["busy"] += 1
+                    else:
+                        counts["error"] += 1
+            except ClientError:
+                counts["error"] += 1
+
+    # a new connection per request lets the kernel spread them across workers
+    connector = TCPConnector(limit=concurrency, force_close=True)
+    async with ClientSession(connector=connector) as session:
+        await asyncio.gather(*(client(session) for _ in range(concurrency)))
+    return counts
+
+
+async def main(
+    port: int,
+    worker_counts: list,
+    concurrency: int,
+    duration: float,
+    extra_args: list,
+):
+    url = f"http://127.0.0.1:{port}/"
+    results = []
+    for workers in worker_counts:
+        agent = start_agent(port, workers, extra_args)
+        try:
+            await wait_ready(url)
+            await flood(url, concurrency, 1.0)  # warm up
+            counts = await flood(url, concurrency, duration)
+        finally:
+            os.killpg(agent.pid, signal.SIGTERM)
+            agent.wait()
+        rate = counts["ok"] / duration
+        results.append((workers, rate, counts))
+        print(f"{workers} worker(s): {rate:.1f} msg/s {counts}", flush=True)
+
+    base = results[0][1] / results[0][0] if results and results[0][1] else None
+    print(f"\n{'workers':>8} {'msg/s':>10} {'speedup':>8} {'efficiency':>10}")
+    for workers, rate, _ in results:
+        speedup = base and rate / base
+        efficiency = speedup and speedup / workers
+        print(
+            f"{workers:>8} {rate:>10.1f} "
+            f"{speedup or 0:>8.2f} {efficiency or 0:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Measures the inbound throughput scaling of agent workers.",
+        epilog="Arguments after '--' are passed on to 'aca-py start', for example"
+        " the wallet, storage and cache settings shared by the workers.",
+    )
+    parser.add_argument(
+        "-p",
+        "--port",
+        type=int,
+        default=8020,
+        metavar="<port>",
+        help="Choose the inbound port of the agent",
+    )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, os.cpu_count() or 1],
+        metavar="<count>",
+        help="The worker counts to measure, the first one is the baseline",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=int,
+        default=64,
+        metavar="<count>",
+        help="The number of concurrent clients",
+    )
+    parser.add_argument(
+        "-d",
+        "--duration",
+        type=float,
+        default=10.0,
+        metavar="<seconds>",
+        help="The duration of each measurement",
+    )
+    parser.add_argument("agent_args", nargs=argparse.REMAINDER)
+    args = parser.parse_args()
+    agent_args = args.agent_args
+    if agent_args and agent_args[0] == "--":
+        agent_args = agent_args[1:]
+
+    try:
+        asyncio.get_event_loop().run_until_complete(
+            main(
+                args.port,
+                sorted(set(args.workers), key=args.workers.index),
+                args.concurrency,
+                args.duration,
+                agent_args,
+            )
+        )
+    except KeyboardInterrupt:
+        os._exit(1)